@@ -41,7 +41,8 @@ CSRF_TRUSTED_ORIGINS = [o.strip() for o in _csrf.split(",") if o.strip()]
 # Application definition
 # ------------------------------------------------------------
 INSTALLED_APPS = [
-    "django.contrib.admin",
+    # django.contrib.admin, discovering ModelAdmins from config/urls.py rather than at start-up
+    "portal.apps.PortalAdminConfig",
     "django.contrib.auth",
     "django.contrib.contenttypes",
     "django.contrib.sessions",
@@ -52,6 +53,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so its timings cover every other middleware
+    "portal.metrics.MetricsMiddleware",
+    "portal.logs.RequestIdMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -64,12 +68,22 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = "config.urls"
 
+# Production pins the cached loader explicitly: templates are compiled once per worker
+# instead of re-parsed on every render. Under DEBUG, Django's default loaders (APP_DIRS)
+# cache too, and also reload a template when its file changes.
+_TEMPLATE_LOADERS = [
+    "django.template.loaders.filesystem.Loader",
+    "django.template.loaders.app_directories.Loader",
+]
+
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
         "DIRS": [],  # you can add BASE_DIR / "templates" if you move templates out of app folders
-        "APP_DIRS": True,
+        # Django rejects APP_DIRS together with explicit loaders
+        "APP_DIRS": DEBUG,
         "OPTIONS": {
+            **({} if DEBUG else {"loaders": [("django.template.loaders.cached.Loader", _TEMPLATE_LOADERS)]}),
             "context_processors": [
                 "django.template.context_processors.debug",
                 "django.template.context_processors.request",
@@ -96,6 +110,11 @@ if DATABASE_URL:
     if parsed.scheme not in ("postgres", "postgresql"):
         raise RuntimeError("DATABASE_URL must start with postgres:// or postgresql://")
 
+    # Production serves ASGI (gunicorn.conf.py), where sync views run on per-request
+    # threads and a persistent connection would be left behind by each of them: connections
+    # come from a per-process psycopg pool instead. DJANGO_DB_POOL=0 goes back to
+    # persistent per-thread connections, which suit the WSGI worker classes.
+    _db_pool = os.environ.get("DJANGO_DB_POOL", "1") != "0"
     DATABASES = {
         "default": {
             "ENGINE": "django.db.backends.postgresql",
@@ -104,7 +123,12 @@ if DATABASE_URL:
             "PASSWORD": parsed.password or "",
             "HOST": parsed.hostname or "",
             "PORT": str(parsed.port or 5432),
-            "CONN_MAX_AGE": int(os.environ.get("DJANGO_CONN_MAX_AGE", "60")),
+            "CONN_MAX_AGE": 0 if _db_pool else int(os.environ.get("DJANGO_CONN_MAX_AGE", "60")),
+            "OPTIONS": (
+                {"pool": {"min_size": 1, "max_size": int(os.environ.get("DJANGO_DB_POOL_SIZE", "8"))}}
+                if _db_pool
+                else {}
+            ),
         }
     }
 else:
@@ -117,6 +141,22 @@ else:
     }
 
 
+# ------------------------------------------------------------
+# Cache
+# ------------------------------------------------------------
+# Shared by every gunicorn worker and management command, so an invalidation in one
+# process (portal.facets) and the Brevo circuit breaker (portal.emailer) are seen by
+# all. Lives in the main database, so no extra service; migration 0016 creates the table.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "portal_cache",
+        # Every facet filter combination is an entry; culling also drops the version key (safe)
+        "OPTIONS": {"MAX_ENTRIES": 5000},
+    }
+}
+
+
 # ------------------------------------------------------------
 # Password validation
 # ------------------------------------------------------------
@@ -178,14 +218,59 @@ else:
     )
 
 
+# Absolute links in emails sent outside a request (e.g. `manage.py send_digests`)
+PORTAL_BASE_URL = os.environ.get("PORTAL_BASE_URL", "http://127.0.0.1:8000").rstrip("/")
+
+
+# ------------------------------------------------------------
+# Proposal lifecycle (`manage.py expire_proposals`)
+# ------------------------------------------------------------
+# Proposals closed for longer than this drop out of the default Proposal.objects queries
+PORTAL_ARCHIVE_AFTER_DAYS = int(os.environ.get("PORTAL_ARCHIVE_AFTER_DAYS", "180"))
+
+
+# ------------------------------------------------------------
+# Data retention (`manage.py enforce_retention`); 0 disables a rule
 # ------------------------------------------------------------
-# Logging (Render-friendly)
+# Delete the custom-question answers of rejected signups this long after the decision
+PORTAL_RETAIN_REJECTED_ANSWERS_DAYS = int(os.environ.get("PORTAL_RETAIN_REJECTED_ANSWERS_DAYS", "90"))
+# Strip names, emails and answers from proposals closed for this long
+PORTAL_ANONYMIZE_CLOSED_AFTER_DAYS = int(os.environ.get("PORTAL_ANONYMIZE_CLOSED_AFTER_DAYS", "365"))
+
+
+# ------------------------------------------------------------
+# Metrics (/metrics, see portal/metrics.py)
+# ------------------------------------------------------------
+# When set, scrapers must send "Authorization: Bearer <token>"; empty leaves /metrics open
+PORTAL_METRICS_TOKEN = os.environ.get("PORTAL_METRICS_TOKEN", "").strip()
+
+
+# ------------------------------------------------------------
+# Logging (Render-friendly): JSON lines on stdout, written by a background thread
 # ------------------------------------------------------------
 LOG_LEVEL = os.environ.get("DJANGO_LOG_LEVEL", "INFO").upper()
+# "json" (default) or "text" for local development
+LOG_FORMAT = os.environ.get("DJANGO_LOG_FORMAT", "json").strip().lower()
+# Share of high-volume success events kept (records logged with extra={"sampled": True})
+LOG_SAMPLE_RATE = float(os.environ.get("DJANGO_LOG_SAMPLE_RATE", "0.1"))
 
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
-    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "formatters": {
+        "json": {"()": "portal.logs.JsonFormatter"},
+        "text": {"format": "%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"},
+    },
+    "filters": {
+        "request_id": {"()": "portal.logs.RequestIdFilter"},
+        "sample": {"()": "portal.logs.SamplingFilter", "rate": LOG_SAMPLE_RATE},
+    },
+    "handlers": {
+        "console": {
+            "class": "portal.logs.QueueingHandler",
+            "formatter": "text" if LOG_FORMAT == "text" else "json",
+            "filters": ["request_id", "sample"],
+        },
+    },
     "root": {"handlers": ["console"], "level": LOG_LEVEL},
 }
@@ -1,6 +1,9 @@
 from django.contrib import admin
 from django.urls import path, include
 
+# Registers every app's ModelAdmins; not done at start-up (portal.apps.PortalAdminConfig)
+admin.autodiscover()
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("", include("portal.urls")),
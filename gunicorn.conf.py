@@ -0,0 +1,160 @@
+"""
+gunicorn settings, picked up automatically from the working directory:
+
+    gunicorn
+
+The app is served over ASGI (config.asgi) by uvicorn's gunicorn worker, so the
+owner dashboard's live updates (portal.events, server-sent events) can hold a
+connection open without pinning a thread. GUNICORN_WORKER_CLASS=gthread (or
+sync) switches back to WSGI (config.wsgi); the stream then answers 204 and the
+dashboard works without it.
+
+Worker count and threads are sized from the CPUs and memory the container is
+actually given (cgroup limits, not the host's). Every value can be overridden
+with an environment variable, e.g. WEB_CONCURRENCY=3 or GUNICORN_THREADS=8.
+
+The app is imported once in the master (preload_app) and the workers fork from
+it, sharing its pages copy-on-write; gc.freeze() keeps the collector from
+touching, and so copying, those shared objects. Database connections are never
+shared across the fork.
+
+Each worker runs portal.health.warm_up() before it accepts connections, so the
+first requests after a deploy don't pay for URL resolver set-up, template
+compilation or empty caches. Database connections are opened by the threads
+that run the views (from a pool under ASGI, see DATABASES in config/settings.py).
+Point Render's health check at /readyz.
+
+`manage.py bench_workers` compares worker classes on the portal endpoints.
+The views are synchronous, so under ASGI each request still runs on a thread
+and the uvicorn worker is no faster. With requirements.txt installed, 1 CPU
+and SQLite holding 200 open proposals, two runs of
+
+    manage.py bench_workers --workers 2 --concurrency 16 --duration 8
+
+gave sync 56-61, gthread 53-54 and uvicorn 43-49 req/s. uvicorn is the default
+for the event stream, which gthread cannot serve, not for page throughput.
+"""
+
+import gc
+import math
+import os
+import shutil
+import tempfile
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, "") or default)
+    except ValueError:
+        return default
+
+
+def _cpu_count() -> float:
+    # cgroup v2 quota ("max 100000" when unlimited), else the CPUs this process may run on
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            return max(int(quota) / int(period), 1.0)
+    except (OSError, ValueError):
+        pass
+    try:
+        return float(len(os.sched_getaffinity(0)))
+    except AttributeError:
+        return float(os.cpu_count() or 1)
+
+
+def _memory_mb() -> int | None:
+    for path in ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes"):
+        try:
+            with open(path) as f:
+                raw = f.read().strip()
+        except OSError:
+            continue
+        # cgroup v1 reports "unlimited" as a huge number
+        if raw != "max" and int(raw) < 1 << 50:
+            return int(raw) // (1024 * 1024)
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // (1024 * 1024)
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def _workers() -> int:
+    by_cpu = math.ceil(2 * _cpu_count()) + 1
+    memory = _memory_mb()
+    # Resident size of one warmed-up worker, plus the master's share
+    per_worker = _env_int("GUNICORN_WORKER_MEMORY_MB", 120)
+    by_memory = max(1, (memory - per_worker) // per_worker) if memory else by_cpu
+    return max(1, min(by_cpu, by_memory))
+
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+
+workers = _env_int("WEB_CONCURRENCY", _workers())
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "uvicorn_worker.UvicornWorker")
+# uvicorn's workers speak ASGI; gunicorn's own (sync, gthread) speak WSGI
+wsgi_app = "config.asgi:application" if "uvicorn" in worker_class.lower() else "config.wsgi:application"
+# gthread only: threads cover time spent waiting on Postgres and the Brevo API
+threads = _env_int("GUNICORN_THREADS", 4)
+
+preload_app = True
+# Recycle workers now and then so slow leaks can't build up; jitter keeps them from restarting together
+max_requests = _env_int("GUNICORN_MAX_REQUESTS", 1000)
+max_requests_jitter = _env_int("GUNICORN_MAX_REQUESTS_JITTER", 100)
+# Longer than the usual 60s idle timeout of the proxy in front, so the proxy closes idle connections first
+keepalive = _env_int("GUNICORN_KEEPALIVE", 65)
+timeout = _env_int("GUNICORN_TIMEOUT", 30)
+graceful_timeout = _env_int("GUNICORN_GRACEFUL_TIMEOUT", 30)
+# gunicorn's control socket, kept out of the checkout
+control_socket = os.path.join(tempfile.gettempdir(), "gunicorn.ctl")
+
+# Shared sample directory for portal.metrics; must be set before prometheus_client is imported
+if workers > 1:
+    os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "portal-metrics"))
+_metrics_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+if _metrics_dir:
+    # Samples left by a previous server would be merged into this one's
+    shutil.rmtree(_metrics_dir, ignore_errors=True)
+    os.makedirs(_metrics_dir, exist_ok=True)
+
+
+def when_ready(server):
+    # Master, app loaded, no workers yet: import the URLconf (views, admin) here rather
+    # than once per worker, drop any connection the import opened, then move everything
+    # allocated so far out of the collector's reach
+    if not server.cfg.preload_app:
+        return
+    from django.db import connections
+    from django.urls import get_resolver
+
+    get_resolver().url_patterns
+    connections.close_all()
+    gc.collect()
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # A connection inherited from the master would be one socket shared by two processes
+    if not server.cfg.preload_app:
+        return
+    from django.db import connections
+
+    connections.close_all()
+
+
+def post_worker_init(worker):
+    # Runs in the worker after the app is loaded and before it accepts connections
+    from gunicorn.workers.sync import SyncWorker
+
+    from portal.health import warm_up
+
+    # Only the sync worker serves requests from this thread, so only it keeps the connection
+    warm_up(keep_connections=isinstance(worker, SyncWorker))
+
+
+def child_exit(server, worker):
+    if _metrics_dir:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
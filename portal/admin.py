@@ -1,18 +1,324 @@
-from django.contrib import admin
-from .models import Proposal, Tag
+import csv
+import itertools
+from collections import Counter
 
+from django.contrib import admin, messages
+from django.core.paginator import Paginator
+from django.db import connection, transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Greatest
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.functional import cached_property
 
+from .facets import invalidate_facets
+from .models import (
+    Proposal,
+    ProposalLSHBucket,
+    ProposalNeighbor,
+    ProposalQuestion,
+    ProposalSignature,
+    Signup,
+    SignupAnswer,
+    Tag,
+)
+
+# Below this many rows an exact COUNT(*) is cheap enough to keep
+ESTIMATE_COUNT_ABOVE = 10_000
+
+
+# -------------------------------------------------------
+# Shared helpers
+# -------------------------------------------------------
+class EstimatedCountPaginator(Paginator):
+    """
+    Uses the planner's row estimate instead of COUNT(*) for an unfiltered changelist
+    on a big PostgreSQL table. Filtered lists (and SQLite) still count exactly.
+    """
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, "query", None)
+        if connection.vendor == "postgresql" and query is not None and not query.where:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE relname = %s", [query.model._meta.db_table])
+                row = cursor.fetchone()
+            if row and row[0] > ESTIMATE_COUNT_ABOVE:
+                return row[0]
+        return super().count
+
+
+class ScalableAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    # Skip the second, unfiltered COUNT(*) behind "x of y selected"
+    show_full_result_count = False
+    list_per_page = 50
+
+
+class ReadOnlyAdmin(ScalableAdmin):
+    """
+    Derived tables maintained by management commands: inspect only.
+    """
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+def count_of(model, fk: str):
+    """
+    Correlated COUNT subquery: evaluated only for the rows on the current page,
+    unlike Count() which groups the whole table before LIMIT.
+    """
+    rows = model.objects.filter(**{fk: OuterRef("pk")}).order_by().values(fk).annotate(n=Count("*")).values("n")
+    return Subquery(rows, output_field=IntegerField())
+
+
+class _Echo:
+    """
+    File-like object for csv.writer that hands each formatted line straight back.
+    """
+
+    def write(self, value):
+        return value
+
+
+def csv_response(filename: str, header: list[str], rows) -> StreamingHttpResponse:
+    """
+    Stream `rows` as CSV so large exports never build the whole file in memory.
+    """
+    writer = csv.writer(_Echo())
+    lines = itertools.chain([writer.writerow(header)], (writer.writerow(row) for row in rows))
+    response = StreamingHttpResponse(lines, content_type="text/csv")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+# -------------------------------------------------------
+# Tags
+# -------------------------------------------------------
 @admin.register(Tag)
 class TagAdmin(admin.ModelAdmin):
-    list_display = ("name", "slug")
+    list_display = ("name", "slug", "bit", "proposal_count")
     search_fields = ("name", "slug")
     prepopulated_fields = {"slug": ("name",)}
+    readonly_fields = ("bit",)
+
+    def get_queryset(self, request):
+        through = Proposal.tags.through
+        return super().get_queryset(request).annotate(proposal_count=count_of(through, "tag"))
+
+    @admin.display(description="Proposals", ordering="proposal_count")
+    def proposal_count(self, obj):
+        return obj.proposal_count or 0
+
+
+# -------------------------------------------------------
+# Proposals
+# -------------------------------------------------------
+class TagListFilter(admin.SimpleListFilter):
+    """
+    Tag filter on Proposal.tag_mask (see ProposalQuerySet.filter_tags): no join, no DISTINCT.
+    """
+
+    title = "tag"
+    parameter_name = "tag"
+
+    def lookups(self, request, model_admin):
+        return list(Tag.objects.values_list("slug", "name"))
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter_tags([self.value()])
+        return queryset
+
+
+class ProposalQuestionInline(admin.TabularInline):
+    model = ProposalQuestion
+    extra = 0
 
 
 @admin.register(Proposal)
-class ProposalAdmin(admin.ModelAdmin):
-    list_display = ("title", "created_by_name", "status", "created_at")
-    list_filter = ("status", "created_at", "tags")
-    search_fields = ("title", "summary", "created_by_name", "created_by_email")
+class ProposalAdmin(ScalableAdmin):
+    list_display = (
+        "title",
+        "created_by_name",
+        "status",
+        "signup_count",
+        "seats",
+        "deadline",
+        "created_at",
+        "is_archived",
+        "deleted_at",
+    )
+    list_filter = ("status", TagListFilter, "is_archived", ("deleted_at", admin.EmptyFieldListFilter), "created_at")
+    # Prefix / exact matches only, each served by an UPPER(column) index (migration 0018),
+    # unlike icontains over the long text columns
+    search_fields = ("^title", "=slug", "=created_by_email")
     prepopulated_fields = {"slug": ("title",)}
-    filter_horizontal = ("tags",)
+    autocomplete_fields = ("tags",)
+    readonly_fields = ("seats_taken", "closed_at", "deleted_at", "anonymized_at")
+    inlines = [ProposalQuestionInline]
+    ordering = ("-created_at",)
+    actions = ["close_proposals", "reopen_proposals", "soft_delete_proposals", "export_csv"]
+
+    def get_queryset(self, request):
+        # Archived and soft-deleted proposals stay reachable here
+        qs = Proposal.all_objects.all()
+        ordering = self.get_ordering(request)
+        if ordering:
+            qs = qs.order_by(*ordering)
+        return qs.annotate(signup_count=count_of(Signup, "proposal"))
+
+    def has_delete_permission(self, request, obj=None):
+        # The stock delete runs the ORM collector over every signup and answer;
+        # soft_delete_proposals + `manage.py purge_deleted_proposals` replace it
+        return False
+
+    @admin.display(description="Signups", ordering="signup_count")
+    def signup_count(self, obj):
+        return obj.signup_count or 0
+
+    @admin.display(description="Seats")
+    def seats(self, obj):
+        if obj.max_volunteers is None:
+            return obj.seats_taken
+        return f"{obj.seats_taken}/{obj.max_volunteers}"
+
+    @admin.action(description="Close selected proposals")
+    def close_proposals(self, request, queryset):
+        n = queryset.exclude(status="CLOSED").update(status="CLOSED", closed_at=timezone.now())
+        invalidate_facets()
+        self.message_user(request, f"Closed {n} proposal(s).", messages.SUCCESS)
+
+    @admin.action(description="Reopen selected proposals")
+    def reopen_proposals(self, request, queryset):
+        reopened = queryset.exclude(status="OPEN")
+        with transaction.atomic():
+            # Otherwise the next `expire_proposals` run would close them straight away
+            reopened.filter(deadline__lt=timezone.localdate()).update(deadline=None)
+            n = reopened.update(status="OPEN", closed_at=None, is_archived=False)
+        invalidate_facets()
+        self.message_user(request, f"Reopened {n} proposal(s).", messages.SUCCESS)
+
+    @admin.action(description="Delete selected proposals (purged by purge_deleted_proposals)")
+    def soft_delete_proposals(self, request, queryset):
+        n = queryset.filter(deleted_at__isnull=True).update(deleted_at=timezone.now())
+        invalidate_facets()
+        self.message_user(request, f"Deleted {n} proposal(s).", messages.SUCCESS)
+
+    @admin.action(description="Export selected proposals as CSV")
+    def export_csv(self, request, queryset):
+        columns = ["id", "title", "slug", "status", "created_by_name", "created_by_email", "created_at", "deadline"]
+        rows = queryset.order_by("pk").values_list(*columns).iterator(chunk_size=2000)
+        return csv_response("proposals.csv", columns, rows)
+
+
+# -------------------------------------------------------
+# Questions, signups, answers
+# -------------------------------------------------------
+@admin.register(ProposalQuestion)
+class ProposalQuestionAdmin(ScalableAdmin):
+    list_display = ("prompt", "proposal", "is_required", "sort_order")
+    list_select_related = ("proposal",)
+    list_filter = ("is_required",)
+    search_fields = ("^prompt",)
+    autocomplete_fields = ("proposal",)
+
+
+class SignupAnswerInline(admin.TabularInline):
+    model = SignupAnswer
+    extra = 0
+    autocomplete_fields = ("question",)
+
+
+@admin.register(Signup)
+class SignupAdmin(ScalableAdmin):
+    list_display = ("name", "email", "proposal", "status", "created_at", "decided_at")
+    list_select_related = ("proposal",)
+    list_filter = ("status", "created_at")
+    # Served by UPPER(email) / UPPER(name) indexes (migration 0018)
+    search_fields = ("=email", "^name")
+    # Status and proposal move seats, so they only change through set_status (the actions below)
+    readonly_fields = ("proposal", "status", "decided_at", "owner_notified_at", "idempotency_key")
+    inlines = [SignupAnswerInline]
+    actions = ["approve_signups", "reject_signups", "export_csv"]
+
+    def has_add_permission(self, request):
+        # Signups come through the public form, which takes a seat or waitlists them
+        return False
+
+    def delete_model(self, request, obj):
+        self.delete_queryset(request, Signup.objects.filter(pk=obj.pk))
+
+    def delete_queryset(self, request, queryset):
+        # Free the seats the deleted signups held, then fill them from each waitlist
+        with transaction.atomic():
+            rows = list(queryset.select_for_update().values_list("pk", "proposal_id", "status"))
+            Signup.objects.filter(pk__in=[pk for pk, _, _ in rows]).delete()
+            freed = Counter(proposal_id for _, proposal_id, status in rows if status in Signup.SEATED_STATUSES)
+            for proposal_id, n in freed.items():
+                Proposal.all_objects.filter(pk=proposal_id).update(seats_taken=Greatest(F("seats_taken") - n, 0))
+        for proposal in Proposal.all_objects.filter(pk__in=freed):
+            for _ in range(freed[proposal.pk]):
+                if proposal.promote_waitlist() is None:
+                    break
+
+    def _set_status(self, request, queryset, status: str) -> None:
+        changed = 0
+        for signup in queryset.select_related("proposal").exclude(status=status):
+            signup.set_status(status)
+            changed += 1
+        self.message_user(request, f"Marked {changed} signup(s) {status.lower()}.", messages.SUCCESS)
+
+    @admin.action(description="Approve selected signups")
+    def approve_signups(self, request, queryset):
+        self._set_status(request, queryset, "APPROVED")
+
+    @admin.action(description="Reject selected signups (frees their seats)")
+    def reject_signups(self, request, queryset):
+        self._set_status(request, queryset, "REJECTED")
+
+    @admin.action(description="Export selected signups as CSV")
+    def export_csv(self, request, queryset):
+        columns = ["id", "proposal__slug", "name", "email", "status", "created_at", "decided_at"]
+        rows = queryset.order_by("pk").values_list(*columns).iterator(chunk_size=2000)
+        return csv_response("signups.csv", columns, rows)
+
+
+@admin.register(SignupAnswer)
+class SignupAnswerAdmin(ScalableAdmin):
+    list_display = ("signup", "question", "short_answer")
+    list_select_related = ("signup__proposal", "question__proposal")
+    search_fields = ("=signup__email",)
+    autocomplete_fields = ("signup", "question")
+
+    @admin.display(description="Answer")
+    def short_answer(self, obj):
+        text = obj.answer_text or ""
+        return text if len(text) <= 80 else text[:77] + "..."
+
+
+# -------------------------------------------------------
+# Derived indexes (rebuild_similar / dedup_report)
+# -------------------------------------------------------
+@admin.register(ProposalNeighbor)
+class ProposalNeighborAdmin(ReadOnlyAdmin):
+    list_display = ("proposal", "rank", "neighbor", "score")
+    list_select_related = ("proposal", "neighbor")
+
+
+@admin.register(ProposalSignature)
+class ProposalSignatureAdmin(ReadOnlyAdmin):
+    list_display = ("proposal",)
+    list_select_related = ("proposal",)
+    exclude = ("minhash",)
+
+
+@admin.register(ProposalLSHBucket)
+class ProposalLSHBucketAdmin(ReadOnlyAdmin):
+    list_display = ("proposal", "band", "bucket")
+    list_select_related = ("proposal",)
+    list_filter = ("band",)
@@ -0,0 +1,278 @@
+"""
+Read-only JSON API, version 1 (mounted at /api/v1/).
+
+    GET /api/v1/tags/
+    GET /api/v1/proposals/?status=&q=&tags=a&tags=b&match=any|all&fields=&limit=&cursor=
+    GET /api/v1/proposals/<slug>/?fields=
+    GET /api/v1/proposals/<slug>/owner/<token>/signups/?status=&fields=&limit=&cursor=
+
+Rows are read with .values() for exactly the requested `fields` and dumped
+straight to JSON; no model instances are built. Lists use keyset ("cursor")
+pagination on (created_at, pk), so page N costs the same as page 1. Every
+response carries an ETag of its body and answers a matching If-None-Match with
+304 Not Modified.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+from collections import defaultdict
+from datetime import datetime
+from typing import Any
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.http import Http404, HttpRequest, HttpResponse, JsonResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from django.views.decorators.http import require_GET
+
+from .facets import search_condition
+from .models import Proposal, Signup, SignupAnswer, Tag
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+PUBLIC_MAX_AGE = 30
+
+# API field name -> .values() expression. "tags", "url" and "answers" are filled in afterwards.
+PROPOSAL_FIELDS = {
+    "slug": "slug",
+    "title": "title",
+    "summary": "summary",
+    "background": "background",
+    "aims": "aims",
+    "status": "status",
+    "created_at": "created_at",
+    "deadline": "deadline",
+    "max_volunteers": "max_volunteers",
+    "seats_taken": "seats_taken",
+    "tags": None,
+    "url": None,
+}
+DEFAULT_PROPOSAL_FIELDS = ("slug", "title", "summary", "status", "created_at", "tags", "url")
+
+SIGNUP_FIELDS = {
+    "id": "pk",
+    "name": "name",
+    "email": "email",
+    "status": "status",
+    "created_at": "created_at",
+    "decided_at": "decided_at",
+    "answers": None,
+}
+DEFAULT_SIGNUP_FIELDS = ("id", "name", "email", "status", "created_at")
+
+
+class ApiError(Exception):
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+# -------------------------------------------------------
+# Helpers
+# -------------------------------------------------------
+def _error(message: str, status: int) -> JsonResponse:
+    return JsonResponse({"error": message}, status=status)
+
+
+def _fields(request: HttpRequest, allowed: dict[str, str | None], default: tuple[str, ...]) -> list[str]:
+    raw = (request.GET.get("fields") or "").strip()
+    if not raw:
+        return list(default)
+    fields = list(dict.fromkeys(f.strip() for f in raw.split(",") if f.strip()))
+    unknown = [f for f in fields if f not in allowed]
+    if unknown:
+        raise ApiError(f"Unknown field(s): {', '.join(unknown)}. Allowed: {', '.join(allowed)}.")
+    return fields
+
+
+def _limit(request: HttpRequest) -> int:
+    try:
+        limit = int(request.GET.get("limit") or DEFAULT_LIMIT)
+    except ValueError:
+        raise ApiError("limit must be an integer.")
+    return max(1, min(limit, MAX_LIMIT))
+
+
+def _encode_cursor(created_at: datetime, pk: int) -> str:
+    raw = json.dumps([created_at.isoformat(), pk]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, pk = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(pk)
+    except (ValueError, TypeError):
+        raise ApiError("Invalid cursor.")
+
+
+def _paginate(request: HttpRequest, queryset, limit: int):
+    """
+    Keyset pagination, newest first, resuming after the row encoded in ?cursor=.
+    Slices limit + 1 rows so the caller can tell whether a next page exists.
+    """
+    queryset = queryset.order_by("-created_at", "-pk")
+    cursor = request.GET.get("cursor")
+    if cursor:
+        created_at, pk = _decode_cursor(cursor)
+        queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk))
+    return queryset[: limit + 1]
+
+
+def _next_url(request: HttpRequest, rows: list[dict], limit: int) -> str | None:
+    if len(rows) <= limit:
+        return None
+    last = rows[limit - 1]
+    params = request.GET.copy()
+    params["cursor"] = _encode_cursor(last["_created_at"], last["_pk"])
+    return request.build_absolute_uri(f"{request.path}?{params.urlencode()}")
+
+
+def _respond(request: HttpRequest, data: Any, *, public: bool) -> HttpResponse:
+    body = json.dumps(data, cls=DjangoJSONEncoder, separators=(",", ":")).encode()
+    etag = quote_etag(hashlib.md5(body, usedforsecurity=False).hexdigest())
+    response = HttpResponse(body, content_type="application/json")
+    response["ETag"] = etag
+    if public:
+        patch_cache_control(response, public=True, max_age=PUBLIC_MAX_AGE)
+        response["Access-Control-Allow-Origin"] = "*"
+    else:
+        patch_cache_control(response, private=True, no_cache=True)
+    return get_conditional_response(request, etag=etag, response=response) or response
+
+
+def api_view(view):
+    """
+    GET only; ApiError becomes a JSON error body with its status.
+    """
+
+    @require_GET
+    def wrapper(request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        try:
+            return view(request, *args, **kwargs)
+        except ApiError as e:
+            return _error(str(e), e.status)
+        except Http404 as e:
+            return _error(str(e) or "Not found.", 404)
+
+    wrapper.__name__ = view.__name__
+    wrapper.__doc__ = view.__doc__
+    return wrapper
+
+
+def _proposal_rows(request: HttpRequest, queryset, fields: list[str], *, extra: tuple[str, ...] = ()) -> list[dict]:
+    columns = {PROPOSAL_FIELDS[f] for f in fields if PROPOSAL_FIELDS[f]}
+    if "url" in fields:
+        columns.add("slug")
+    rows = list(queryset.values("pk", *columns, *extra))
+
+    if "tags" in fields and rows:
+        tags_by_proposal: dict[int, list[str]] = defaultdict(list)
+        links = Proposal.tags.through.objects.filter(proposal_id__in=[r["pk"] for r in rows]).order_by("tag__name")
+        for proposal_id, slug in links.values_list("proposal_id", "tag__slug"):
+            tags_by_proposal[proposal_id].append(slug)
+        for row in rows:
+            row["tags"] = tags_by_proposal.get(row["pk"], [])
+    if "url" in fields:
+        # One reverse() per page, not per row
+        prefix, suffix = request.build_absolute_uri(reverse("proposal_detail", args=["-"])).rsplit("-", 1)
+        for row in rows:
+            row["url"] = f"{prefix}{row['slug']}{suffix}"
+    return rows
+
+
+def _shape(rows: list[dict], fields: list[str], mapping: dict[str, str | None]) -> list[dict]:
+    return [{f: row[mapping[f] or f] for f in fields} for row in rows]
+
+
+# -------------------------------------------------------
+# Endpoints
+# -------------------------------------------------------
+@api_view
+def tags(request: HttpRequest) -> HttpResponse:
+    rows = list(Tag.objects.order_by("name").values("slug", "name"))
+    return _respond(request, {"results": rows}, public=True)
+
+
+@api_view
+def proposal_list(request: HttpRequest) -> HttpResponse:
+    fields = _fields(request, PROPOSAL_FIELDS, DEFAULT_PROPOSAL_FIELDS)
+    limit = _limit(request)
+
+    queryset = Proposal.objects.all()
+    q = (request.GET.get("q") or "").strip()
+    if q:
+        queryset = queryset.filter(search_condition(q))
+    status = (request.GET.get("status") or "").strip().upper()
+    if status:
+        if status not in dict(Proposal.STATUS_CHOICES):
+            raise ApiError(f"Unknown status {status!r}.")
+        queryset = queryset.filter(status=status)
+    selected_tags = [t for t in request.GET.getlist("tags") if t.strip()]
+    if selected_tags:
+        queryset = queryset.filter_tags(selected_tags, match="all" if request.GET.get("match") == "all" else "any")
+
+    page = _paginate(request, queryset, limit)
+    rows = _proposal_rows(request, page, fields, extra=("created_at",))
+    for row in rows:
+        row["_pk"], row["_created_at"] = row["pk"], row["created_at"]
+    return _respond(
+        request,
+        {"results": _shape(rows[:limit], fields, PROPOSAL_FIELDS), "next": _next_url(request, rows, limit)},
+        public=True,
+    )
+
+
+@api_view
+def proposal_item(request: HttpRequest, slug: str) -> HttpResponse:
+    fields = _fields(request, PROPOSAL_FIELDS, DEFAULT_PROPOSAL_FIELDS)
+    # Archived proposals keep their page (and so their API item); only deleted ones are gone
+    rows = _proposal_rows(request, Proposal.all_objects.filter(slug=slug, deleted_at__isnull=True), fields)
+    if not rows:
+        raise Http404("Proposal not found.")
+    return _respond(request, _shape(rows, fields, PROPOSAL_FIELDS)[0], public=True)
+
+
+@api_view
+def proposal_signups(request: HttpRequest, slug: str, token: str) -> HttpResponse:
+    proposal = (
+        Proposal.all_objects.filter(slug=slug, owner_token=token, deleted_at__isnull=True).values("pk").first()
+    )
+    if proposal is None:
+        raise Http404("Proposal not found.")
+
+    fields = _fields(request, SIGNUP_FIELDS, DEFAULT_SIGNUP_FIELDS)
+    limit = _limit(request)
+    queryset = Signup.objects.filter(proposal_id=proposal["pk"])
+    status = (request.GET.get("status") or "").strip().upper()
+    if status:
+        if status not in dict(Signup.STATUS_CHOICES):
+            raise ApiError(f"Unknown status {status!r}.")
+        queryset = queryset.filter(status=status)
+
+    columns = {SIGNUP_FIELDS[f] for f in fields if SIGNUP_FIELDS[f]}
+    rows = list(_paginate(request, queryset, limit).values("pk", "created_at", *columns))
+    if "answers" in fields and rows:
+        answers: dict[int, list[dict]] = defaultdict(list)
+        for signup_id, prompt, text in (
+            SignupAnswer.objects.filter(signup_id__in=[r["pk"] for r in rows[:limit]])
+            .order_by("question__sort_order", "question_id")
+            .values_list("signup_id", "question__prompt", "answer_text")
+        ):
+            answers[signup_id].append({"question": prompt, "answer": text})
+        for row in rows:
+            row["answers"] = answers.get(row["pk"], [])
+    for row in rows:
+        row["_pk"], row["_created_at"] = row["pk"], row["created_at"]
+
+    return _respond(
+        request,
+        {"results": _shape(rows[:limit], fields, SIGNUP_FIELDS), "next": _next_url(request, rows, limit)},
+        public=False,
+    )
@@ -1,6 +1,33 @@
 from django.apps import AppConfig
+from django.contrib.admin import apps as admin_apps
+from django.core import checks
 
 
 class PortalConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'portal'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+
+
+class PortalAdminConfig(admin_apps.SimpleAdminConfig):
+    """
+    django.contrib.admin without autodiscovery in django.setup(). config/urls.py
+    imports the admin modules when the URLconf loads, so management commands that
+    never touch a URL skip them. Listed in INSTALLED_APPS instead of "django.contrib.admin".
+    """
+
+    default = False
+
+    def ready(self):
+        checks.register(admin_apps.check_dependencies, checks.Tags.admin)
+        checks.register(check_admin_app, checks.Tags.admin)
+
+
+def check_admin_app(app_configs, **kwargs):
+    # `manage.py check` may run before anything loads the URLconf; the ModelAdmins must be registered to be checked
+    from django.contrib import admin
+
+    admin.autodiscover()
+    return admin_apps.check_admin_app(app_configs, **kwargs)
@@ -0,0 +1,118 @@
+"""
+Streaming JSONL backup format used by `manage.py export_portal` / `import_portal`.
+
+One JSON object per line, optionally gzip-compressed:
+
+    {"format": "msrig-portal", "version": 1}
+    {"model": "tag", "pk": 3, "fields": {"name": "Statistics", "slug": "statistics"}}
+    {"model": "proposal", "pk": 12, "fields": {...}}
+    ...
+
+Sections come in dependency order, so an importer can remap every foreign key
+in a single pass while holding nothing but old-pk -> new-pk maps (ints, one
+entry per proposal, question and signup; rows themselves are never kept). Derived
+data (tag bits and masks, similarity and dedup indexes) is not exported and
+is rebuilt after an import.
+"""
+
+from __future__ import annotations
+
+import datetime
+import gzip
+import io
+import sys
+from dataclasses import dataclass, field
+from typing import TextIO
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.db.models import Q
+
+from .models import Proposal, ProposalQuestion, Signup, SignupAnswer, Tag
+
+FORMAT = "msrig-portal"
+VERSION = 1
+
+
+@dataclass(frozen=True)
+class Section:
+    name: str
+    model: type[models.Model]
+    # Which rows to export (soft-deleted proposals and their children are left out)
+    scope: Q = field(default_factory=Q)
+    # Attributes not exported because they are local to one database
+    exclude: frozenset[str] = frozenset()
+    # Foreign key attname -> section whose pk map translates it on import
+    fks: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def manager(self) -> models.Manager:
+        # Proposal.objects hides archived rows, which a backup must include
+        return getattr(self.model, "all_objects", self.model._default_manager)
+
+    @property
+    def fields(self) -> list[models.Field]:
+        return [
+            f for f in self.model._meta.concrete_fields if not f.primary_key and f.attname not in self.exclude
+        ]
+
+
+SECTIONS = [
+    Section("tag", Tag, exclude=frozenset({"bit"})),
+    Section(
+        "proposal",
+        Proposal,
+        scope=Q(deleted_at__isnull=True),
+        exclude=frozenset({"tag_mask", "similar_stale", "similar_version"}),
+    ),
+    Section(
+        "proposal_tag",
+        Proposal.tags.through,
+        scope=Q(proposal__deleted_at__isnull=True),
+        fks={"proposal_id": "proposal", "tag_id": "tag"},
+    ),
+    Section(
+        "question",
+        ProposalQuestion,
+        scope=Q(proposal__deleted_at__isnull=True),
+        fks={"proposal_id": "proposal"},
+    ),
+    Section(
+        "signup",
+        Signup,
+        scope=Q(proposal__deleted_at__isnull=True),
+        fks={"proposal_id": "proposal"},
+    ),
+    Section(
+        "answer",
+        SignupAnswer,
+        scope=Q(signup__proposal__deleted_at__isnull=True),
+        fks={"signup_id": "signup", "question_id": "question"},
+    ),
+]
+SECTIONS_BY_NAME = {section.name: section for section in SECTIONS}
+
+
+class BackupEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        # DjangoJSONEncoder rounds to milliseconds; a backup keeps full precision
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def open_stream(path: str, mode: str, *, compress: bool | None = None) -> TextIO:
+    """
+    Open `path` for text reading ("r") or writing ("w"); "-" means stdin/stdout.
+    Compression defaults to on for paths ending in .gz.
+    """
+    if compress is None:
+        compress = path.endswith(".gz")
+    if path == "-":
+        raw = sys.stdin.buffer if mode == "r" else sys.stdout.buffer
+        if compress:
+            return io.TextIOWrapper(gzip.GzipFile(fileobj=raw, mode=mode + "b"), encoding="utf-8")
+        return io.TextIOWrapper(raw, encoding="utf-8")
+    if compress:
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import json
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+from django.conf import settings
+
+
+class Timing:
+    """
+    Wall-clock samples (in seconds) for one benchmarked operation.
+    """
+
+    def __init__(self, label: str, samples: list[float]):
+        self.label = label
+        self.samples = sorted(samples)
+
+    @property
+    def mean_ms(self) -> float:
+        return statistics.fmean(self.samples) * 1000 if self.samples else 0.0
+
+    @property
+    def p50_ms(self) -> float:
+        return self._percentile(0.50) * 1000
+
+    @property
+    def p95_ms(self) -> float:
+        return self._percentile(0.95) * 1000
+
+    @property
+    def per_second(self) -> float:
+        total = sum(self.samples)
+        return len(self.samples) / total if total else 0.0
+
+    def _percentile(self, pct: float) -> float:
+        if not self.samples:
+            return 0.0
+        idx = min(len(self.samples) - 1, int(round(pct * (len(self.samples) - 1))))
+        return self.samples[idx]
+
+    def format(self) -> str:
+        return (
+            f"{self.label:<40} n={len(self.samples):<6} "
+            f"mean={self.mean_ms:8.3f}ms  p50={self.p50_ms:8.3f}ms  "
+            f"p95={self.p95_ms:8.3f}ms  {self.per_second:10.1f}/s"
+        )
+
+
+def time_call(label: str, fn: Callable[[], object], *, iterations: int = 100, warmup: int = 5) -> Timing:
+    """
+    Run fn() `warmup` times untimed, then `iterations` times timed.
+    """
+    for _ in range(max(0, warmup)):
+        fn()
+
+    samples: list[float] = []
+    perf = time.perf_counter
+    for _ in range(max(1, iterations)):
+        start = perf()
+        fn()
+        samples.append(perf() - start)
+    return Timing(label, samples)
+
+
+# -------------------------------------------------------
+# Cold start: a fresh interpreter importing config.wsgi and serving its first requests
+# -------------------------------------------------------
+_STARTUP_PROBE = """
+import io, json, os, sys, time
+
+def phase(name):
+    # Splits the -X importtime report (also on stderr) by phase
+    print(f"-- phase {name}", file=sys.stderr, flush=True)
+    return time.perf_counter()
+
+started = phase("setup")
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+import django
+django.setup(set_prefix=False)
+set_up = phase("wsgi")
+from config.wsgi import application
+loaded = phase("first_request")
+from django.conf import settings
+
+hosts = [h for h in settings.ALLOWED_HOSTS if h != "*" and not h.startswith(".")]
+host = hosts[0] if hosts else "localhost"
+
+def get(path):
+    path, _, query = path.partition("?")
+    statuses = []
+    environ = {
+        "REQUEST_METHOD": "GET", "PATH_INFO": path, "QUERY_STRING": query, "SCRIPT_NAME": "",
+        "SERVER_NAME": host, "SERVER_PORT": "80", "HTTP_HOST": host, "SERVER_PROTOCOL": "HTTP/1.1",
+        "wsgi.version": (1, 0), "wsgi.url_scheme": "http", "wsgi.input": io.BytesIO(), "wsgi.errors": sys.stderr,
+        "wsgi.multithread": False, "wsgi.multiprocess": True, "wsgi.run_once": False,
+    }
+    response = application(environ, lambda status, headers, exc_info=None: statuses.append(status))
+    b"".join(response)
+    response.close()
+    return statuses[0]
+
+status = get(sys.argv[1])
+first_done_at = time.time()
+first = phase("second_request")
+get(sys.argv[1])
+second = time.perf_counter()
+print("STARTUP " + json.dumps({
+    "status": status,
+    "setup": set_up - started,
+    "wsgi": loaded - set_up,
+    "first_request": first - loaded,
+    "second_request": second - first,
+    "first_done_at": first_done_at,
+}))
+"""
+
+
+def startup_probe(path: str = "/", *, importtime: bool = False) -> tuple[dict[str, float | str], str]:
+    """
+    Run a new interpreter that sets Django up, imports config.wsgi and serves `path` twice
+    through the WSGI callable. Returns the time of each phase in seconds (setup, wsgi,
+    first_request, second_request; "to_first_request", from launch to the first response;
+    "process", the whole run including interpreter start-up and exit) and the child's stderr, which holds the -X importtime report when
+    `importtime` is set, split by "-- phase <name>" lines.
+    """
+    args = [sys.executable, *(["-X", "importtime"] if importtime else []), "-c", _STARTUP_PROBE, path]
+    launched_at, started = time.time(), time.perf_counter()
+    result = subprocess.run(args, cwd=settings.BASE_DIR, capture_output=True, text=True)
+    elapsed = time.perf_counter() - started
+    for line in result.stdout.splitlines():
+        if line.startswith("STARTUP "):
+            phases = json.loads(line.removeprefix("STARTUP "))
+            # Wall clock, so it includes interpreter start-up, which the child can't time itself
+            phases["to_first_request"] = phases.pop("first_done_at") - launched_at
+            return {**phases, "process": elapsed}, result.stderr
+    raise RuntimeError(f"Startup probe failed (exit {result.returncode}):\n{result.stderr[-2000:]}")
+
+
+@dataclass
+class ImportRecord:
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+    children: list[ImportRecord] = field(default_factory=list)
+
+
+def parse_importtime(report: str) -> list[ImportRecord]:
+    """
+    Turn `-X importtime` lines into trees, one per top-level import, in import order.
+    Python prints a module after everything it imported, one indent level deeper.
+    """
+    pending: dict[int, list[ImportRecord]] = {}
+    for line in report.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        record = ImportRecord(name.strip(), int(self_us), int(cumulative_us), depth)
+        record.children = pending.pop(depth + 1, [])
+        pending.setdefault(depth, []).append(record)
+    return pending.get(0, [])
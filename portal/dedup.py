@@ -0,0 +1,119 @@
+"""
+Near-duplicate proposal detection with MinHash + LSH.
+
+Each proposal's text is reduced to word-bigram shingles, hashed into a
+NUM_PERM-long MinHash signature and split into BANDS bands of ROWS values.
+Every band is hashed into a bucket id stored in ProposalLSHBucket, indexed on
+(band, bucket). Looking up duplicates is then BANDS indexed equality probes
+plus a signature comparison on the (few) candidates, independent of how many
+proposals exist.
+
+With 16 bands x 4 rows, pairs above ~0.5 Jaccard similarity collide in at
+least one band with high probability; DUPLICATE_THRESHOLD filters the rest.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import random
+import struct
+import zlib
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Q
+
+from .models import Proposal, ProposalLSHBucket, ProposalSignature
+from .similarity import tokenize
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+DUPLICATE_THRESHOLD = 0.6
+# Degenerate buckets (e.g. many near-empty proposals) are skipped in reports
+MAX_BUCKET_SIZE = 200
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_rng = random.Random(0x5EED)
+_PERMS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+_PACK = struct.Struct(f"<{NUM_PERM}Q")
+
+
+def proposal_text(title: str, summary: str, aims: str) -> str:
+    return f"{title} {summary} {aims}"
+
+
+def shingles(text: str) -> set[int]:
+    tokens = tokenize(text)
+    if len(tokens) < 2:
+        return {zlib.crc32(t.encode("utf-8")) for t in tokens}
+    return {zlib.crc32(f"{a} {b}".encode("utf-8")) for a, b in zip(tokens, tokens[1:])}
+
+
+def minhash(text: str) -> list[int]:
+    values = shingles(text)
+    if not values:
+        return [_MAX_HASH] * NUM_PERM
+    return [min((a * v + b) % _PRIME for v in values) for a, b in _PERMS]
+
+
+def band_buckets(signature: list[int]) -> list[int]:
+    buckets = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS:(band + 1) * ROWS]
+        digest = hashlib.blake2b(struct.pack(f"<{ROWS}Q", *rows), digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, "little") >> 1)  # fit a signed BIGINT
+    return buckets
+
+
+def estimated_similarity(a: list[int], b: list[int]) -> float:
+    return sum(1 for x, y in zip(a, b) if x == y) / NUM_PERM
+
+
+def pack(signature: list[int]) -> bytes:
+    return _PACK.pack(*signature)
+
+
+def unpack(blob) -> list[int]:
+    return list(_PACK.unpack(bytes(blob)))
+
+
+def index_proposal(proposal: Proposal) -> None:
+    """
+    Store (or replace) the signature and LSH buckets for one proposal.
+    """
+    signature = minhash(proposal_text(proposal.title, proposal.summary, proposal.aims))
+    with transaction.atomic():
+        ProposalSignature.objects.update_or_create(proposal=proposal, defaults={"minhash": pack(signature)})
+        ProposalLSHBucket.objects.filter(proposal=proposal).delete()
+        ProposalLSHBucket.objects.bulk_create(
+            ProposalLSHBucket(proposal=proposal, band=band, bucket=bucket)
+            for band, bucket in enumerate(band_buckets(signature))
+        )
+
+
+def find_duplicates(
+    *, title: str, summary: str, aims: str = "", exclude_pk: int | None = None, threshold: float = DUPLICATE_THRESHOLD
+) -> list[tuple[Proposal, float]]:
+    """
+    Proposals whose text is likely a near-duplicate of the given text, best match first.
+    """
+    signature = minhash(proposal_text(title, summary, aims))
+    probes = reduce(or_, (Q(band=band, bucket=bucket) for band, bucket in enumerate(band_buckets(signature))))
+
+    candidates = ProposalLSHBucket.objects.filter(probes).values("proposal_id")
+    if exclude_pk is not None:
+        candidates = candidates.exclude(proposal_id=exclude_pk)
+
+    scored = []
+    signatures = ProposalSignature.objects.filter(
+        proposal_id__in=candidates, proposal__is_archived=False, proposal__deleted_at__isnull=True
+    )
+    for sig in signatures.select_related("proposal"):
+        score = estimated_similarity(signature, unpack(sig.minhash))
+        if score >= threshold:
+            scored.append((sig.proposal, score))
+    scored.sort(key=lambda item: item[1], reverse=True)
+    return scored
@@ -2,14 +2,140 @@ from __future__ import annotations
 
 import json
 import os
+import threading
+import time
 import urllib.error
 import urllib.request
+from collections import deque
 from typing import Optional
 
+from django.core.cache import cache
+
+from .metrics import record_email
+
 
 BREVO_API_URL = "https://api.brevo.com/v3/smtp/email"
 
 
+def api_url() -> str:
+    """
+    Brevo endpoint; override with BREVO_API_URL (e.g. `manage.py fake_brevo` for offline load tests).
+    """
+    return os.environ.get("BREVO_API_URL", "").strip() or BREVO_API_URL
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, "") or default)
+    except ValueError:
+        return default
+
+
+class CircuitOpenError(RuntimeError):
+    """
+    Raised instead of calling Brevo while the circuit is open.
+    """
+
+
+class CircuitBreaker:
+    """
+    Classic closed -> open -> half-open breaker. Its state lives in the shared cache
+    (settings.CACHES), so every gunicorn worker and management command sees the same
+    failure window: Brevo is cut off after `threshold` failures in total, not per process.
+
+    - closed: calls go through; failures inside `window` seconds are counted
+    - open: after `threshold` failures, calls fail fast for `cooldown` seconds
+    - half-open: one probe call is let through; success closes, failure re-opens
+    """
+
+    def __init__(self, *, threshold: int, window: float, cooldown: float, prefix: str = "portal:brevo:circuit"):
+        self.threshold = threshold
+        self.window = window
+        self.cooldown = cooldown
+        self.failures_key = f"{prefix}:failures"
+        self.opened_key = f"{prefix}:opened_at"
+        self.probe_key = f"{prefix}:probe"
+
+    @property
+    def state(self) -> str:
+        return self._state(cache.get(self.opened_key), time.time())
+
+    def _state(self, opened_at: float | None, now: float) -> str:
+        if opened_at is None:
+            return "closed"
+        if now - opened_at < self.cooldown:
+            return "open"
+        return "half-open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        # add() only succeeds for the first caller, in any process; the key expires in
+        # case the probe's process dies before recording its result
+        return state == "half-open" and cache.add(self.probe_key, True, timeout=max(self.cooldown, 1))
+
+    def record_success(self) -> None:
+        # Read first: the common case (nothing recorded) costs no write
+        if cache.get_many([self.failures_key, self.opened_key]):
+            cache.delete_many([self.failures_key, self.opened_key, self.probe_key])
+
+    def record_failure(self) -> None:
+        now = time.time()
+        state = self._state(cache.get(self.opened_key), now)
+        if state == "half-open":
+            # Failed half-open probe: back to open for another cooldown
+            cache.set(self.opened_key, now, timeout=None)
+            cache.delete(self.probe_key)
+            return
+        if state == "open":
+            return
+        # Read-modify-write: concurrent failures can lose an entry, which only delays opening
+        failures = [t for t in cache.get(self.failures_key, []) if now - t <= self.window]
+        failures.append(now)
+        cache.set(self.failures_key, failures, timeout=max(int(self.window), 1))
+        if len(failures) >= self.threshold:
+            cache.set(self.opened_key, now, timeout=None)
+
+
+class AdaptiveTimeout:
+    """
+    Request timeout derived from recent successful latencies: p99 * multiplier,
+    clamped to [minimum, maximum]. Until enough samples exist, `maximum` is used.
+    Kept per process: every worker samples the same provider, so local numbers agree.
+    """
+
+    def __init__(self, *, minimum: float, maximum: float, multiplier: float = 3.0, samples: int = 200):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.multiplier = multiplier
+        self._lock = threading.Lock()
+        self._latencies: deque[float] = deque(maxlen=samples)
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def current(self) -> float:
+        with self._lock:
+            if len(self._latencies) < 20:
+                return self.maximum
+            ordered = sorted(self._latencies)
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+        return min(self.maximum, max(self.minimum, p99 * self.multiplier))
+
+
+breaker = CircuitBreaker(
+    threshold=int(_env_float("BREVO_CIRCUIT_THRESHOLD", 5)),
+    window=_env_float("BREVO_CIRCUIT_WINDOW", 60),
+    cooldown=_env_float("BREVO_CIRCUIT_COOLDOWN", 30),
+)
+timeout = AdaptiveTimeout(
+    minimum=_env_float("BREVO_TIMEOUT_MIN", 2),
+    maximum=_env_float("BREVO_TIMEOUT_MAX", 20),
+)
+
+
 def _parse_sender(sender: str) -> dict:
     """
     Brevo expects sender as {"name": "...", "email": "..."}.
@@ -80,7 +206,7 @@ def send_email(
 
     data = json.dumps(payload).encode("utf-8")
     req = urllib.request.Request(
-        BREVO_API_URL,
+        api_url(),
         data=data,
         headers={
             "accept": "application/json",
@@ -90,11 +216,30 @@ def send_email(
         method="POST",
     )
 
+    # Fail fast while Brevo is unhealthy instead of tying up the request for the full timeout
+    if not breaker.allow():
+        record_email("circuit_open")
+        raise CircuitOpenError("Brevo circuit is open; email not sent")
+
+    started = time.monotonic()
     try:
-        with urllib.request.urlopen(req, timeout=20) as resp:
+        with urllib.request.urlopen(req, timeout=timeout.current()) as resp:
             resp.read()
     except urllib.error.HTTPError as e:
+        record_email("failed", time.monotonic() - started)
+        # 429 / 5xx mean the provider is struggling; other 4xx are our own request's fault
+        if e.code == 429 or e.code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
         detail = e.read().decode("utf-8", errors="replace")
         raise RuntimeError(f"Brevo HTTPError {e.code}: {detail}") from e
     except Exception as e:
+        record_email("failed", time.monotonic() - started)
+        breaker.record_failure()
         raise RuntimeError(f"Brevo send failed: {e}") from e
+
+    elapsed = time.monotonic() - started
+    record_email("sent", elapsed)
+    breaker.record_success()
+    timeout.record(elapsed)
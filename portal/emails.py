@@ -0,0 +1,98 @@
+"""
+Template-based email rendering.
+
+Every email is a trio of templates under templates/email/:
+
+    <name>.subject.txt   one line (whitespace is collapsed)
+    <name>.txt           plain-text body, rendered without autoescaping
+    <name>.html          HTML body, usually extending email/base.html
+
+Templates are compiled by a dedicated template engine whose cached loader keeps
+them (and their parents) in memory for the life of the process, independent of
+the page templates' DEBUG-dependent loader setup. `render_many` renders one
+email against many contexts reusing the same compiled templates and Context.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+from typing import Any, Iterable
+
+from django.template import Context, Engine, Template, TemplateDoesNotExist
+
+TEMPLATE_ROOT = Path(__file__).resolve().parent / "templates"
+EMAIL_DIR = "email"
+# Suffix -> whether that part is autoescaped
+EMAIL_PARTS = {".subject.txt": False, ".txt": False, ".html": True}
+
+
+@dataclass(frozen=True)
+class RenderedEmail:
+    subject: str
+    text_body: str
+    html_body: str | None
+
+
+@cache
+def _engine() -> Engine:
+    return Engine(
+        dirs=[str(TEMPLATE_ROOT)],
+        loaders=[("django.template.loaders.cached.Loader", ["django.template.loaders.filesystem.Loader"])],
+    )
+
+
+def _templates(name: str) -> dict[str, Template | None]:
+    """
+    Compiled templates for each part of email `name`. The HTML part is optional.
+    """
+    engine = _engine()
+    parts: dict[str, Template | None] = {}
+    for suffix in EMAIL_PARTS:
+        try:
+            parts[suffix] = engine.get_template(f"{EMAIL_DIR}/{name}{suffix}")
+        except TemplateDoesNotExist:
+            if suffix != ".html":
+                raise
+            parts[suffix] = None
+    return parts
+
+
+def render_email(name: str, context: dict[str, Any]) -> RenderedEmail:
+    return render_many(name, [context])[0]
+
+
+def render_many(name: str, contexts: Iterable[dict[str, Any]]) -> list[RenderedEmail]:
+    """
+    Render email `name` once per context (e.g. one digest per owner).
+    """
+    templates = _templates(name)
+    shared = {suffix: Context(autoescape=escape) for suffix, escape in EMAIL_PARTS.items()}
+
+    def render(suffix: str, context: dict[str, Any]) -> str | None:
+        template = templates[suffix]
+        if template is None:
+            return None
+        ctx = shared[suffix]
+        with ctx.push(context):
+            return template.render(ctx)
+
+    rendered = []
+    for context in contexts:
+        rendered.append(
+            RenderedEmail(
+                subject=" ".join(render(".subject.txt", context).split()),
+                text_body=render(".txt", context).strip() + "\n",
+                html_body=render(".html", context),
+            )
+        )
+    return rendered
+
+
+def reset_cache() -> None:
+    """
+    Drop compiled email templates, e.g. after editing them in a running shell.
+    """
+    for loader in _engine().template_loaders:
+        loader.reset()
@@ -0,0 +1,178 @@
+"""
+Server-sent events for the owner dashboard:
+
+    GET /proposal/<slug>/owner/<token>/events/?since=<cursor>
+
+The stream sends one "signup" event per new or status-changed signup, carrying
+the re-rendered card, so the dashboard patches itself instead of reloading
+every signup and answer. Every POLL_SECONDS, changes are read with an indexed
+keyset query on (proposal, updated_at, pk) past the cursor; each event id is
+that "<updated_at>|<pk>" cursor, which EventSource sends back as Last-Event-ID
+when it reconnects. updated_at is stamped before its transaction commits, so a
+row can become visible behind the cursor: each poll also looks LOOKBACK_SECONDS
+back and sends the versions this stream has not sent yet. Events may therefore
+repeat (always after a reconnect); the dashboard keeps the newest per signup.
+
+This needs an async server: production runs config.asgi under gunicorn's
+uvicorn worker (gunicorn.conf.py), and `uvicorn config.asgi:application` does
+the same locally. An idle stream then costs a coroutine, not a thread. Under
+WSGI (`runserver`, or GUNICORN_WORKER_CLASS=gthread) a long-lived stream would
+pin a worker, so the view answers 204, which tells EventSource not to
+reconnect; the dashboard then behaves as before.
+
+Each poll runs on the event loop's thread pool (thread_sensitive=False), so
+streams do not queue behind one another on a single shared thread. Those
+threads live outside the request cycle, so each poll applies CONN_MAX_AGE to
+its connection itself.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import UTC, datetime, timedelta
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.db import close_old_connections
+from django.db.models import Q
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.views.decorators.http import require_GET
+
+from .models import Proposal, Signup
+from .views import _get_owner_proposal_or_404, _normalize_signup_for_template
+
+POLL_SECONDS = 2
+# Comment line sent when nothing changed, so proxies don't drop an idle connection
+HEARTBEAT_SECONDS = 15
+# Streams end after this long; EventSource reconnects and resumes from Last-Event-ID
+STREAM_SECONDS = 300
+RETRY_MS = 3000
+BATCH = 50
+# Longer than a signup transaction takes to commit, plus clock skew between workers
+LOOKBACK_SECONDS = 10
+
+# (updated_at, pk) of the last row sent
+Cursor = tuple[datetime, int]
+
+
+def _parse_cursor(value: str | None) -> Cursor | None:
+    """
+    "<updated_at>|<pk>" from an event id, or a bare timestamp (the page's ?since=).
+    """
+    if not value:
+        return None
+    stamp, _, pk = value.partition("|")
+    try:
+        cursor = datetime.fromisoformat(stamp), int(pk or 0)
+    except ValueError:
+        return None
+    return cursor if timezone.is_aware(cursor[0]) else None
+
+
+def _version(signup: Signup) -> int:
+    # Microseconds since the epoch: exact, and comparable in JavaScript
+    return (signup.updated_at - datetime(1970, 1, 1, tzinfo=UTC)) // timedelta(microseconds=1)
+
+
+def _event(name: str, data: dict, event_id: str) -> str:
+    return f"event: {name}\nid: {event_id}\ndata: {json.dumps(data)}\n\n"
+
+
+def _changes(
+    request: HttpRequest, proposal: Proposal, token: str, cursor: Cursor, sent: set[tuple[int, datetime]]
+) -> tuple[list[str], Cursor]:
+    """
+    Events for signups changed after `cursor`, oldest first, plus any committed late
+    inside the lookback window, and the cursor to poll from next. `sent` holds the
+    (pk, updated_at) versions this stream has sent; it is updated and pruned here.
+    """
+    signups = Signup.objects.filter(proposal=proposal)
+    after, after_pk = cursor
+    ahead = list(
+        signups.filter(Q(updated_at__gt=after) | Q(updated_at=after, pk__gt=after_pk))
+        .order_by("updated_at", "pk")
+        .values_list("pk", "updated_at")[:BATCH]
+    )
+    window_start = after - timedelta(seconds=LOOKBACK_SECONDS)
+    behind = signups.filter(
+        Q(updated_at__lt=after) | Q(updated_at=after, pk__lte=after_pk), updated_at__gt=window_start
+    )
+    late = [version for version in behind.values_list("pk", "updated_at") if version not in sent]
+
+    for version in [v for v in sent if v[1] <= window_start]:
+        sent.discard(version)
+    if not ahead and not late:
+        return [], cursor
+    sent.update(late + ahead)
+
+    # pk -> updated_at as seen by the queries above; the rows are rendered as they are now
+    changed = dict(late + ahead)
+    rows = sorted(
+        Signup.objects.filter(pk__in=changed).prefetch_related("answers__question"),
+        key=lambda signup: (changed[signup.pk], signup.pk),
+    )
+    total = Signup.objects.filter(proposal=proposal).count()
+    events = []
+    for signup in rows:
+        html = render_to_string(
+            "portal/partials/signup_card.html",
+            {"proposal": proposal, "token": token, "signup": _normalize_signup_for_template(signup)},
+            request=request,
+        )
+        data = {"id": signup.pk, "version": _version(signup), "status": signup.status, "total": total, "html": html}
+        # Never behind the cursor, so a late row doesn't rewind a reconnect
+        cursor = max(cursor, (changed[signup.pk], signup.pk))
+        events.append(_event("signup", data, f"{cursor[0].isoformat()}|{cursor[1]}"))
+    if ahead:
+        cursor = max(cursor, (ahead[-1][1], ahead[-1][0]))
+    return events, cursor
+
+
+def _poll(*args) -> tuple[list[str], Cursor]:
+    # What request_started / request_finished do for a view's connection
+    close_old_connections()
+    try:
+        return _changes(*args)
+    finally:
+        close_old_connections()
+
+
+async def _stream(request: HttpRequest, proposal: Proposal, token: str, cursor: Cursor):
+    changes = sync_to_async(_poll, thread_sensitive=False)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + STREAM_SECONDS
+    last_sent = loop.time()
+    sent: set[tuple[int, datetime]] = set()
+
+    yield f"retry: {RETRY_MS}\n\n"
+    while loop.time() < deadline:
+        events, cursor = await changes(request, proposal, token, cursor, sent)
+        for event in events:
+            yield event
+        if events:
+            last_sent = loop.time()
+        elif loop.time() - last_sent >= HEARTBEAT_SECONDS:
+            yield ": keepalive\n\n"
+            last_sent = loop.time()
+        await asyncio.sleep(POLL_SECONDS)
+
+
+@require_GET
+async def proposal_owner_events(request: HttpRequest, slug: str, token: str) -> HttpResponse:
+    proposal = await sync_to_async(_get_owner_proposal_or_404)(slug, token)
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse(status=204)
+
+    cursor = (
+        _parse_cursor(request.headers.get("Last-Event-ID"))
+        or _parse_cursor(request.GET.get("since"))
+        or (timezone.now(), 0)
+    )
+    response = StreamingHttpResponse(_stream(request, proposal, token, cursor), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Tell nginx-style proxies not to buffer the stream
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+
+from django.core.cache import cache
+from django.db.models import Count, F, Q
+from django.db.models.lookups import GreaterThan
+
+from .models import Proposal, Tag, tag_condition
+
+FACET_CACHE_SECONDS = 300
+FACET_VERSION_KEY = "portal:facets:version"
+
+
+def search_condition(q: str) -> Q:
+    return Q(title__icontains=q) | Q(summary__icontains=q) if q else Q()
+
+
+def compute_facets(*, q: str, status: str, selected_tags, match: str = "any") -> dict:
+    """
+    Per-tag and per-status counts for the home filter. Bitset tags, statuses and the
+    total come from one aggregate query; tags past the bitset add one grouped query.
+
+    - tag counts: proposals matching q + status + selected tags that carry each tag
+    - status counts: proposals matching q + selected tags, per status
+      (the status facet ignores the current status so users can see what switching would give)
+    """
+    tags = list(Tag.objects.values_list("pk", "slug", "bit"))
+    tags_q = tag_condition(selected_tags, match=match, catalog=tags) if selected_tags else Q()
+    if tags_q is None:
+        return {
+            "tags": {slug: 0 for _pk, slug, _bit in tags},
+            "statuses": {value: 0 for value, _label in Proposal.STATUS_CHOICES},
+            "total": 0,
+        }
+
+    status_q = Q(status=status) if status else Q()
+    results_q = status_q & tags_q
+
+    base = Proposal.objects.filter(search_condition(q))
+
+    aggregates = {"total": Count("pk", filter=results_q)}
+    overflow: dict[int, str] = {}
+    for pk, slug, bit in tags:
+        if bit is None:
+            overflow[pk] = slug
+            continue
+        aggregates[f"tag_{pk}"] = Count("pk", filter=results_q & Q(GreaterThan(F("tag_mask").bitand(1 << bit), 0)))
+    for value, _label in Proposal.STATUS_CHOICES:
+        aggregates[f"status_{value}"] = Count("pk", filter=tags_q & Q(status=value))
+
+    row = base.aggregate(**aggregates)
+    tag_counts = {slug: row[f"tag_{pk}"] for pk, slug, bit in tags if bit is not None}
+
+    if overflow:
+        # Tags past the bitset: one grouped count over the M2M rows of the result set.
+        tag_counts.update({slug: 0 for slug in overflow.values()})
+        grouped = (
+            base.filter(results_q, tags__in=list(overflow))
+            .order_by()
+            .values("tags")
+            .annotate(n=Count("pk"))
+        )
+        for item in grouped:
+            tag_counts[overflow[item["tags"]]] = item["n"]
+
+    return {
+        "tags": tag_counts,
+        "statuses": {value: row[f"status_{value}"] for value, _label in Proposal.STATUS_CHOICES},
+        "total": row["total"],
+    }
+
+
+def cached_facets(*, q: str, status: str, selected_tags, match: str = "any") -> dict:
+    """
+    compute_facets() memoized per filter key. Any proposal/tag change bumps the
+    version (see portal.signals), which orphans every cached entry at once. The
+    cache is the shared one from settings.CACHES, so a bump made by one worker or
+    management command reaches every worker.
+    """
+    version = cache.get_or_set(FACET_VERSION_KEY, time.time_ns, timeout=None)
+    filter_key = json.dumps([q, status, sorted(set(selected_tags)), match])
+    key = f"portal:facets:{version}:{hashlib.md5(filter_key.encode('utf-8')).hexdigest()}"
+
+    facets = cache.get(key)
+    if facets is None:
+        facets = compute_facets(q=q, status=status, selected_tags=selected_tags, match=match)
+        cache.set(key, facets, FACET_CACHE_SECONDS)
+    return facets
+
+
+def invalidate_facets() -> None:
+    try:
+        cache.incr(FACET_VERSION_KEY)
+    except ValueError:
+        # Key was evicted: start from a fresh value that can't collide with old entries
+        cache.set(FACET_VERSION_KEY, time.time_ns(), timeout=None)
@@ -0,0 +1,162 @@
+"""
+Local stand-in for Brevo's transactional email endpoint.
+
+Accepts POST /v3/smtp/email exactly like https://api.brevo.com, records each
+message in memory, and can inject latency, random 5xx errors and 429 rate
+limiting. Point the portal at it with BREVO_API_URL=http://127.0.0.1:<port>/v3/smtp/email.
+
+Used by `manage.py fake_brevo` (standalone) and `manage.py bench_email` (in-process).
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SEND_PATH = "/v3/smtp/email"
+MESSAGES_PATH = "/messages"
+
+
+class FakeBrevoServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit: float = 0.0,
+        keep: int = 10_000,
+        seed: int | None = None,
+    ):
+        """
+        latency/jitter: seconds added to every send (uniform in latency +/- jitter)
+        error_rate:     fraction of sends answered with 500
+        rate_limit:     sends per second before answering 429 (0 = unlimited)
+        keep:           how many recorded messages to retain
+        """
+        super().__init__((host, port), _Handler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.messages: deque[dict] = deque(maxlen=keep)
+        self.counts = {"accepted": 0, "errors": 0, "rate_limited": 0, "rejected": 0}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens = rate_limit
+        self._refilled_at = time.monotonic()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{SEND_PATH}"
+
+    def start(self) -> "FakeBrevoServer":
+        self._thread = threading.Thread(target=self.serve_forever, name="fake-brevo", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self) -> "FakeBrevoServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # --- decisions made per request -------------------------------------
+    def _delay(self) -> float:
+        with self._lock:
+            return max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+
+    def _take_token(self) -> bool:
+        if not self.rate_limit:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate_limit, self._tokens + (now - self._refilled_at) * self.rate_limit)
+            self._refilled_at = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def _fails(self) -> bool:
+        with self._lock:
+            return self._rng.random() < self.error_rate
+
+    def _record(self, outcome: str, message: dict | None = None) -> None:
+        with self._lock:
+            self.counts[outcome] += 1
+            if message is not None:
+                self.messages.append(message)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: FakeBrevoServer
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("content-length") or 0))
+        if self.path != SEND_PATH:
+            return self._reply(404, {"code": "not_found", "message": "Unknown endpoint"})
+
+        if not self.headers.get("api-key"):
+            self.server._record("rejected")
+            return self._reply(401, {"code": "unauthorized", "message": "Key not found"})
+
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            self.server._record("rejected")
+            return self._reply(400, {"code": "bad_request", "message": "Invalid JSON"})
+        if not payload.get("sender") or not payload.get("to") or not payload.get("subject"):
+            self.server._record("rejected")
+            return self._reply(400, {"code": "missing_parameter", "message": "sender, to and subject are required"})
+
+        if not self.server._take_token():
+            self.server._record("rate_limited")
+            return self._reply(429, {"code": "too_many_requests", "message": "Rate limit exceeded"})
+
+        delay = self.server._delay()
+        if delay:
+            time.sleep(delay)
+
+        if self.server._fails():
+            self.server._record("errors")
+            return self._reply(500, {"code": "internal_error", "message": "Injected failure"})
+
+        message_id = f"<{uuid.uuid4().hex}@fake-brevo.local>"
+        self.server._record("accepted", {"messageId": message_id, "received_at": time.time(), **payload})
+        return self._reply(201, {"messageId": message_id})
+
+    def do_GET(self):
+        if self.path != MESSAGES_PATH:
+            return self._reply(404, {"code": "not_found", "message": "Unknown endpoint"})
+        with self.server._lock:
+            data = {"counts": dict(self.server.counts), "messages": list(self.server.messages)}
+        return self._reply(200, data)
+
+    def _reply(self, status: int, data: dict) -> None:
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Thousands of requests per second would otherwise flood stderr
+        pass
@@ -1,3 +1,5 @@
+import secrets
+
 from django import forms
 from django.forms import formset_factory
 
@@ -25,6 +27,9 @@ class ProposalForm(forms.ModelForm):
             "background",
             "aims",
             "status",
+            "deadline",
+            "max_volunteers",
+            "notify_frequency",
             "tags",
         ]
         widgets = {
@@ -47,6 +52,13 @@ class ProposalForm(forms.ModelForm):
                 attrs={"class": "form-control", "rows": 4, "placeholder": "Optional aims / tasks"}
             ),
             "status": forms.Select(attrs={"class": "form-select"}),
+            "deadline": forms.DateInput(format="%Y-%m-%d", attrs={"class": "form-control", "type": "date"}),
+            "max_volunteers": forms.NumberInput(attrs={"class": "form-control", "min": 1, "placeholder": "No limit"}),
+            "notify_frequency": forms.Select(attrs={"class": "form-select"}),
+        }
+        labels = {
+            "max_volunteers": "Maximum volunteers",
+            "notify_frequency": "Signup notifications",
         }
 
 
@@ -83,6 +95,14 @@ QuestionFormSet = formset_factory(
 # Signup forms
 # -------------------------------------------------------
 class SignupForm(forms.ModelForm):
+    # Not a model field on purpose: a replayed key must reach the view, not fail unique validation
+    idempotency_key = forms.CharField(widget=forms.HiddenInput, required=False, max_length=64)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if not self.is_bound:
+            self.initial.setdefault("idempotency_key", secrets.token_urlsafe(24))
+
     class Meta:
         model = Signup
         fields = ["name", "email"]
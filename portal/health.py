@@ -0,0 +1,146 @@
+"""
+Liveness, readiness and worker warm-up.
+
+    GET /healthz   200 while the process can answer at all (no database access)
+    GET /readyz    200 once the database answers and every migration is applied,
+                   503 naming the failing check otherwise (details go to the log)
+
+warm_up() runs once per worker before it takes traffic (gunicorn.conf.py calls
+it from post_worker_init). It builds the URL resolver, compiles every page and
+email template into the cached loaders and fills the caches the home page and
+search box use, so a freshly deployed worker serves its first requests at
+normal speed. It does not prime database connections: Django keeps one per
+thread, and the threads that run views (the gthread pool, or the per-request
+threads of the ASGI handler) open their own on first use, so the connection
+warm_up needed is closed again rather than left idle in the main thread (the
+sync worker, which serves from that thread, keeps it).
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from pathlib import Path
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import HttpRequest, JsonResponse
+from django.template.loader import get_template
+from django.urls import get_resolver, reverse
+from django.views.decorators.cache import never_cache
+
+log = logging.getLogger("portal.startup")
+health_log = logging.getLogger("portal.health")
+
+PAGE_TEMPLATE_DIR = Path(__file__).resolve().parent / "templates"
+
+# Set once every migration is applied; a deploy with new migrations starts new processes
+_migrated = False
+
+
+def _check_database() -> None:
+    with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+
+
+def _check_migrations() -> None:
+    global _migrated
+    if _migrated:
+        return
+    # Only needed until the first successful check
+    from django.db.migrations.executor import MigrationExecutor
+
+    connection = connections[DEFAULT_DB_ALIAS]
+    executor = MigrationExecutor(connection)
+    pending = executor.migration_plan(executor.loader.graph.leaf_nodes())
+    if pending:
+        raise RuntimeError(f"{len(pending)} unapplied migration(s), next: {pending[0][0]}")
+    _migrated = True
+
+
+@never_cache
+def healthz(request: HttpRequest) -> JsonResponse:
+    return JsonResponse({"status": "ok"})
+
+
+@never_cache
+def readyz(request: HttpRequest) -> JsonResponse:
+    checks = {}
+    ok = True
+    for name, check in (("database", _check_database), ("migrations", _check_migrations)):
+        try:
+            check()
+            checks[name] = "ok"
+        except Exception:
+            # The response is public: no exception text, which can carry hosts or SQL
+            health_log.exception("Readiness check failed.", extra={"event": "readyz", "check": name})
+            checks[name] = "failed"
+            ok = False
+            # Migrations can't be checked without a database
+            break
+    return JsonResponse({"status": "ok" if ok else "unavailable", "checks": checks}, status=200 if ok else 503)
+
+
+def _page_templates() -> list[str]:
+    root = PAGE_TEMPLATE_DIR / "portal"
+    return sorted(str(p.relative_to(PAGE_TEMPLATE_DIR)) for p in root.rglob("*.html"))
+
+
+def _email_names() -> list[str]:
+    from .emails import EMAIL_DIR
+
+    root = PAGE_TEMPLATE_DIR / EMAIL_DIR
+    return sorted(p.name.removesuffix(".subject.txt") for p in root.glob("*.subject.txt"))
+
+
+def _warm_urls() -> None:
+    # Imports every urlconf and view module, then builds the reverse() lookup tables
+    get_resolver().resolve("/")
+    reverse("home")
+
+
+def _warm_templates() -> int:
+    from .emails import _templates
+
+    names = _page_templates()
+    for name in names:
+        get_template(name)
+    emails = _email_names()
+    for name in emails:
+        _templates(name)
+    return len(names) + len(emails)
+
+
+def _warm_caches() -> None:
+    from .facets import cached_facets
+    from .suggest import get_index
+
+    # The unfiltered home page (the most common facet key; also reads the tag catalog)
+    cached_facets(q="", status="", selected_tags=[], match="any")
+    get_index()
+
+
+def warm_up(*, keep_connections: bool = False) -> dict[str, float]:
+    """
+    Prime this process before it serves traffic. Returns milliseconds per step;
+    a failing step is logged and skipped so a warm-up problem never blocks boot.
+    Pass keep_connections when this thread goes on to serve the requests.
+    """
+    steps = {
+        "urls": _warm_urls,
+        "templates": _warm_templates,
+        "caches": _warm_caches,
+    }
+    timings: dict[str, float] = {}
+    for name, step in steps.items():
+        started = time.perf_counter()
+        try:
+            step()
+        except Exception:
+            log.exception("Warm-up step failed.", extra={"event": "warm_up", "step": name})
+            continue
+        timings[name] = round((time.perf_counter() - started) * 1000, 1)
+    if not keep_connections:
+        connections.close_all()
+    log.info("Worker warmed up.", extra={"event": "warm_up", "ms": timings})
+    return timings
@@ -0,0 +1,174 @@
+"""
+Structured logging: one JSON object per line on stdout, written off the request path.
+
+- QueueingHandler puts records on a bounded in-memory queue; a QueueListener
+  thread formats and writes them, so a slow stdout never stalls a request. When
+  the queue is full, records are dropped rather than blocking, and counted in
+  portal_log_records_dropped_total (portal/metrics.py).
+- RequestIdMiddleware gives each request an id (the incoming X-Request-ID, or a
+  new one), echoes it in the response and stamps it on every record logged
+  while the request runs.
+- SamplingFilter keeps only a fraction of high-volume INFO events, the ones
+  logged with extra={"sampled": True}. Warnings and errors are always kept.
+
+Configured from LOGGING in config/settings.py.
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import uuid
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.core.signals import request_finished
+from django.dispatch import receiver
+from django.http import HttpRequest, HttpResponse
+
+from .metrics import record_log_drop
+
+request_id: contextvars.ContextVar[str | None] = contextvars.ContextVar("request_id", default=None)
+
+# Attributes every LogRecord has; anything else on a record came from `extra=`
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+# Accepted incoming request ids: long enough to be unique, short enough not to bloat every line
+_MAX_REQUEST_ID = 64
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and key != "sampled":
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class RequestIdFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        # "-" outside a request (management commands, startup), so text formats can always use it
+        record.request_id = request_id.get() or "-"
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    def __init__(self, rate: float = 1.0):
+        super().__init__()
+        self.rate = max(0.0, min(1.0, float(rate)))
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not getattr(record, "sampled", False):
+            return True
+        if random.random() >= self.rate:
+            return False
+        # Lets whoever counts these lines scale them back up
+        record.sample_rate = self.rate
+        return True
+
+
+class QueueingHandler(QueueHandler):
+    """
+    QueueHandler with its own listener thread writing to `stream` (stdout by default).
+    The listener is restarted in forked children (gunicorn --preload), which do not inherit threads.
+    """
+
+    def __init__(self, maxsize: int = 10_000, stream=None):
+        super().__init__(queue.Queue(maxsize))
+        self.target = logging.StreamHandler(stream or sys.stdout)
+        self.dropped = 0
+        self._start_listener()
+        atexit.register(self._stop_listener)
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def _start_listener(self) -> None:
+        self.listener = QueueListener(self.queue, self.target, respect_handler_level=False)
+        self.listener.start()
+
+    def _stop_listener(self) -> None:
+        if self.listener._thread is not None:
+            self.listener.stop()
+
+    def _after_fork(self) -> None:
+        # The parent's listener thread is gone here; records queued before the fork are dropped with it
+        self.queue = queue.Queue(self.queue.maxsize)
+        self.dropped = 0
+        self._start_listener()
+
+    def setFormatter(self, fmt: logging.Formatter | None) -> None:
+        # Formatting happens in the listener thread, on the target
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve lazy %-args now (they may change after this call returns); leave
+        # formatting, including tracebacks, to the listener thread
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            record_log_drop()
+
+
+class RequestIdMiddleware:
+    header = "X-Request-ID"
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if self.async_mode:
+            return self.__acall__(request)
+        rid = self._start(request)
+        response = self.get_response(request)
+        response[self.header] = rid
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        rid = self._start(request)
+        response = await self.get_response(request)
+        response[self.header] = rid
+        return response
+
+    def _start(self, request: HttpRequest) -> str:
+        incoming = request.headers.get(self.header, "")
+        rid = incoming if 0 < len(incoming) <= _MAX_REQUEST_ID and incoming.isprintable() else uuid.uuid4().hex
+        request.request_id = rid
+        # Cleared on request_finished rather than here, so Django's own "Not Found" / error
+        # records, logged after the middleware chain returns, still carry the id. Under
+        # ASGI each request runs in its own task, whose context ends with it.
+        request_id.set(rid)
+        return rid
+
+
+@receiver(request_finished)
+def _clear_request_id(sender, **kwargs):
+    request_id.set(None)
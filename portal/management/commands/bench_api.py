@@ -0,0 +1,135 @@
+import json
+import secrets
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from portal import api
+from portal.benchmarks import time_call
+from portal.models import Proposal, ProposalQuestion, Signup, SignupAnswer, Tag
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the /api/v1/ JSON endpoints in-process (no HTTP server) and report items "
+        "serialized per second for one worker. Fixture rows are created inside a transaction "
+        "and rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--proposals", type=int, default=5000)
+        parser.add_argument("--signups", type=int, default=2000, help="Signups on the owner-endpoint proposal.")
+        parser.add_argument("--limit", type=int, default=api.MAX_LIMIT, help="Page size requested.")
+        parser.add_argument("--iterations", type=int, default=50)
+        parser.add_argument("--warmup", type=int, default=5)
+
+    def handle(self, *args, **options):
+        limit = options["limit"]
+        factory = RequestFactory()
+
+        with transaction.atomic():
+            proposal = self._build(options["proposals"], options["signups"])
+            signups_path = f"/api/v1/proposals/{proposal.slug}/owner/{proposal.owner_token}/signups/"
+
+            first = api.proposal_list(factory.get("/api/v1/proposals/", {"limit": limit}))
+            deep = first
+            for _ in range(5):
+                next_url = json.loads(deep.content)["next"]
+                if not next_url:
+                    break
+                deep = api.proposal_list(factory.get(next_url))
+            deep_cursor = factory.get(json.loads(deep.content)["next"] or "/").GET.get("cursor", "")
+
+            scenarios = [
+                ("proposals, default fields", api.proposal_list, "/api/v1/proposals/", {"limit": limit}, {}),
+                (
+                    "proposals, fields=slug,title",
+                    api.proposal_list,
+                    "/api/v1/proposals/",
+                    {"limit": limit, "fields": "slug,title"},
+                    {},
+                ),
+                (
+                    "proposals, page 7 via cursor",
+                    api.proposal_list,
+                    "/api/v1/proposals/",
+                    {"limit": limit, "cursor": deep_cursor},
+                    {},
+                ),
+                (
+                    "proposals, If-None-Match (304)",
+                    api.proposal_list,
+                    "/api/v1/proposals/",
+                    {"limit": limit},
+                    {"HTTP_IF_NONE_MATCH": first["ETag"]},
+                ),
+                ("signups, default fields", api.proposal_signups, signups_path, {"limit": limit}, {}),
+                (
+                    "signups, with answers",
+                    api.proposal_signups,
+                    signups_path,
+                    {"limit": limit, "fields": "id,name,status,answers"},
+                    {},
+                ),
+            ]
+            for label, view, path, params, headers in scenarios:
+                kwargs = {}
+                if view is api.proposal_signups:
+                    kwargs = {"slug": proposal.slug, "token": proposal.owner_token}
+
+                def call():
+                    return view(factory.get(path, params, **headers), **kwargs)
+
+                with CaptureQueriesContext(connection) as ctx:
+                    response = call()
+                items = len(json.loads(response.content)["results"]) if response.status_code == 200 else limit
+                timing = time_call(
+                    f"{label} ({len(ctx.captured_queries)}q)",
+                    call,
+                    iterations=options["iterations"],
+                    warmup=options["warmup"],
+                )
+                self.stdout.write(f"{timing.format()}  {timing.per_second * items:10.0f} items/s")
+            transaction.set_rollback(True)
+
+    def _build(self, n_proposals: int, n_signups: int) -> Proposal:
+        tags = list(Tag.objects.all()[:6])
+        through = Proposal.tags.through
+        batch_size = 2000
+
+        for start in range(0, n_proposals, batch_size):
+            batch = [
+                Proposal(
+                    created_by_name="Bench",
+                    created_by_email="bench@example.com",
+                    title=f"API benchmark proposal {i}",
+                    slug=f"bench-api-{i}",
+                    summary="Retrospective chart review of outcomes. " * 4,
+                    owner_token=secrets.token_hex(32),
+                )
+                for i in range(start, min(start + batch_size, n_proposals))
+            ]
+            Proposal.objects.bulk_create(batch)
+            if tags:
+                ids = Proposal.objects.filter(slug__in=[p.slug for p in batch]).values_list("pk", flat=True)
+                through.objects.bulk_create([through(proposal_id=pk, tag_id=t.pk) for pk in ids for t in tags[:3]])
+
+        proposal = Proposal.objects.get(slug="bench-api-0")
+        questions = ProposalQuestion.objects.bulk_create(
+            [ProposalQuestion(proposal=proposal, prompt=f"Question {i}?", sort_order=i) for i in range(3)]
+        )
+        Signup.objects.bulk_create(
+            [
+                Signup(proposal=proposal, name=f"Volunteer {i}", email=f"v{i}@example.com")
+                for i in range(n_signups)
+            ],
+            batch_size=batch_size,
+        )
+        signup_ids = Signup.objects.filter(proposal=proposal).values_list("pk", flat=True)
+        SignupAnswer.objects.bulk_create(
+            [SignupAnswer(signup_id=pk, question=q, answer_text="Some answer text.") for pk in signup_ids for q in questions],
+            batch_size=batch_size,
+        )
+        return proposal
@@ -0,0 +1,87 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from portal import emailer
+from portal.benchmarks import Timing
+from portal.fake_brevo import FakeBrevoServer
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the real send_email() HTTP path against an in-process fake Brevo server "
+        "(no network, no API key needed)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--messages", type=int, default=2000)
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--latency", type=float, default=0.0)
+        parser.add_argument("--error-rate", type=float, default=0.0)
+        parser.add_argument("--rate-limit", type=float, default=0.0)
+
+    def handle(self, *args, **options):
+        server = FakeBrevoServer(
+            latency=options["latency"],
+            error_rate=options["error_rate"],
+            rate_limit=options["rate_limit"],
+            seed=1,
+        )
+        overrides = {
+            "BREVO_API_URL": server.url,
+            "BREVO_API_KEY": os.environ.get("BREVO_API_KEY") or "bench-key",
+            "DEFAULT_FROM_EMAIL": os.environ.get("DEFAULT_FROM_EMAIL") or "MSRIG Bench <bench@example.com>",
+        }
+        saved = {k: os.environ.get(k) for k in overrides}
+        os.environ.update(overrides)
+        # A circuit of its own: the live one is shared through the cache, and injected errors must not open it
+        live_breaker = emailer.breaker
+        breaker = emailer.breaker = emailer.CircuitBreaker(
+            threshold=live_breaker.threshold,
+            window=live_breaker.window,
+            cooldown=live_breaker.cooldown,
+            prefix="portal:brevo:circuit:bench",
+        )
+
+        outcomes = {"ok": 0, "failed": 0, "circuit_open": 0}
+        latencies: list[float] = []
+        lock = threading.Lock()
+
+        def send(i: int) -> None:
+            started = time.perf_counter()
+            try:
+                emailer.send_email(subject=f"Bench {i}", to_email=f"bench{i}@example.com", text_body="Hello")
+                outcome = "ok"
+            except emailer.CircuitOpenError:
+                outcome = "circuit_open"
+            except RuntimeError:
+                outcome = "failed"
+            with lock:
+                latencies.append(time.perf_counter() - started)
+                outcomes[outcome] += 1
+
+        try:
+            with server:
+                started = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=options["threads"]) as pool:
+                    list(pool.map(send, range(options["messages"])))
+                elapsed = time.perf_counter() - started
+        finally:
+            emailer.breaker = live_breaker
+            for key, value in saved.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+
+        self.stdout.write(Timing("send_email() latency", latencies).format())
+        self.stdout.write(
+            f"throughput: {options['messages'] / elapsed:,.0f} msg/s over {options['threads']} thread(s)\n"
+            f"client outcomes: {outcomes}\n"
+            f"server counts:   {server.counts}\n"
+            f"breaker state:   {breaker.state}, timeout now {emailer.timeout.current():.2f}s"
+        )
+        breaker.record_success()
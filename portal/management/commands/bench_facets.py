@@ -0,0 +1,112 @@
+import random
+import secrets
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from portal.benchmarks import time_call
+from portal.facets import cached_facets, compute_facets
+from portal.models import TAG_MASK_BITS, Proposal, Tag
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark home-page facet counts against a synthetic catalog "
+        "(default 50k proposals / 200 tags). Everything is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--proposals", type=int, default=50_000)
+        parser.add_argument("--tags", type=int, default=200)
+        parser.add_argument("--tags-per-proposal", type=int, default=3)
+        parser.add_argument("--iterations", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+
+        with transaction.atomic():
+            tags = self._make_tags(options["tags"])
+            self._make_proposals(rng, tags, options["proposals"], options["tags_per_proposal"])
+            with_bits = sum(1 for t in tags if t.bit is not None)
+            self.stdout.write(
+                f"catalog: {Proposal.objects.count()} proposals, {len(tags)} tags "
+                f"({with_bits} on the bitset, {len(tags) - with_bits} via M2M fallback)"
+            )
+
+            bit_tags = [t.slug for t in tags if t.bit is not None][:2]
+            scenarios = [
+                ("no filter", {"q": "", "status": "", "selected_tags": []}),
+                ("q=cohort", {"q": "cohort", "status": "", "selected_tags": []}),
+                ("status=OPEN", {"q": "", "status": "OPEN", "selected_tags": []}),
+                ("2 tags, any", {"q": "", "status": "", "selected_tags": bit_tags, "match": "any"}),
+                ("2 tags, all", {"q": "", "status": "", "selected_tags": bit_tags, "match": "all"}),
+            ]
+            for label, kwargs in scenarios:
+                with CaptureQueriesContext(connection) as ctx:
+                    compute_facets(**kwargs)
+                timing = time_call(
+                    f"{label} ({len(ctx.captured_queries)} queries)",
+                    lambda: compute_facets(**kwargs),
+                    iterations=options["iterations"],
+                    warmup=0,
+                )
+                self.stdout.write(timing.format())
+
+            kwargs = scenarios[0][1]
+            cached_facets(**kwargs)
+            self.stdout.write(time_call("cached hit", lambda: cached_facets(**kwargs), iterations=1000).format())
+
+            transaction.set_rollback(True)
+
+    def _make_tags(self, n_tags: int) -> list[Tag]:
+        tags = list(Tag.objects.all())
+        used = {t.bit for t in tags if t.bit is not None}
+        free_bits = iter(b for b in range(TAG_MASK_BITS) if b not in used)
+
+        new_tags = [
+            Tag(name=f"Bench tag {i}", slug=f"bench-tag-{i}", bit=next(free_bits, None))
+            for i in range(max(0, n_tags - len(tags)))
+        ]
+        Tag.objects.bulk_create(new_tags)
+        return list(Tag.objects.all())
+
+    def _make_proposals(self, rng: random.Random, tags: list[Tag], n_proposals: int, per_proposal: int) -> None:
+        words = ["cohort", "outcomes", "imaging", "trial", "review", "registry", "pilot", "survey"]
+        statuses = [value for value, _label in Proposal.STATUS_CHOICES]
+        through = Proposal.tags.through
+        batch_size = 2000
+
+        for start in range(0, n_proposals, batch_size):
+            batch = []
+            picks = []
+            for i in range(start, min(start + batch_size, n_proposals)):
+                chosen = rng.sample(tags, k=min(per_proposal, len(tags)))
+                mask = 0
+                for t in chosen:
+                    mask |= t.mask
+                batch.append(
+                    Proposal(
+                        created_by_name="Bench",
+                        created_by_email="bench@example.com",
+                        title=f"{rng.choice(words)} {rng.choice(words)} study {i}",
+                        slug=f"bench-facets-{i}",
+                        summary=" ".join(rng.choices(words, k=12)),
+                        status=rng.choice(statuses),
+                        owner_token=secrets.token_hex(32),
+                        tag_mask=mask,
+                    )
+                )
+                picks.append(chosen)
+
+            created = Proposal.objects.bulk_create(batch)
+            if created and created[0].pk is None:
+                # Backends without RETURNING: look the rows back up by their unique slug
+                ids = dict(Proposal.objects.filter(slug__in=[p.slug for p in batch]).values_list("slug", "pk"))
+                for p in created:
+                    p.pk = ids[p.slug]
+
+            through.objects.bulk_create(
+                [through(proposal_id=p.pk, tag_id=t.pk) for p, chosen in zip(created, picks) for t in chosen]
+            )
@@ -0,0 +1,82 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.http import HttpResponse
+from django.test import Client, RequestFactory
+from django.urls import resolve
+
+from portal.benchmarks import time_call
+from portal.metrics import MetricsMiddleware, _QueryTimer, _request_timer, _timed_execute
+from portal.models import Proposal, Tag
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure what portal.metrics adds per request and per query, and compare it with the "
+        "full request time of real pages (target: under 1%). Fixture rows are rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=300)
+        parser.add_argument("--warmup", type=int, default=20)
+        parser.add_argument("--proposals", type=int, default=30)
+
+    def handle(self, *args, **options):
+        iterations, warmup = options["iterations"], options["warmup"]
+
+        with transaction.atomic():
+            slug = self._build(options["proposals"])
+            client = Client()
+            factory = RequestFactory()
+            canned = HttpResponse("ok")
+
+            # Recording cost alone: the middleware around a view that does nothing
+            def bookkeeping(path):
+                request = factory.get(path)
+                request.resolver_match = resolve(path)
+                middleware = MetricsMiddleware(lambda r: canned)
+                return lambda: middleware(request)
+
+            for path in ["/", f"/proposal/{slug}/", "/api/v1/proposals/", "/suggest/?q=bench"]:
+                full = time_call(f"GET {path}", lambda: client.get(path), iterations=iterations, warmup=warmup)
+                route = path.split("?")[0]
+                overhead = time_call("  metrics bookkeeping", bookkeeping(route), iterations=iterations, warmup=warmup)
+                share = overhead.mean_ms / full.mean_ms * 100 if full.mean_ms else 0.0
+                self.stdout.write(full.format())
+                self.stdout.write(f"{overhead.format()}  ({share:.2f}% of the request)")
+
+            def run_query():
+                return Tag.objects.filter(pk=0).exists()
+
+            # The wrapper sits on every connection; compare with it taken off, then with a request's timer set
+            installed = connection.execute_wrappers
+            connection.execute_wrappers = [w for w in installed if w is not _timed_execute]
+            try:
+                bare = time_call("query, bare", run_query, iterations=iterations * 5, warmup=warmup)
+            finally:
+                connection.execute_wrappers = installed
+
+            def in_request():
+                token = _request_timer.set(_QueryTimer())
+                try:
+                    run_query()
+                finally:
+                    _request_timer.reset(token)
+
+            timed = time_call("query, request timer set", in_request, iterations=iterations * 5, warmup=warmup)
+            self.stdout.write(bare.format())
+            self.stdout.write(f"{timed.format()}  (+{timed.mean_ms - bare.mean_ms:.4f}ms per query)")
+            transaction.set_rollback(True)
+
+    def _build(self, n_proposals: int) -> str:
+        tags = list(Tag.objects.all()[:4])
+        proposals = []
+        for i in range(max(1, n_proposals)):
+            p = Proposal.objects.create(
+                created_by_name=f"Bench Owner {i}",
+                created_by_email=f"bench{i}@example.com",
+                title=f"Bench metrics proposal {i}",
+                summary="Retrospective chart review of outcomes. " * 4,
+            )
+            p.tags.set(tags)
+            proposals.append(p)
+        return proposals[0].slug
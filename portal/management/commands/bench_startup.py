@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from portal.benchmarks import Timing, startup_probe
+
+PHASES = [
+    ("to_first_request", "time to first request"),
+    ("process", "  whole process"),
+    ("setup", "  django.setup()"),
+    ("wsgi", "  import config.wsgi"),
+    ("first_request", "  first request"),
+    ("second_request", "  second request"),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Cold-start benchmark: start a fresh interpreter `--runs` times, set Django up, import "
+        "config.wsgi and serve `--path` twice, and report each phase. Time to first request runs "
+        "from launching the process to the end of the first response. Reads the existing "
+        "database; nothing is written."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", default="/")
+        parser.add_argument("--runs", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=2, help="Untimed runs (fill the OS page cache).")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        samples: dict[str, list[float]] = {name: [] for name, _ in PHASES}
+        try:
+            for run in range(max(0, options["warmup"]) + max(1, options["runs"])):
+                phases, _ = startup_probe(path)
+                if run < options["warmup"]:
+                    continue
+                for name in samples:
+                    samples[name].append(phases[name])
+        except RuntimeError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(f"GET {path} -> {phases['status']}")
+        for name, label in PHASES:
+            self.stdout.write(Timing(label, samples[name]).format())
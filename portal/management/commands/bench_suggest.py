@@ -0,0 +1,67 @@
+import random
+import secrets
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import RequestFactory
+
+from portal.benchmarks import time_call
+from portal.facets import invalidate_facets
+from portal.models import Proposal
+from portal.suggest import PrefixIndex, get_index
+from portal.views import proposal_suggest
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark search-box suggestions: prefix index build time and per-keystroke lookups "
+        "against a synthetic catalog. Everything is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--proposals", type=int, default=20_000)
+        parser.add_argument("--iterations", type=int, default=1000)
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        words = ["cohort", "outcomes", "imaging", "trial", "review", "registry", "pilot", "survey", "sepsis", "stroke"]
+
+        with transaction.atomic():
+            Proposal.objects.bulk_create(
+                [
+                    Proposal(
+                        created_by_name="Bench",
+                        created_by_email="bench@example.com",
+                        title=" ".join(rng.choices(words, k=4)) + f" study {i}",
+                        slug=f"bench-suggest-{i}",
+                        owner_token=secrets.token_hex(32),
+                    )
+                    for i in range(options["proposals"])
+                ],
+                batch_size=2000,
+            )
+            invalidate_facets()
+
+            build = time_call("build index", lambda: PrefixIndex.build(version=None), iterations=3, warmup=0)
+            self.stdout.write(build.format())
+            index = get_index()
+            self.stdout.write(f"index: {len(index.items)} items, {len(index.keys)} keys")
+
+            for prefix in ["s", "st", "str", "stroke", "stroke pilot", "zzz"]:
+                timing = time_call(
+                    f"lookup {prefix!r}",
+                    lambda: index.lookup(prefix),
+                    iterations=options["iterations"],
+                )
+                self.stdout.write(timing.format())
+
+            factory = RequestFactory()
+            timing = time_call(
+                "GET /suggest/?q=co (view)",
+                lambda: proposal_suggest(factory.get("/suggest/", {"q": "co"})),
+                iterations=options["iterations"],
+            )
+            self.stdout.write(timing.format())
+            transaction.set_rollback(True)
+        invalidate_facets()
@@ -0,0 +1,104 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.template import engines
+from django.template.loader import get_template
+from django.template.loaders.cached import Loader as CachedLoader
+from django.test import RequestFactory
+from django.utils import timezone
+
+from portal.benchmarks import time_call
+from portal.forms import ProposalForm, QuestionFormSet, SignupForm
+from portal.models import Proposal, ProposalQuestion, Signup, SignupAnswer, Tag
+from portal.similarity import rebuild
+from portal.views import _home_context, _normalize_signup_for_template, _proposal_questions, _similar
+
+
+class Command(BaseCommand):
+    help = (
+        "Micro-benchmark template rendering for every portal page. "
+        "Fixture rows are created inside a transaction and rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=200)
+        parser.add_argument("--warmup", type=int, default=10)
+        parser.add_argument("--proposals", type=int, default=30, help="Cards rendered on the home page.")
+        parser.add_argument("--signups", type=int, default=25, help="Signups rendered on the owner dashboard.")
+
+    def handle(self, *args, **options):
+        loaders = engines["django"].engine.template_loaders
+        cached = any(isinstance(loader, CachedLoader) for loader in loaders)
+        self.stdout.write(f"cached template loader: {'yes' if cached else 'no'}")
+
+        with transaction.atomic():
+            pages = self._build_pages(options["proposals"], options["signups"])
+            for name, context in pages:
+                template = get_template(name)
+                request = RequestFactory().get("/")
+                timing = time_call(
+                    name,
+                    lambda: template.render(context, request),
+                    iterations=options["iterations"],
+                    warmup=options["warmup"],
+                )
+                self.stdout.write(timing.format())
+            transaction.set_rollback(True)
+
+    def _build_pages(self, n_proposals: int, n_signups: int) -> list[tuple[str, dict]]:
+        tags = list(Tag.objects.all()[:6])
+
+        # A few topics, so the similar-proposals panel has neighbors to show
+        topics = ["cardiac surgery", "renal failure", "stroke rehabilitation"]
+        proposals = []
+        for i in range(max(1, n_proposals)):
+            p = Proposal.objects.create(
+                created_by_name=f"Bench Owner {i}",
+                created_by_email=f"bench{i}@example.com",
+                title=f"Benchmark proposal {i}: {topics[i % len(topics)]}",
+                summary="Retrospective chart review of outcomes. " * 8,
+                background="Background paragraph.\n\n" * 3,
+                aims="Aim one.\nAim two.\nAim three.",
+            )
+            p.tags.set(tags)
+            proposals.append(p)
+
+        proposal = proposals[0]
+        questions = ProposalQuestion.objects.bulk_create(
+            [ProposalQuestion(proposal=proposal, prompt=f"Question {i}?", sort_order=i) for i in range(3)]
+        )
+        signups = Signup.objects.bulk_create(
+            [Signup(proposal=proposal, name=f"Volunteer {i}", email=f"v{i}@example.com") for i in range(n_signups)]
+        )
+        SignupAnswer.objects.bulk_create(
+            [SignupAnswer(signup=s, question=q, answer_text="Some answer text.") for s in signups for q in questions]
+        )
+
+        # The views' own context builders, evaluated once so only rendering is timed
+        home = _home_context(q="", status="", selected_tags=[], tag_match="any")
+        home["proposals"] = list(home["proposals"])
+        rebuild()
+        detail = Proposal.objects.prefetch_related("tags", "questions").get(pk=proposal.pk)
+        dashboard_signups = [
+            _normalize_signup_for_template(s)
+            for s in Signup.objects.filter(proposal=proposal).order_by("-created_at").prefetch_related("answers__question")
+        ]
+
+        return [
+            ("portal/home.html", home),
+            ("portal/proposal_detail.html", {"proposal": detail, "similar": _similar(detail)}),
+            ("portal/proposal_create.html", {"form": ProposalForm(), "qset": QuestionFormSet(prefix="q")}),
+            (
+                "portal/proposal_signup.html",
+                {"proposal": detail, "form": SignupForm(), "questions": _proposal_questions(detail), "q_errors": {}},
+            ),
+            (
+                "portal/proposal_owner_dashboard.html",
+                {
+                    "proposal": proposal,
+                    "signups": dashboard_signups,
+                    "token": proposal.owner_token,
+                    "since": timezone.now().isoformat(),
+                },
+            ),
+            ("portal/proposal_owner_delete_confirm.html", {"proposal": proposal, "token": proposal.owner_token}),
+        ]
@@ -0,0 +1,172 @@
+import http.client
+import importlib.util
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from portal.benchmarks import Timing
+from portal.models import Proposal
+
+CONFIG = Path(settings.BASE_DIR) / "gunicorn.conf.py"
+# Worker class -> (gunicorn -k value, app), tried in order; uvicorn moved its worker to a separate package
+WORKER_CLASSES = {
+    "sync": [("sync", "config.wsgi:application")],
+    "gthread": [("gthread", "config.wsgi:application")],
+    "uvicorn": [
+        ("uvicorn_worker.UvicornWorker", "config.asgi:application"),
+        ("uvicorn.workers.UvicornWorker", "config.asgi:application"),
+    ],
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _importable(dotted: str) -> bool:
+    if "." not in dotted:
+        return True
+    module = dotted.rpartition(".")[0]
+    try:
+        return importlib.util.find_spec(module) is not None
+    except ModuleNotFoundError:
+        return False
+
+
+class Command(BaseCommand):
+    help = (
+        "Start gunicorn (with gunicorn.conf.py) once per worker class, drive it with concurrent "
+        "keep-alive clients over real HTTP and report throughput and latency. Reads the existing "
+        "database; nothing is written. uvicorn is only measured when it is installed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--classes", default="sync,gthread,uvicorn", help="Comma-separated: sync, gthread, uvicorn.")
+        parser.add_argument("--workers", type=int, default=2)
+        parser.add_argument("--threads", type=int, default=4, help="Threads per gthread worker.")
+        parser.add_argument("--concurrency", type=int, default=16, help="Client connections.")
+        parser.add_argument("--duration", type=float, default=10.0, help="Seconds of load per class.")
+
+    def handle(self, *args, **options):
+        paths = ["/", "/api/v1/proposals/", "/suggest/?q=a", "/healthz"]
+        slug = Proposal.objects.filter(status="OPEN").values_list("slug", flat=True).first()
+        if slug:
+            paths.insert(1, f"/proposal/{slug}/")
+
+        self.stdout.write(
+            f"{options['workers']} worker(s), {options['concurrency']} connections, "
+            f"{options['duration']:.0f}s per class; paths: {', '.join(paths)}"
+        )
+        for name in [c.strip() for c in options["classes"].split(",") if c.strip()]:
+            if name not in WORKER_CLASSES:
+                raise CommandError(f"Unknown worker class {name!r}; choose from {', '.join(WORKER_CLASSES)}.")
+            candidates = [(k, app) for k, app in WORKER_CLASSES[name] if _importable(k)]
+            if not candidates:
+                self.stdout.write(f"{name}: skipped (not installed)")
+                continue
+            worker_class, app = candidates[0]
+            self._run(name, worker_class, app, paths, options)
+
+    def _run(self, name, worker_class, app, paths, options):
+        port = _free_port()
+        with tempfile.TemporaryDirectory() as tmp, open(Path(tmp) / "server.log", "w+") as log:
+            env = {
+                **os.environ,
+                "WEB_CONCURRENCY": str(options["workers"]),
+                "GUNICORN_THREADS": str(options["threads"] if name == "gthread" else 1),
+                # Its own sample directory, so the run never wipes a live server's metrics
+                "PROMETHEUS_MULTIPROC_DIR": str(Path(tmp) / "metrics"),
+            }
+            server = subprocess.Popen(
+                [
+                    sys.executable, "-m", "gunicorn", "-c", str(CONFIG), "-k", worker_class,
+                    "--bind", f"127.0.0.1:{port}", "--no-control-socket", "--log-level", "warning", app,
+                ],
+                cwd=settings.BASE_DIR,
+                env=env,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+            )
+            try:
+                if not self._wait_ready(server, port):
+                    log.seek(0)
+                    self.stderr.write(f"{name}: server did not become ready\n{log.read()[-2000:]}")
+                    return
+                timing, errors = self._load(name, port, paths, options["concurrency"], options["duration"])
+            finally:
+                server.terminate()
+                try:
+                    server.wait(timeout=30)
+                except subprocess.TimeoutExpired:
+                    server.kill()
+
+        rate = len(timing.samples) / options["duration"]
+        self.stdout.write(
+            f"{name:<8} {rate:8.1f} req/s  p50={timing.p50_ms:7.2f}ms  p95={timing.p95_ms:7.2f}ms  "
+            f"n={len(timing.samples)}  errors={errors}"
+        )
+
+    def _wait_ready(self, server: subprocess.Popen, port: int, timeout: float = 60.0) -> bool:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                return False
+            try:
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+                conn.request("GET", "/readyz")
+                if conn.getresponse().status == 200:
+                    return True
+            except OSError:
+                pass
+            time.sleep(0.2)
+        return False
+
+    def _load(self, name: str, port: int, paths: list[str], concurrency: int, duration: float):
+        samples: list[float] = []
+        errors = 0
+        lock = threading.Lock()
+        start_at = time.perf_counter() + 0.1
+        stop_at = start_at + duration
+
+        def client(offset: int):
+            nonlocal errors
+            mine, failed = [], 0
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+            i = offset
+            while time.perf_counter() < start_at:
+                time.sleep(0.001)
+            while (now := time.perf_counter()) < stop_at:
+                path = paths[i % len(paths)]
+                i += 1
+                try:
+                    conn.request("GET", path)
+                    response = conn.getresponse()
+                    response.read()
+                    if response.status >= 400:
+                        failed += 1
+                    mine.append(time.perf_counter() - now)
+                except (OSError, http.client.HTTPException):
+                    failed += 1
+                    conn.close()
+                    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+            conn.close()
+            with lock:
+                samples.extend(mine)
+                errors += failed
+
+        threads = [threading.Thread(target=client, args=(n,)) for n in range(max(1, concurrency))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return Timing(name, samples), errors
@@ -0,0 +1,122 @@
+import re
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from portal.emails import EMAIL_DIR, EMAIL_PARTS
+
+
+# Template names referenced from Python code, e.g. render(request, "portal/home.html", ...)
+PY_TEMPLATE_REF = re.compile(r"""["']([\w./-]+\.(?:html|txt))["']""")
+
+# Emails are rendered by base name (portal/emails.py), e.g. render_email("signup_new", ...);
+# any quoted bare name counts as a reference to email/<name>.subject.txt/.txt/.html
+PY_EMAIL_REF = re.compile(r"""["']([\w-]+)["']""")
+
+# {% extends "..." %} / {% include "..." %} inside templates
+TEMPLATE_TEMPLATE_REF = re.compile(r"""{%\s*(?:extends|include)\s+["']([^"']+)["']""")
+
+# Hand-made copies left next to live files: views_backup.py, home_backup_before_x.html,
+# settings.py.bak_email_fix, ...
+COPY_MARKERS = re.compile(r"(_backup|_before_|\.bak)")
+
+
+class Command(BaseCommand):
+    help = "Flag unreferenced templates and backup copies of modules/templates (optionally delete them)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--delete",
+            action="store_true",
+            help="Delete every flagged file instead of only listing it.",
+        )
+        parser.add_argument(
+            "--strict",
+            action="store_true",
+            help="Exit non-zero if anything is flagged (for CI / deploy checks).",
+        )
+
+    def handle(self, *args, **options):
+        base_dir = Path(settings.BASE_DIR)
+        app_dirs = [Path(cfg.path) for cfg in apps.get_app_configs() if Path(cfg.path).is_relative_to(base_dir)]
+        source_dirs = app_dirs + [base_dir / "config"]
+
+        module_copies = sorted(
+            p for d in source_dirs for p in d.rglob("*") if p.is_file() and self._is_copy(p)
+        )
+
+        templates = self._collect_templates(app_dirs)
+        live_modules = [
+            p
+            for d in source_dirs
+            for p in d.rglob("*.py")
+            if p not in module_copies and "migrations" not in p.parts
+        ]
+        referenced = self._referenced_templates(live_modules, templates)
+
+        unreferenced = sorted(
+            path for name, path in templates.items() if name not in referenced and path not in module_copies
+        )
+        flagged = module_copies + unreferenced
+
+        for path in module_copies:
+            self.stdout.write(f"copy          {path.relative_to(base_dir)}")
+        for path in unreferenced:
+            self.stdout.write(f"unreferenced  {path.relative_to(base_dir)}")
+
+        if not flagged:
+            self.stdout.write(self.style.SUCCESS("No dead templates or module copies found."))
+            return
+
+        if options["delete"]:
+            for path in flagged:
+                path.unlink()
+            self.stdout.write(self.style.SUCCESS(f"Deleted {len(flagged)} file(s)."))
+            return
+
+        summary = f"{len(module_copies)} copy file(s), {len(unreferenced)} unreferenced template(s)."
+        if options["strict"]:
+            raise CommandError(summary)
+        self.stdout.write(self.style.WARNING(summary))
+
+    @staticmethod
+    def _is_copy(path: Path) -> bool:
+        return "__pycache__" not in path.parts and bool(COPY_MARKERS.search(path.name))
+
+    @staticmethod
+    def _collect_templates(app_dirs: list[Path]) -> dict[str, Path]:
+        """
+        Map template name (as passed to get_template) -> file path.
+        """
+        templates: dict[str, Path] = {}
+        for app_dir in app_dirs:
+            root = app_dir / "templates"
+            if not root.is_dir():
+                continue
+            for path in root.rglob("*"):
+                if path.is_file():
+                    templates.setdefault(path.relative_to(root).as_posix(), path)
+        return templates
+
+    @staticmethod
+    def _referenced_templates(modules: list[Path], templates: dict[str, Path]) -> set[str]:
+        pending: list[str] = []
+        for module in modules:
+            source = module.read_text(encoding="utf-8")
+            pending.extend(PY_TEMPLATE_REF.findall(source))
+            pending.extend(
+                f"{EMAIL_DIR}/{name}{suffix}" for name in set(PY_EMAIL_REF.findall(source)) for suffix in EMAIL_PARTS
+            )
+
+        seen: set[str] = set()
+        while pending:
+            name = pending.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            path = templates.get(name)
+            if path is not None:
+                pending.extend(TEMPLATE_TEMPLATE_REF.findall(path.read_text(encoding="utf-8")))
+        return seen
@@ -0,0 +1,95 @@
+import time
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from portal.dedup import DUPLICATE_THRESHOLD, MAX_BUCKET_SIZE, estimated_similarity, index_proposal, unpack
+from portal.models import Proposal, ProposalLSHBucket, ProposalSignature
+
+
+class Command(BaseCommand):
+    help = "Report clusters of near-duplicate proposals using the stored MinHash/LSH index."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threshold", type=float, default=DUPLICATE_THRESHOLD)
+        parser.add_argument(
+            "--backfill",
+            action="store_true",
+            help="First index proposals that have no signature yet (e.g. bulk-imported rows).",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+
+        if options["backfill"]:
+            missing = Proposal.objects.filter(signature__isnull=True).only("pk", "title", "summary", "aims")
+            done = 0
+            for proposal in missing.iterator(chunk_size=options["batch_size"]):
+                index_proposal(proposal)
+                done += 1
+                if done % options["batch_size"] == 0:
+                    self.stdout.write(f"  indexed {done} ...")
+            self.stdout.write(f"Backfilled {done} signature(s).")
+
+        # Only buckets shared by 2+ proposals can hold a duplicate pair
+        shared = (
+            ProposalLSHBucket.objects.values("band", "bucket")
+            .annotate(n=Count("proposal_id"))
+            .filter(n__gt=1, n__lte=MAX_BUCKET_SIZE)
+        )
+        shared_keys = {(row["band"], row["bucket"]) for row in shared}
+        members: dict[tuple[int, int], list[int]] = defaultdict(list)
+        for band, bucket, proposal_id in (
+            ProposalLSHBucket.objects.filter(bucket__in=shared.values("bucket"))
+            .values_list("band", "bucket", "proposal_id")
+            .iterator()
+        ):
+            if (band, bucket) in shared_keys:
+                members[(band, bucket)].append(proposal_id)
+
+        pairs = set()
+        for ids in members.values():
+            ids.sort()
+            pairs.update((a, b) for i, a in enumerate(ids) for b in ids[i + 1:])
+        involved = {pk for pair in pairs for pk in pair}
+        signatures = {
+            pk: unpack(blob)
+            for pk, blob in ProposalSignature.objects.filter(proposal_id__in=involved).values_list("proposal_id", "minhash")
+        }
+
+        parent = {pk: pk for pk in involved}
+
+        def find(pk):
+            while parent[pk] != pk:
+                parent[pk] = parent[parent[pk]]
+                pk = parent[pk]
+            return pk
+
+        confirmed = 0
+        for a, b in pairs:
+            if estimated_similarity(signatures[a], signatures[b]) >= options["threshold"]:
+                parent[find(a)] = find(b)
+                confirmed += 1
+
+        clusters: dict[int, list[int]] = defaultdict(list)
+        for pk in involved:
+            clusters[find(pk)].append(pk)
+        clusters = {root: pks for root, pks in clusters.items() if len(pks) > 1}
+
+        titles = dict(
+            Proposal.objects.filter(pk__in=[pk for pks in clusters.values() for pk in pks]).values_list("pk", "title")
+        )
+        for n, pks in enumerate(sorted(clusters.values(), key=len, reverse=True), start=1):
+            self.stdout.write(f"Cluster {n} ({len(pks)} proposals):")
+            for pk in sorted(pks):
+                self.stdout.write(f"  #{pk}  {titles.get(pk, '?')}")
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(clusters)} cluster(s), {confirmed} confirmed pair(s) "
+                f"from {len(pairs)} candidate pair(s) in {elapsed:.2f}s."
+            )
+        )
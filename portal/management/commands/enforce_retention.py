@@ -0,0 +1,137 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import CharField, Value
+from django.db.models.functions import Cast, Concat
+from django.utils import timezone
+
+from portal.models import Proposal, Signup, SignupAnswer
+
+# Replacement values for anonymized rows. The email stays unique per signup, so the
+# (proposal, lower(email)) constraint still holds.
+ANONYMIZED_NAME = "Removed"
+ANONYMIZED_EMAIL_DOMAIN = "@anonymized.invalid"
+
+
+class Command(BaseCommand):
+    help = (
+        "Enforce the data retention policy: delete answers of rejected signups after "
+        "PORTAL_RETAIN_REJECTED_ANSWERS_DAYS and anonymize proposals closed for "
+        "PORTAL_ANONYMIZE_CLOSED_AFTER_DAYS. Works in batches; an interrupted run resumes "
+        "where it stopped because finished rows no longer match."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rejected-answers-days",
+            type=int,
+            default=settings.PORTAL_RETAIN_REJECTED_ANSWERS_DAYS,
+            help="0 disables this rule.",
+        )
+        parser.add_argument(
+            "--anonymize-closed-days",
+            type=int,
+            default=settings.PORTAL_ANONYMIZE_CLOSED_AFTER_DAYS,
+            help="0 disables this rule.",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--time-limit",
+            type=float,
+            default=0.0,
+            help="Stop after this many seconds (the next run carries on). 0 = no limit.",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Only count what would change.")
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.deadline = time.monotonic() + options["time_limit"] if options["time_limit"] else None
+        now = timezone.now()
+
+        rules = []
+        if options["rejected_answers_days"]:
+            cutoff = now - timedelta(days=options["rejected_answers_days"])
+            rules.append(("rejected answers", self._rejected_answers(cutoff)))
+        if options["anonymize_closed_days"]:
+            cutoff = now - timedelta(days=options["anonymize_closed_days"])
+            rules.extend(self._closed_proposal_rules(cutoff, now))
+
+        if not rules:
+            self.stdout.write(self.style.WARNING("Every retention rule is disabled."))
+            return
+
+        finished = True
+        for label, (queryset, apply) in rules:
+            if options["dry_run"]:
+                self.stdout.write(f"{label}: {queryset.count()} row(s) would change")
+                continue
+            finished = self._run(label, queryset, apply) and finished
+
+        if options["dry_run"]:
+            return
+        if finished:
+            self.stdout.write(self.style.SUCCESS("Retention policy enforced."))
+        else:
+            self.stdout.write(self.style.WARNING("Time limit reached; run again to continue."))
+
+    # --- rules: (rows still to process, how to process one batch of pks) -----
+    @staticmethod
+    def _rejected_answers(cutoff):
+        rows = SignupAnswer.objects.filter(signup__status="REJECTED", signup__decided_at__lt=cutoff)
+        return rows, lambda pks: SignupAnswer.objects.filter(pk__in=pks).delete()[0]
+
+    @staticmethod
+    def _closed_proposal_rules(cutoff, now):
+        due = Proposal.all_objects.filter(
+            status="CLOSED", closed_at__lt=cutoff, anonymized_at__isnull=True, deleted_at__isnull=True
+        )
+        answers = SignupAnswer.objects.filter(signup__proposal__in=due)
+        signups = Signup.objects.filter(proposal__in=due).exclude(email__endswith=ANONYMIZED_EMAIL_DOMAIN)
+        anonymized_email = Concat(
+            Value("signup-"), Cast("pk", CharField()), Value(ANONYMIZED_EMAIL_DOMAIN), output_field=CharField()
+        )
+        return [
+            ("closed proposal answers", (answers, lambda pks: SignupAnswer.objects.filter(pk__in=pks).delete()[0])),
+            (
+                "closed proposal signups",
+                (
+                    signups,
+                    lambda pks: Signup.objects.filter(pk__in=pks).update(
+                        name=ANONYMIZED_NAME, email=anonymized_email, idempotency_key=None, updated_at=now
+                    ),
+                ),
+            ),
+            # Last, so a proposal is only marked done once its signups are
+            (
+                "closed proposals",
+                (
+                    due,
+                    lambda pks: Proposal.all_objects.filter(pk__in=pks).update(
+                        created_by_name=ANONYMIZED_NAME, created_by_email="", anonymized_at=now
+                    ),
+                ),
+            ),
+        ]
+
+    def _run(self, label: str, queryset, apply) -> bool:
+        """
+        Process `queryset` batch by batch, one transaction each. Returns False if stopped by --time-limit.
+        """
+        total = queryset.count()
+        done = 0
+        while True:
+            if self.deadline is not None and time.monotonic() > self.deadline:
+                self.stdout.write(f"{label}: stopped at {done}/{total}")
+                return False
+            batch = list(queryset.order_by("pk").values_list("pk", flat=True)[: self.options["batch_size"]])
+            if not batch:
+                break
+            with transaction.atomic():
+                apply(batch)
+            done += len(batch)
+            self.stdout.write(f"  {label}: {done}/{total}")
+        self.stdout.write(f"{label}: {done} row(s) done")
+        return True
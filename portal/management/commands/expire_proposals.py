@@ -0,0 +1,71 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from portal.facets import invalidate_facets
+from portal.models import Proposal
+
+
+class Command(BaseCommand):
+    help = (
+        "Close OPEN proposals whose deadline has passed, then archive proposals closed for more than "
+        "PORTAL_ARCHIVE_AFTER_DAYS. Works in small batches so no statement holds locks for long. "
+        "Run it from a daily (or hourly) cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--archive-after-days",
+            type=int,
+            default=settings.PORTAL_ARCHIVE_AFTER_DAYS,
+            help="Archive proposals closed at least this many days ago (default: PORTAL_ARCHIVE_AFTER_DAYS).",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.0,
+            help="Seconds to sleep between batches, to leave room for live traffic.",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Only report how many rows would change.")
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        expired = Proposal.objects.filter(status="OPEN", deadline__lt=timezone.localdate())
+        # Closed before closed_at existed, or closed by editing the status directly
+        undated = Proposal.objects.filter(status="CLOSED", closed_at__isnull=True)
+        stale = Proposal.objects.filter(
+            closed_at__lt=now - timedelta(days=options["archive_after_days"]), status="CLOSED"
+        )
+
+        if options["dry_run"]:
+            self.stdout.write(
+                f"Would close {expired.count()}, date {undated.count()} and archive {stale.count()} proposal(s)."
+            )
+            return
+
+        closed = self._in_batches(expired, {"status": "CLOSED", "closed_at": now}, "closed", options)
+        # Their archive clock starts now
+        self._in_batches(undated, {"closed_at": now}, "dated", options)
+        archived = self._in_batches(stale, {"is_archived": True}, "archived", options)
+        if closed or archived:
+            invalidate_facets()
+        self.stdout.write(self.style.SUCCESS(f"Closed {closed}, archived {archived} proposal(s)."))
+
+    def _in_batches(self, queryset, changes: dict, verb: str, options) -> int:
+        """
+        Apply `changes` to every row of `queryset`, one short autocommitted UPDATE per batch.
+        Updated rows stop matching the queryset, so each pass simply takes the next batch.
+        """
+        done = 0
+        while True:
+            batch = list(queryset.order_by("pk").values_list("pk", flat=True)[: options["batch_size"]])
+            if not batch:
+                return done
+            done += Proposal.all_objects.filter(pk__in=batch).update(**changes)
+            self.stdout.write(f"  {verb} {done} ...")
+            if options["pause"]:
+                time.sleep(options["pause"])
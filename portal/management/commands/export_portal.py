@@ -0,0 +1,47 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand
+
+from portal.backup import FORMAT, SECTIONS, VERSION, BackupEncoder, open_stream
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream tags, proposals, questions, signups and answers to newline-delimited JSON "
+        "(gzip for *.gz paths). Memory use stays flat however big the database is."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Output file, or - for stdout.")
+        parser.add_argument("--gzip", action="store_true", default=None, help="Compress even without a .gz suffix.")
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        encoder = BackupEncoder(ensure_ascii=False, separators=(",", ":"))
+        counts = {}
+
+        with open_stream(options["path"], "w", compress=options["gzip"]) as out:
+            out.write(json.dumps({"format": FORMAT, "version": VERSION}) + "\n")
+            for section in SECTIONS:
+                names = [f.attname for f in section.fields]
+                rows = (
+                    section.manager.filter(section.scope)
+                    .order_by("pk")
+                    .values_list("pk", *names)
+                    .iterator(chunk_size=options["chunk_size"])
+                )
+                n = 0
+                for pk, *values in rows:
+                    record = {"model": section.name, "pk": pk, "fields": dict(zip(names, values))}
+                    out.write(encoder.encode(record) + "\n")
+                    n += 1
+                    if n % 50_000 == 0:
+                        self.stderr.write(f"  {section.name}: {n} ...")
+                counts[section.name] = n
+
+        summary = ", ".join(f"{n} {name}" for name, n in counts.items())
+        elapsed = time.perf_counter() - started
+        # stdout may be the export itself
+        self.stderr.write(self.style.SUCCESS(f"Exported {summary} in {elapsed:.1f}s."))
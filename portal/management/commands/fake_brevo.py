@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from portal.fake_brevo import MESSAGES_PATH, FakeBrevoServer
+
+
+class Command(BaseCommand):
+    help = (
+        "Run a local Brevo-compatible email endpoint that records messages and can inject "
+        "latency, errors and 429s. Point the app at it with BREVO_API_URL."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8025)
+        parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every send.")
+        parser.add_argument("--jitter", type=float, default=0.0, help="Uniform +/- seconds around --latency.")
+        parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of sends answered with 500.")
+        parser.add_argument("--rate-limit", type=float, default=0.0, help="Sends/second before 429 (0 = off).")
+
+    def handle(self, *args, **options):
+        server = FakeBrevoServer(
+            options["host"],
+            options["port"],
+            latency=options["latency"],
+            jitter=options["jitter"],
+            error_rate=options["error_rate"],
+            rate_limit=options["rate_limit"],
+        )
+        host, port = server.server_address[:2]
+        self.stdout.write(self.style.SUCCESS(f"Fake Brevo listening on {server.url}"))
+        self.stdout.write(f"  export BREVO_API_URL={server.url}")
+        self.stdout.write(f"  recorded messages: http://{host}:{port}{MESSAGES_PATH}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            self.stdout.write(f"Stopped. {server.counts}")
@@ -0,0 +1,186 @@
+import contextlib
+import json
+import time
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import F
+
+from portal.backup import FORMAT, SECTIONS_BY_NAME, VERSION, Section, open_stream
+from portal.facets import invalidate_facets
+from portal.models import Proposal, Tag
+
+# Nothing points at these rows, so their old pks need no remapping
+UNREFERENCED = {"proposal_tag", "answer"}
+
+
+class Command(BaseCommand):
+    help = (
+        "Load a file written by export_portal. Rows are inserted with batched bulk_create, each batch "
+        "committed on its own, and every foreign key is remapped to the new primary keys. Rows are "
+        "never held beyond one batch; the old->new pk maps grow with the proposals, questions and "
+        "signups imported (ints only, roughly 100 bytes a row). Rows whose unique values already exist "
+        "(proposal slug or owner token, signup idempotency key) are skipped together with their children."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Input file, or - for stdin.")
+        parser.add_argument("--gzip", action="store_true", default=None, help="Decompress even without a .gz suffix.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--atomic",
+            action="store_true",
+            help="One transaction for the whole file: all or nothing, but every inserted row stays "
+            "uncommitted until the end.",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        self.batch_size = options["batch_size"]
+        self.atomic = options["atomic"]
+        # section name -> {old pk: new pk}
+        self.pk_maps: dict[str, dict[int, int]] = defaultdict(dict)
+        self.created: dict[str, int] = defaultdict(int)
+        self.skipped: dict[str, int] = defaultdict(int)
+
+        whole_file = transaction.atomic() if self.atomic else contextlib.nullcontext()
+        try:
+            with open_stream(options["path"], "r", compress=options["gzip"]) as stream, whole_file:
+                self._load(stream)
+        except Exception:
+            if not self.atomic and self.created:
+                # A re-run would skip the committed proposals, and with them the signups still missing
+                done = ", ".join(f"{n} {name}" for name, n in self.created.items())
+                self.stderr.write(
+                    f"Import failed after committing {done}. Remove those rows (or start from an empty "
+                    "database) before importing again, or use --atomic."
+                )
+            raise
+        invalidate_facets()
+
+        summary = ", ".join(f"{n} {name}" for name, n in self.created.items()) or "nothing"
+        skipped = ", ".join(f"{n} {name}" for name, n in self.skipped.items() if n)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"Imported {summary} in {elapsed:.1f}s."))
+        if skipped:
+            self.stdout.write(self.style.WARNING(f"Skipped (already present or parent skipped): {skipped}."))
+        self.stdout.write("Next: run `manage.py rebuild_similar` and `manage.py dedup_report --backfill`.")
+
+    @staticmethod
+    def _check_header(line: str) -> None:
+        try:
+            header = json.loads(line)
+        except ValueError:
+            header = {}
+        if header.get("format") != FORMAT:
+            raise CommandError("Not an export_portal file.")
+        if header.get("version") != VERSION:
+            raise CommandError(f"Unsupported export version {header.get('version')!r} (expected {VERSION}).")
+
+    def _load(self, stream) -> None:
+        self._check_header(stream.readline())
+        section: Section | None = None
+        pending: list[tuple[int, dict]] = []
+        for line in stream:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if section is None or record["model"] != section.name:
+                self._commit(section, pending)
+                pending = []
+                section = SECTIONS_BY_NAME.get(record["model"])
+                if section is None:
+                    raise CommandError(f"Unknown record type {record['model']!r}.")
+            pending.append((record["pk"], record["fields"]))
+            if len(pending) >= self.batch_size:
+                self._commit(section, pending)
+                pending = []
+        self._commit(section, pending)
+        with transaction.atomic():
+            self._rebuild_tag_masks()
+
+    def _commit(self, section: Section | None, pending: list[tuple[int, dict]]) -> None:
+        # One transaction per batch (a savepoint under --atomic), so the server never
+        # holds more than a batch of uncommitted rows
+        with transaction.atomic():
+            self._flush(section, pending)
+
+    def _flush(self, section: Section | None, pending: list[tuple[int, dict]]) -> None:
+        if section is None or not pending:
+            return
+        if section.name == "tag":
+            self._import_tags(pending)
+            return
+
+        fields = {f.attname: f for f in section.fields}
+        old_pks: list[int] = []
+        objs = []
+        for old_pk, values in pending:
+            try:
+                values = {
+                    name: self.pk_maps[section.fks[name]][value] if name in section.fks else fields[name].to_python(value)
+                    for name, value in values.items()
+                    if name in fields
+                }
+            except KeyError:
+                # Parent was skipped
+                self.skipped[section.name] += 1
+                continue
+            old_pks.append(old_pk)
+            objs.append(section.model(**values))
+
+        # Rows whose unique values are already taken (proposal slug or owner token, signup
+        # idempotency key) are skipped up front; inserting them would abort the batch
+        for f in section.fields:
+            if not f.unique or not objs:
+                continue
+            values = {getattr(obj, f.attname) for obj in objs} - {None}
+            taken = set(section.manager.filter(**{f"{f.attname}__in": values}).values_list(f.attname, flat=True))
+            if taken:
+                keep = [i for i, obj in enumerate(objs) if getattr(obj, f.attname) not in taken]
+                self.skipped[section.name] += len(objs) - len(keep)
+                old_pks = [old_pks[i] for i in keep]
+                objs = [objs[i] for i in keep]
+
+        if not objs:
+            return
+        # bulk_create stamps auto_now / auto_now_add fields with the current time; put the
+        # exported values back (bulk_update writes them as given)
+        stamped = [
+            f.attname for f in section.fields if getattr(f, "auto_now", False) or getattr(f, "auto_now_add", False)
+        ]
+        original = [[getattr(obj, name) for name in stamped] for obj in objs]
+
+        created = section.manager.bulk_create(objs, batch_size=self.batch_size)
+
+        if stamped:
+            for obj, values in zip(created, original):
+                for name, value in zip(stamped, values):
+                    setattr(obj, name, value)
+            section.manager.bulk_update(created, stamped, batch_size=self.batch_size)
+        if section.name not in UNREFERENCED:
+            self.pk_maps[section.name].update(zip(old_pks, (obj.pk for obj in created)))
+        self.created[section.name] += len(created)
+        if self.created[section.name] % 50_000 < len(created):
+            self.stdout.write(f"  {section.name}: {self.created[section.name]} ...")
+
+    def _import_tags(self, pending: list[tuple[int, dict]]) -> None:
+        # A handful of rows, matched to existing tags by slug or name; save() assigns the local bit
+        by_slug = {t.slug: t for t in Tag.objects.all()}
+        by_name = {t.name: t for t in by_slug.values()}
+        for old_pk, values in pending:
+            tag = by_slug.get(values["slug"]) or by_name.get(values["name"])
+            if tag is None:
+                tag = Tag(name=values["name"], slug=values["slug"])
+                tag.save()
+                self.created["tag"] += 1
+            else:
+                self.skipped["tag"] += 1
+            self.pk_maps["tag"][old_pk] = tag.pk
+
+    @staticmethod
+    def _rebuild_tag_masks() -> None:
+        # One UPDATE per bit-carrying tag; ORing a bit in is a no-op where it was already set
+        for tag in Tag.objects.filter(bit__isnull=False):
+            Proposal.all_objects.filter(tags=tag).update(tag_mask=F("tag_mask").bitor(tag.mask))
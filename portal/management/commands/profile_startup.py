@@ -0,0 +1,85 @@
+import re
+import sys
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+
+from portal.benchmarks import ImportRecord, parse_importtime, startup_probe
+
+
+def _package(name: str) -> str:
+    top = name.partition(".")[0]
+    return "(stdlib)" if top in sys.stdlib_module_names else top
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:.1f}ms"
+
+
+class Command(BaseCommand):
+    help = (
+        "Start a fresh interpreter with -X importtime, import config.wsgi and serve two requests, "
+        "then report where the time went: the slowest imports as a tree of cumulative costs, "
+        "what the first request still had to import, and self time per package. Reads the "
+        "existing database; nothing is written."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", default="/", help="Path of the first request.")
+        parser.add_argument("--min-ms", type=float, default=2.0, help="Hide imports cheaper than this (cumulative).")
+        parser.add_argument("--depth", type=int, default=4, help="Deepest import level shown.")
+        parser.add_argument("--packages", type=int, default=12, help="Packages listed by self time.")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        try:
+            phases, report = startup_probe(path, importtime=True)
+        except RuntimeError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(
+            f"process {_ms(phases['process'])}  django.setup() {_ms(phases['setup'])}  "
+            f"config.wsgi {_ms(phases['wsgi'])}  first GET {path} {_ms(phases['first_request'])} "
+            f"({phases['status']})  second {_ms(phases['second_request'])}"
+        )
+        # importtime only sees `import` statements: settings, models, admin modules and URLconfs
+        # loaded by Django through importlib show up as their importer's self time
+        self.stdout.write("(-X importtime slows imports down; bench_startup has comparable timings)")
+
+        # The probe marks each phase with a "-- phase <name>" line; before the first is interpreter start-up
+        titles = {
+            "setup": "django.setup(), paid by every management command too",
+            "wsgi": "Importing config.wsgi: handler and middleware",
+            "first_request": f"First GET {path}",
+            "second_request": f"Second GET {path}",
+        }
+        parts = re.split(r"^-- phase (\w+)\n", report, flags=re.M)
+        roots: list[ImportRecord] = []
+        for name, lines in zip(["start-up", *parts[1::2]], parts[::2]):
+            tree = parse_importtime(lines)
+            roots.extend(tree)
+            total = sum(r.cumulative_us for r in tree) / 1000
+            self.stdout.write(f"\n{titles.get(name, 'Interpreter start-up')}: {total:.1f}ms of imports")
+            if tree:
+                self.stdout.write(f"  {'cumulative':>10} {'self':>9}  module")
+                self._tree(tree, options["min_ms"] * 1000, options["depth"])
+
+        by_package: dict[str, int] = defaultdict(int)
+        stack = list(roots)
+        while stack:
+            record = stack.pop()
+            by_package[_package(record.name)] += record.self_us
+            stack.extend(record.children)
+        self.stdout.write("\nSelf time by package:")
+        for name, us in sorted(by_package.items(), key=lambda kv: -kv[1])[: options["packages"]]:
+            self.stdout.write(f"  {us / 1000:8.1f}ms  {name}")
+
+    def _tree(self, records: list[ImportRecord], min_us: float, max_depth: int, level: int = 0):
+        for record in sorted(records, key=lambda r: -r.cumulative_us):
+            if record.cumulative_us < min_us:
+                continue
+            self.stdout.write(
+                f"  {record.cumulative_us / 1000:8.1f}ms {record.self_us / 1000:7.1f}ms  {'  ' * level}{record.name}"
+            )
+            if level + 1 < max_depth:
+                self._tree(record.children, min_us, max_depth, level + 1)
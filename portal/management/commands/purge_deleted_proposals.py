@@ -0,0 +1,105 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from portal.models import (
+    Proposal,
+    ProposalLSHBucket,
+    ProposalNeighbor,
+    ProposalQuestion,
+    ProposalSignature,
+    Signup,
+    SignupAnswer,
+)
+
+# Children first, so no DELETE ever trips a foreign key. Each entry selects the rows
+# of one table that belong to the proposal being purged.
+PURGE_STEPS = [
+    ("answers", SignupAnswer, lambda pk: Q(signup__proposal_id=pk)),
+    ("signups", Signup, lambda pk: Q(proposal_id=pk)),
+    ("questions", ProposalQuestion, lambda pk: Q(proposal_id=pk)),
+    ("tag links", Proposal.tags.through, lambda pk: Q(proposal_id=pk)),
+    ("neighbors", ProposalNeighbor, lambda pk: Q(proposal_id=pk) | Q(neighbor_id=pk)),
+    ("lsh buckets", ProposalLSHBucket, lambda pk: Q(proposal_id=pk)),
+    ("signatures", ProposalSignature, lambda pk: Q(proposal_id=pk)),
+    ("proposals", Proposal, lambda pk: Q(pk=pk)),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Physically remove proposals the owner deleted, together with their signups, answers and "
+        "questions, in small raw DELETE batches (no ORM collector, no long locks)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--grace-minutes",
+            type=int,
+            default=0,
+            help="Only purge proposals deleted at least this long ago.",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.0,
+            help="Seconds to sleep between batches, to leave room for live traffic.",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Only list what would be removed.")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(minutes=options["grace_minutes"])
+        doomed = list(
+            Proposal.all_objects.filter(deleted_at__lte=cutoff).order_by("pk").values_list("pk", "title")
+        )
+        if not doomed:
+            self.stdout.write(self.style.SUCCESS("No deleted proposals to purge."))
+            return
+
+        totals = {label: 0 for label, _, _ in PURGE_STEPS}
+        for pk, title in doomed:
+            self.stdout.write(f"Proposal #{pk} {title!r}")
+            # Lists that pointed at this proposal need recomputing by `rebuild_similar`
+            if not options["dry_run"]:
+                Proposal.all_objects.filter(
+                    pk__in=ProposalNeighbor.objects.filter(neighbor_id=pk).values("proposal_id")
+                ).update(**Proposal.mark_stale())
+
+            for label, model, condition in PURGE_STEPS:
+                manager = getattr(model, "all_objects", model.objects)  # Proposal.objects hides deleted rows
+                rows = manager.filter(condition(pk))
+                if options["dry_run"]:
+                    n = rows.count()
+                else:
+                    n = self._delete_in_batches(model, rows, options["batch_size"], options["pause"])
+                totals[label] += n
+                if n:
+                    self.stdout.write(f"  {label}: {n}")
+
+        verb = "Would remove" if options["dry_run"] else "Removed"
+        summary = ", ".join(f"{n} {label}" for label, n in totals.items())
+        self.stdout.write(self.style.SUCCESS(f"{verb} {summary}."))
+
+    @staticmethod
+    def _delete_in_batches(model, rows, batch_size: int, pause: float) -> int:
+        """
+        DELETE ... WHERE pk IN (batch) until nothing matches; each batch is its own transaction.
+        """
+        table = connection.ops.quote_name(model._meta.db_table)
+        pk_column = connection.ops.quote_name(model._meta.pk.column)
+        done = 0
+        while True:
+            batch = list(rows.order_by().values_list("pk", flat=True)[:batch_size])
+            if not batch:
+                return done
+            placeholders = ", ".join(["%s"] * len(batch))
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(f"DELETE FROM {table} WHERE {pk_column} IN ({placeholders})", batch)
+                done += cursor.rowcount
+            if pause:
+                time.sleep(pause)
@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from portal.similarity import TOP_K, rebuild
+
+
+class Command(BaseCommand):
+    help = "Rebuild the precomputed 'similar proposals' neighbors (incremental by default)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="Recompute every proposal, not only stale ones.")
+        parser.add_argument("--top-k", type=int, default=TOP_K)
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        updated = rebuild(full=options["full"], k=options["top_k"], batch_size=options["batch_size"])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(f"Rewrote neighbors for {updated} proposal(s) in {elapsed:.2f}s.")
+        )
@@ -0,0 +1,107 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+from django.utils import timezone
+
+from portal.emailer import send_email
+from portal.emails import render_many
+from portal.models import Proposal, Signup
+
+# A digest is due once this much time has passed since the proposal's last one.
+# The slack lets an hourly cron that fires a little early still pick proposals up.
+DIGEST_INTERVALS = {
+    "HOURLY": timedelta(hours=1),
+    "DAILY": timedelta(days=1),
+}
+SCHEDULER_SLACK = timedelta(minutes=5)
+
+
+class Command(BaseCommand):
+    help = (
+        "Send one summary email per proposal owner covering signups not yet notified "
+        "(HOURLY/DAILY proposals). Run it from an hourly cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Print the digests instead of sending them.")
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Ignore the hourly/daily interval and flush every pending signup now.",
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+
+        # IMMEDIATE signups are marked notified once their email goes out; any left here
+        # failed to send (Brevo error, open circuit) or belong to proposals switched back
+        # from a digest setting, and are flushed right away.
+        pending = (
+            Signup.objects.filter(Signup.AWAITING_OWNER_NOTICE)
+            .select_related("proposal")
+            .order_by("proposal_id", "created_at")
+        )
+
+        # owner email -> proposal -> [signups]
+        by_owner: dict[str, dict[Proposal, list[Signup]]] = defaultdict(lambda: defaultdict(list))
+        for signup in pending.iterator(chunk_size=1000):
+            proposal = signup.proposal
+            if not options["force"] and not self._is_due(proposal, now):
+                continue
+            owner = (proposal.created_by_email or "").strip().lower()
+            if owner:
+                by_owner[owner][proposal].append(signup)
+
+        owners = list(by_owner)
+        emails = render_many("signup_digest", (self._digest_context(by_owner[owner]) for owner in owners))
+
+        sent = failed = 0
+        for owner, email in zip(owners, emails):
+            if options["dry_run"]:
+                self.stdout.write(f"--- To: {owner}\nSubject: {email.subject}\n\n{email.text_body}")
+                continue
+
+            try:
+                send_email(
+                    subject=email.subject, to_email=owner, text_body=email.text_body, html_body=email.html_body
+                )
+            except Exception as e:
+                # Leave the signups pending so the next run retries them
+                failed += 1
+                self.stderr.write(f"Digest to {owner} failed: {e}")
+                continue
+
+            sent += 1
+            proposals = by_owner[owner]
+            signup_ids = [s.pk for signups in proposals.values() for s in signups]
+            Signup.objects.filter(pk__in=signup_ids).update(owner_notified_at=now)
+            Proposal.all_objects.filter(pk__in=[p.pk for p in proposals]).update(last_digest_at=now)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Digests sent: {sent}, failed: {failed}, owners pending: {len(by_owner)}.")
+        )
+
+    @staticmethod
+    def _is_due(proposal: Proposal, now) -> bool:
+        interval = DIGEST_INTERVALS.get(proposal.notify_frequency)
+        if interval is None or proposal.last_digest_at is None:
+            return True
+        return now - proposal.last_digest_at >= interval - SCHEDULER_SLACK
+
+    @staticmethod
+    def _digest_context(proposals: dict[Proposal, list[Signup]]) -> dict:
+        return {
+            "total": sum(len(signups) for signups in proposals.values()),
+            "proposals": [
+                {
+                    "proposal": proposal,
+                    "signups": signups,
+                    "dashboard_url": settings.PORTAL_BASE_URL
+                    + reverse("proposal_owner_dashboard", kwargs={"slug": proposal.slug, "token": proposal.owner_token}),
+                }
+                for proposal, signups in proposals.items()
+            ],
+        }
@@ -0,0 +1,200 @@
+"""
+Prometheus metrics, served at /metrics.
+
+- portal_http_requests_total / portal_http_request_duration_seconds, labelled by
+  the URL name from portal/urls.py (MetricsMiddleware)
+- portal_db_queries_total / portal_db_query_seconds_total per URL name, summed
+  per request by an execute_wrapper installed on every connection when it opens
+- portal_email_send_duration_seconds / portal_email_sends_total by result
+  (recorded in portal.emailer.send_email)
+- portal_log_records_dropped_total: log records QueueingHandler dropped because
+  its queue was full (portal/logs.py)
+- portal_pending_owner_notifications: signups the owner has not been told
+  about yet (the send_digests backlog), counted at scrape time
+
+Under gunicorn every worker is its own process, so samples go to files in
+PROMETHEUS_MULTIPROC_DIR, a directory shared by all of them; gunicorn.conf.py
+sets it for multi-worker servers, empties it at start-up and marks exited
+workers dead. The scrape then merges every worker's samples. Without it, each
+process reports only its own numbers.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import hmac
+import os
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import HttpRequest, HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+# Requests that never resolved to a view (404s, static files served by WhiteNoise)
+UNRESOLVED = "<unresolved>"
+# Any other method is counted as "other": the label must not take arbitrary client input
+METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+REQUESTS = Counter("portal_http_requests_total", "HTTP requests handled.", ["view", "method", "status"])
+REQUEST_SECONDS = Histogram(
+    "portal_http_request_duration_seconds",
+    "Time from the first middleware to the response (streaming bodies excluded).",
+    ["view"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+DB_QUERIES = Counter("portal_db_queries_total", "Database queries run while handling requests.", ["view"])
+DB_SECONDS = Counter("portal_db_query_seconds_total", "Time spent in database queries.", ["view"])
+EMAIL_SECONDS = Histogram(
+    "portal_email_send_duration_seconds",
+    "Brevo API call latency, successful or not.",
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0),
+)
+EMAIL_SENDS = Counter("portal_email_sends_total", "Email send attempts by result.", ["result"])
+LOG_DROPS = Counter("portal_log_records_dropped_total", "Log records dropped because the logging queue was full.")
+
+
+class _QueryTimer:
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+
+# The current request's timer. A context variable rather than a wrapper installed on
+# the request thread's connections: under ASGI, sync views query from another thread,
+# which sync_to_async runs with a copy of this context.
+_request_timer: contextvars.ContextVar[_QueryTimer | None] = contextvars.ContextVar("request_timer", default=None)
+
+
+def _timed_execute(execute, sql, params, many, context):
+    timer = _request_timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timer.seconds += time.perf_counter() - started
+        timer.count += 1
+
+
+@receiver(connection_created)
+def _install_timer(sender, connection, **kwargs):
+    # Fires again when a connection object reconnects
+    if _timed_execute not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_timed_execute)
+
+
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if self.async_mode:
+            return self.__acall__(request)
+        timer = _QueryTimer()
+        token = _request_timer.set(timer)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_timer.reset(token)
+        self._record(request, response, time.perf_counter() - started, timer)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        timer = _QueryTimer()
+        token = _request_timer.set(timer)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_timer.reset(token)
+        self._record(request, response, time.perf_counter() - started, timer)
+        return response
+
+    @staticmethod
+    def _record(request: HttpRequest, response: HttpResponse, elapsed: float, timer: _QueryTimer) -> None:
+        match = request.resolver_match
+        view = (match.url_name or match.view_name) if match else UNRESOLVED
+        method = request.method if request.method in METHODS else "other"
+        REQUESTS.labels(view, method, str(response.status_code)).inc()
+        REQUEST_SECONDS.labels(view).observe(elapsed)
+        if timer.count:
+            DB_QUERIES.labels(view).inc(timer.count)
+            DB_SECONDS.labels(view).inc(timer.seconds)
+
+
+def record_email(result: str, seconds: float | None = None) -> None:
+    EMAIL_SENDS.labels(result).inc()
+    if seconds is not None:
+        EMAIL_SECONDS.observe(seconds)
+
+
+def record_log_drop() -> None:
+    LOG_DROPS.inc()
+
+
+class BacklogCollector:
+    """
+    Gauges read from the database once per scrape, so they are right however many workers there are.
+    """
+
+    def describe(self):
+        # Registering must not query the database
+        return []
+
+    def collect(self):
+        from .models import Signup
+
+        pending = Signup.objects.filter(Signup.AWAITING_OWNER_NOTICE).count()
+        yield GaugeMetricFamily(
+            "portal_pending_owner_notifications",
+            "Signups whose owner has not been notified yet.",
+            value=pending,
+        )
+
+
+BACKLOG = BacklogCollector()
+REGISTRY.register(BACKLOG)
+
+
+def _registry() -> CollectorRegistry:
+    if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        return REGISTRY
+    # Merge every worker's sample files; built per scrape, as prometheus_client recommends
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    registry.register(BACKLOG)
+    return registry
+
+
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    """
+    Prometheus text format. With PORTAL_METRICS_TOKEN set, scrapers must send it as a bearer token.
+    """
+    token = settings.PORTAL_METRICS_TOKEN
+    if token:
+        supplied = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+        if not hmac.compare_digest(supplied.encode(), token.encode()):
+            return HttpResponse("Unauthorized\n", status=401, content_type="text/plain")
+    return HttpResponse(generate_latest(_registry()), content_type=CONTENT_TYPE_LATEST)
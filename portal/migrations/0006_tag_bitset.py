@@ -0,0 +1,43 @@
+# Generated by Django 5.1.15 on 2026-10-19 01:40
+
+from django.db import migrations, models
+
+TAG_MASK_BITS = 63
+
+
+def backfill_tag_bits(apps, schema_editor):
+    Tag = apps.get_model("portal", "Tag")
+    Proposal = apps.get_model("portal", "Proposal")
+
+    for bit, tag in enumerate(Tag.objects.order_by("id")[:TAG_MASK_BITS]):
+        tag.bit = bit
+        tag.save(update_fields=["bit"])
+
+    bits = dict(Tag.objects.exclude(bit__isnull=True).values_list("id", "bit"))
+    masks: dict[int, int] = {}
+    for proposal_id, tag_id in Proposal.tags.through.objects.values_list("proposal_id", "tag_id").iterator():
+        if tag_id in bits:
+            masks[proposal_id] = masks.get(proposal_id, 0) | (1 << bits[tag_id])
+    for proposal_id, mask in masks.items():
+        Proposal.objects.filter(pk=proposal_id).update(tag_mask=mask)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portal', '0005_seed_tags'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='proposal',
+            name='tag_mask',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tag',
+            name='bit',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True, unique=True),
+        ),
+        migrations.RunPython(backfill_tag_bits, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.15 on 2026-10-19 01:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portal', '0007_proposal_neighbors'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProposalSignature',
+            fields=[
+                ('proposal', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='signature', serialize=False, to='portal.proposal')),
+                ('minhash', models.BinaryField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ProposalLSHBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band', models.PositiveSmallIntegerField()),
+                ('bucket', models.BigIntegerField()),
+                ('proposal', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='portal.proposal')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['band', 'bucket'], name='portal_lsh_band_bucket')],
+            },
+        ),
+    ]
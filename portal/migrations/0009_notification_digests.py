@@ -0,0 +1,36 @@
+# Generated by Django 5.1.15 on 2026-10-19 01:49
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def mark_existing_signups_notified(apps, schema_editor):
+    # Everything before this migration was already emailed one by one
+    Signup = apps.get_model("portal", "Signup")
+    Signup.objects.filter(owner_notified_at__isnull=True).update(owner_notified_at=F("created_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portal', '0008_proposal_dedup_signatures'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='proposal',
+            name='last_digest_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='proposal',
+            name='notify_frequency',
+            field=models.CharField(choices=[('IMMEDIATE', 'Email me for every signup'), ('HOURLY', 'Hourly digest'), ('DAILY', 'Daily digest')], default='IMMEDIATE', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='signup',
+            name='owner_notified_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.RunPython(mark_existing_signups_notified, migrations.RunPython.noop),
+    ]
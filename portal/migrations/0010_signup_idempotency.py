@@ -0,0 +1,48 @@
+# Generated by Django 5.1.15 on 2026-10-19 01:55
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+def drop_duplicate_signups(apps, schema_editor):
+    # Keep one signup per (proposal, lower(email)) so the constraint can be added:
+    # a decided one if any, else the earliest. Their answers cascade with them.
+    Signup = apps.get_model("portal", "Signup")
+    keep: dict[tuple[int, str], int] = {}
+    doomed: list[int] = []
+    rows = Signup.objects.order_by("proposal_id", "created_at", "pk").values_list("pk", "proposal_id", "email", "status")
+    decided: set[tuple[int, str]] = set()
+    for pk, proposal_id, email, status in rows.iterator():
+        key = (proposal_id, (email or "").lower())
+        if key not in keep:
+            keep[key] = pk
+            if status != "PENDING":
+                decided.add(key)
+        elif status != "PENDING" and key not in decided:
+            doomed.append(keep[key])
+            keep[key] = pk
+            decided.add(key)
+        else:
+            doomed.append(pk)
+    for start in range(0, len(doomed), 500):
+        Signup.objects.filter(pk__in=doomed[start:start + 500]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portal', '0009_notification_digests'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='signup',
+            name='idempotency_key',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True, unique=True),
+        ),
+        migrations.RunPython(drop_duplicate_signups, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='signup',
+            constraint=models.UniqueConstraint(models.F('proposal'), django.db.models.functions.text.Lower('email'), name='portal_signup_unique_email_per_proposal'),
+        ),
+    ]
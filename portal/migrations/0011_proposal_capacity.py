@@ -0,0 +1,45 @@
+# Generated by Django 5.1.15 on 2026-10-19 01:57
+
+import django.core.validators
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_taken_seats(apps, schema_editor):
+    Proposal = apps.get_model("portal", "Proposal")
+    Signup = apps.get_model("portal", "Signup")
+    seated = (
+        Signup.objects.filter(proposal=OuterRef("pk"), status__in=["PENDING", "APPROVED"])
+        .order_by()
+        .values("proposal")
+        .annotate(n=Count("pk"))
+        .values("n")
+    )
+    Proposal.objects.update(seats_taken=Coalesce(Subquery(seated, output_field=IntegerField()), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portal', '0010_signup_idempotency'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='proposal',
+            name='max_volunteers',
+            field=models.PositiveIntegerField(blank=True, help_text='Leave empty for no limit. Extra signups join a waitlist.', null=True, validators=[django.core.validators.MinValueValidator(1)]),
+        ),
+        migrations.AddField(
+            model_name='proposal',
+            name='seats_taken',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='signup',
+            name='status',
+            field=models.CharField(choices=[('PENDING', 'Pending'), ('APPROVED', 'Approved'), ('REJECTED', 'Rejected'), ('WAITLISTED', 'Waitlisted')], default='PENDING', max_length=10),
+        ),
+        migrations.RunPython(count_taken_seats, migrations.RunPython.noop),
+    ]
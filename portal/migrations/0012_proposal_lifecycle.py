@@ -0,0 +1,40 @@
+# Generated by Django 5.1.15 on 2026-10-19 01:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portal', '0011_proposal_capacity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='proposal',
+            name='closed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='proposal',
+            name='deadline',
+            field=models.DateField(blank=True, help_text='Optional. Signups close automatically after this day.', null=True),
+        ),
+        migrations.AddField(
+            model_name='proposal',
+            name='is_archived',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='proposal',
+            index=models.Index(condition=models.Q(('is_archived', False)), fields=['-created_at'], name='portal_proposal_live_created'),
+        ),
+        migrations.AddIndex(
+            model_name='proposal',
+            index=models.Index(fields=['status', 'deadline'], name='portal_proposal_status_dl'),
+        ),
+        migrations.AddIndex(
+            model_name='proposal',
+            index=models.Index(fields=['is_archived', 'closed_at'], name='portal_proposal_archive_scan'),
+        ),
+    ]
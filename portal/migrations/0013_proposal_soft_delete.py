@@ -0,0 +1,30 @@
+# Generated by Django 5.1.15 on 2026-10-19 01:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portal', '0012_proposal_lifecycle'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='proposal',
+            name='portal_proposal_live_created',
+        ),
+        migrations.AddField(
+            model_name='proposal',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='proposal',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True), ('is_archived', False)), fields=['-created_at'], name='portal_proposal_live_created'),
+        ),
+        migrations.AddIndex(
+            model_name='proposal',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', False)), fields=['deleted_at'], name='portal_proposal_deleted'),
+        ),
+    ]
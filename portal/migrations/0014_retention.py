@@ -0,0 +1,31 @@
+# Generated by Django 5.1.15 on 2026-10-19 02:00
+
+from django.db import migrations, models
+from django.db.models.functions import Now
+
+
+def start_retention_clock(apps, schema_editor):
+    # The real decision time was never stored; counting from today never purges early
+    Signup = apps.get_model("portal", "Signup")
+    Signup.objects.filter(status__in=["APPROVED", "REJECTED"]).update(decided_at=Now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portal', '0013_proposal_soft_delete'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='proposal',
+            name='anonymized_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='signup',
+            name='decided_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(start_retention_clock, migrations.RunPython.noop),
+    ]
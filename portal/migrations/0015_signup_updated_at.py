@@ -0,0 +1,33 @@
+# Generated by Django 5.1.15 on 2026-10-19 03:00
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_updated_at(apps, schema_editor):
+    # Best known value for existing rows: the later of creation and decision time
+    Signup = apps.get_model("portal", "Signup")
+    Signup.objects.filter(decided_at__isnull=True).update(updated_at=F("created_at"))
+    Signup.objects.filter(decided_at__isnull=False).update(updated_at=F("decided_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portal', '0014_retention'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='signup',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='signup',
+            index=models.Index(fields=['proposal', 'updated_at'], name='portal_signup_updated'),
+        ),
+    ]
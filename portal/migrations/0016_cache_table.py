@@ -0,0 +1,44 @@
+from django.db import migrations, models
+from django.db.migrations.state import StateApps
+
+# Must match settings.CACHES["default"]["LOCATION"]. The layout is frozen here (the one
+# `createcachetable` builds for the database backend) so the migration does not depend
+# on whatever the live settings say when it is replayed.
+CACHE_TABLE = 'portal_cache'
+
+
+def _cache_model():
+    class CacheEntry(models.Model):
+        cache_key = models.CharField(max_length=255, primary_key=True)
+        value = models.TextField()
+        expires = models.DateTimeField(db_index=True)
+
+        class Meta:
+            app_label = 'portal_cache_table'
+            db_table = CACHE_TABLE
+            apps = StateApps([], {})
+
+    return CacheEntry
+
+
+def create_cache_table(apps, schema_editor):
+    # The table is not a portal model, so no generated migration would create it
+    if CACHE_TABLE in schema_editor.connection.introspection.table_names():
+        return
+    schema_editor.create_model(_cache_model())
+
+
+def drop_cache_table(apps, schema_editor):
+    if CACHE_TABLE in schema_editor.connection.introspection.table_names():
+        schema_editor.delete_model(_cache_model())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portal', '0015_signup_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_cache_table, drop_cache_table),
+    ]
@@ -0,0 +1,87 @@
+import hashlib
+import random
+import re
+import struct
+import zlib
+
+from django.db import migrations
+
+BATCH_SIZE = 500
+
+# Frozen copy of the signature code in portal.dedup / portal.similarity.tokenize as of
+# this migration: replaying it must not depend on whatever those modules say later.
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_rng = random.Random(0x5EED)
+_PERMS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+_PACK = struct.Struct(f'<{NUM_PERM}Q')
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+STOPWORDS = frozenset(
+    """
+    about after also and are been being but can could does for from had has have how into its more
+    most not our over such than that the their them then there these they this those through use
+    used using was were what when where which while who will with within would you your
+    """.split()
+)
+
+
+def _minhash(text):
+    tokens = [t for t in TOKEN_RE.findall(text.lower()) if len(t) > 2 and t not in STOPWORDS]
+    if len(tokens) < 2:
+        values = {zlib.crc32(t.encode('utf-8')) for t in tokens}
+    else:
+        values = {zlib.crc32(f'{a} {b}'.encode('utf-8')) for a, b in zip(tokens, tokens[1:])}
+    if not values:
+        return [_MAX_HASH] * NUM_PERM
+    return [min((a * v + b) % _PRIME for v in values) for a, b in _PERMS]
+
+
+def _band_buckets(signature):
+    buckets = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS:(band + 1) * ROWS]
+        digest = hashlib.blake2b(struct.pack(f'<{ROWS}Q', *rows), digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, 'little') >> 1)
+    return buckets
+
+
+def index_existing(apps, schema_editor):
+    # Proposals created before 0008 have no signature, so find_duplicates could never match them
+    Proposal = apps.get_model('portal', 'Proposal')
+    ProposalSignature = apps.get_model('portal', 'ProposalSignature')
+    ProposalLSHBucket = apps.get_model('portal', 'ProposalLSHBucket')
+
+    missing = (
+        Proposal._base_manager.filter(signature__isnull=True)
+        .values_list('pk', 'title', 'summary', 'aims')
+        .order_by('pk')
+    )
+    signatures, buckets = [], []
+    for pk, title, summary, aims in missing.iterator(chunk_size=BATCH_SIZE):
+        signature = _minhash(f'{title} {summary} {aims}')
+        signatures.append(ProposalSignature(proposal_id=pk, minhash=_PACK.pack(*signature)))
+        buckets += [
+            ProposalLSHBucket(proposal_id=pk, band=band, bucket=bucket)
+            for band, bucket in enumerate(_band_buckets(signature))
+        ]
+        if len(signatures) >= BATCH_SIZE:
+            ProposalSignature.objects.bulk_create(signatures)
+            ProposalLSHBucket.objects.bulk_create(buckets)
+            signatures, buckets = [], []
+    ProposalSignature.objects.bulk_create(signatures)
+    ProposalLSHBucket.objects.bulk_create(buckets)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portal', '0016_cache_table'),
+    ]
+
+    operations = [
+        migrations.RunPython(index_existing, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.1.15 on 2026-10-19 02:40
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+# Admin "^" searches run UPPER(column) LIKE 'X%'. A plain btree only serves LIKE under the
+# C collation, so on PostgreSQL these carry text_pattern_ops; Django cannot declare an
+# operator class on an expression index portably, hence raw SQL (other backends scan).
+PREFIX_INDEXES = [
+    ("portal_proposal_title_prefix", "portal_proposal", "title"),
+    ("portal_signup_name_prefix", "portal_signup", "name"),
+]
+
+
+def create_prefix_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, table, column in PREFIX_INDEXES:
+        schema_editor.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {table} ((UPPER("{column}"::text)) text_pattern_ops)')
+
+
+def drop_prefix_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, _, _ in PREFIX_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portal', '0017_backfill_dedup_signatures'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='proposal',
+            index=models.Index(django.db.models.functions.text.Upper('slug'), name='portal_proposal_slug_upper'),
+        ),
+        migrations.AddIndex(
+            model_name='proposal',
+            index=models.Index(django.db.models.functions.text.Upper('created_by_email'), name='portal_proposal_owner_upper'),
+        ),
+        migrations.AddIndex(
+            model_name='signup',
+            index=models.Index(django.db.models.functions.text.Upper('email'), name='portal_signup_email_upper'),
+        ),
+        migrations.RunPython(create_prefix_indexes, drop_prefix_indexes),
+    ]
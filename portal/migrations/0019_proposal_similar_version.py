@@ -0,0 +1,18 @@
+# Generated by Django 5.1.15 on 2026-10-19 02:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portal', '0018_admin_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='proposal',
+            name='similar_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
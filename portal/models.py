@@ -1,24 +1,110 @@
-from django.db import models
+from django.core.validators import MinValueValidator
+from django.db import models, transaction
+from django.db.models import F, Q
+from django.db.models.functions import Lower, Upper
+from django.db.models.lookups import Exact, GreaterThan
+from django.utils import timezone
 from django.utils.text import slugify
 import secrets
 
+# Proposal.tag_mask is a signed 64-bit integer; bit 63 is the sign bit, so
+# only bits 0..62 are handed out. Tags created after that keep bit=None and
+# are filtered through the M2M table instead.
+TAG_MASK_BITS = 63
+
 
 class Tag(models.Model):
     name = models.CharField(max_length=64, unique=True)
     slug = models.SlugField(max_length=80, unique=True, blank=True)
 
+    # Position of this tag in Proposal.tag_mask (None once all bits are taken)
+    bit = models.PositiveSmallIntegerField(null=True, blank=True, unique=True, editable=False)
+
     class Meta:
         ordering = ["name"]
 
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.name)
+        if self.bit is None:
+            used = set(Tag.objects.exclude(bit__isnull=True).values_list("bit", flat=True))
+            self.bit = next((b for b in range(TAG_MASK_BITS) if b not in used), None)
         super().save(*args, **kwargs)
 
+    @property
+    def mask(self) -> int:
+        return 0 if self.bit is None else 1 << self.bit
+
     def __str__(self):
         return self.name
 
 
+class ProposalQuerySet(models.QuerySet):
+    def filter_tags(self, slugs, *, match: str = "any"):
+        """
+        Filter by tag slugs using Proposal.tag_mask (no JOIN, no DISTINCT).
+
+        match="any": proposals with at least one of the tags.
+        match="all": proposals with every one of the tags.
+        Tags without a bit fall back to a subquery on the M2M table.
+        """
+        cond = tag_condition(slugs, match=match)
+        return self.none() if cond is None else self.filter(cond)
+
+
+class LiveProposalManager(models.Manager.from_queryset(ProposalQuerySet)):
+    """
+    Default manager: hides archived and soft-deleted proposals from every feed, count
+    and aggregate. Use Proposal.all_objects to reach them (owner pages, maintenance,
+    bookkeeping UPDATEs).
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(is_archived=False, deleted_at__isnull=True)
+
+
+def tag_condition(slugs, *, match: str = "any", catalog=None) -> Q | None:
+    """
+    Build the Q behind ProposalQuerySet.filter_tags(); None means "matches nothing".
+    Usable anywhere a Q is accepted, e.g. Count(..., filter=...).
+
+    catalog: optional preloaded (pk, slug, bit) rows for every Tag, to skip the lookup query.
+    """
+    slugs = set(slugs)
+    if catalog is None:
+        tags = list(Tag.objects.filter(slug__in=slugs).values_list("pk", "bit"))
+    else:
+        tags = [(pk, bit) for pk, slug, bit in catalog if slug in slugs]
+    if not tags or (match == "all" and len(tags) < len(slugs)):
+        return None
+
+    mask = 0
+    overflow: list[int] = []
+    for pk, bit in tags:
+        if bit is None:
+            overflow.append(pk)
+        else:
+            mask |= 1 << bit
+
+    if match == "all":
+        cond = Q(Exact(F("tag_mask").bitand(mask), mask)) if mask else Q()
+        for tag_pk in overflow:
+            cond &= Q(pk__in=tag_members(tag_pk))
+        return cond
+
+    cond = Q(GreaterThan(F("tag_mask").bitand(mask), 0)) if mask else Q()
+    if overflow:
+        cond |= Q(pk__in=tag_members(*overflow))
+    return cond
+
+
+def tag_members(*tag_pks: int):
+    """
+    Subquery of proposal ids carrying any of the given tags (M2M fallback path).
+    """
+    return Proposal.tags.through.objects.filter(tag_id__in=tag_pks).values("proposal_id")
+
+
 class Proposal(models.Model):
     STATUS_CHOICES = [
         ("OPEN", "Open"),
@@ -39,12 +125,88 @@ class Proposal(models.Model):
 
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="OPEN")
 
+    # `manage.py expire_proposals` closes OPEN proposals once the deadline has passed,
+    # and archives proposals closed for longer than PORTAL_ARCHIVE_AFTER_DAYS.
+    deadline = models.DateField(null=True, blank=True, help_text="Optional. Signups close automatically after this day.")
+    closed_at = models.DateTimeField(null=True, blank=True, editable=False)
+    is_archived = models.BooleanField(default=False, editable=False)
+
+    # Set by the owner's delete; rows are removed later by `manage.py purge_deleted_proposals`
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    # Set once `manage.py enforce_retention` has stripped personal data from a long-closed proposal
+    anonymized_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    # Optional capacity. seats_taken counts PENDING/APPROVED signups and is only ever
+    # changed by conditional UPDATEs (take_seat/release_seat), never read-modify-write.
+    max_volunteers = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(1)],
+        help_text="Leave empty for no limit. Extra signups join a waitlist."
+    )
+    seats_taken = models.PositiveIntegerField(default=0, editable=False)
+
+    # How the owner hears about new signups (see `manage.py send_digests`)
+    NOTIFY_CHOICES = [
+        ("IMMEDIATE", "Email me for every signup"),
+        ("HOURLY", "Hourly digest"),
+        ("DAILY", "Daily digest"),
+    ]
+    notify_frequency = models.CharField(max_length=10, choices=NOTIFY_CHOICES, default="IMMEDIATE")
+    last_digest_at = models.DateTimeField(null=True, blank=True, editable=False)
+
     owner_token = models.CharField(max_length=64, unique=True, blank=True, editable=False)
 
     # Pre-defined specialties/tags (many-to-many)
     tags = models.ManyToManyField(Tag, blank=True, related_name="proposals")
 
+    # OR of Tag.mask for every tag in `tags`; kept in sync by portal.signals
+    tag_mask = models.BigIntegerField(default=0, editable=False)
+
+    # Set when title/summary/aims/tags change; cleared by `manage.py rebuild_similar`
+    similar_stale = models.BooleanField(default=True, db_index=True, editable=False)
+    # Bumped with every similar_stale=True, so a rebuild only clears the flag on
+    # rows that did not change again while it was running
+    similar_version = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = LiveProposalManager()
+    all_objects = ProposalQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Home feed ordering, restricted to the live (unarchived) rows
+            models.Index(
+                fields=["-created_at"],
+                condition=Q(is_archived=False, deleted_at__isnull=True),
+                name="portal_proposal_live_created",
+            ),
+            # Expiry/archival scans in `manage.py expire_proposals`
+            models.Index(fields=["status", "deadline"], name="portal_proposal_status_dl"),
+            models.Index(fields=["is_archived", "closed_at"], name="portal_proposal_archive_scan"),
+            models.Index(fields=["deleted_at"], condition=Q(deleted_at__isnull=False), name="portal_proposal_deleted"),
+            # Admin "=" searches compare UPPER(column) (see ProposalAdmin.search_fields)
+            models.Index(Upper("slug"), name="portal_proposal_slug_upper"),
+            models.Index(Upper("created_by_email"), name="portal_proposal_owner_upper"),
+        ]
+
+    SIMILARITY_FIELDS = frozenset({"title", "summary", "aims"})
+
+    @staticmethod
+    def mark_stale() -> dict:
+        """update() kwargs that flag rows for `rebuild_similar`."""
+        return {"similar_stale": True, "similar_version": F("similar_version") + 1}
+
     def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        stale = update_fields is None or bool(self.SIMILARITY_FIELDS.intersection(update_fields))
+        if stale:
+            self.similar_stale = True
+            if not self._state.adding:
+                self.similar_version = F("similar_version") + 1
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "similar_stale", "similar_version"}
+
         if not self.owner_token:
             self.owner_token = secrets.token_hex(32)
 
@@ -52,21 +214,125 @@ class Proposal(models.Model):
             base = slugify(self.title)[:200] or "proposal"
             candidate = base
             i = 2
-            while Proposal.objects.filter(slug=candidate).exclude(pk=self.pk).exists():
+            while Proposal.all_objects.filter(slug=candidate).exclude(pk=self.pk).exists():
                 candidate = f"{base}-{i}"
                 i += 1
             self.slug = candidate
 
         super().save(*args, **kwargs)
+        if hasattr(self.similar_version, "resolve_expression"):
+            # Leave the counter deferred: it is loaded again on access
+            del self.__dict__["similar_version"]
+
+    def refresh_tag_mask(self) -> int:
+        """
+        Recompute tag_mask from the M2M table and store it with a single UPDATE.
+        Tags feed the similarity score, so the proposal is flagged stale as well.
+        """
+        mask = 0
+        for bit in Tag.objects.filter(proposals=self.pk, bit__isnull=False).values_list("bit", flat=True):
+            mask |= 1 << bit
+        Proposal.all_objects.filter(pk=self.pk).update(tag_mask=mask, **Proposal.mark_stale())
+        self.tag_mask = mask
+        self.similar_stale = True
+        self.__dict__.pop("similar_version", None)
+        return mask
 
     @property
     def num_signups(self):
         return self.signups.count()
 
+    @property
+    def accepting_signups(self) -> bool:
+        # expire_proposals only closes past-deadline proposals when it next runs
+        return self.status == "OPEN" and not (self.deadline and self.deadline < timezone.localdate())
+
+    @property
+    def seats_left(self) -> int | None:
+        if self.max_volunteers is None:
+            return None
+        return max(0, self.max_volunteers - self.seats_taken)
+
+    def take_seat(self) -> bool:
+        """
+        Claim a seat with one conditional UPDATE; False when the proposal is full.
+        Concurrent signups serialize on the row lock, so the limit is never overshot.
+        """
+        has_room = Q(max_volunteers__isnull=True) | Q(seats_taken__lt=F("max_volunteers"))
+        return bool(
+            Proposal.all_objects.filter(has_room, pk=self.pk).update(seats_taken=F("seats_taken") + 1)
+        )
+
+    def release_seat(self) -> None:
+        Proposal.all_objects.filter(pk=self.pk, seats_taken__gt=0).update(seats_taken=F("seats_taken") - 1)
+
+    def promote_waitlist(self) -> "Signup | None":
+        """
+        Move the earliest waitlisted signup into a free seat, if there is one.
+        """
+        with transaction.atomic():
+            candidate = (
+                self.signups.filter(status="WAITLISTED").order_by("created_at", "pk").only("pk").first()
+            )
+            if candidate is None or not self.take_seat():
+                return None
+            # Guard against a concurrent promotion picking the same signup
+            if not Signup.objects.filter(pk=candidate.pk, status="WAITLISTED").update(
+                status="PENDING", updated_at=timezone.now()
+            ):
+                self.release_seat()
+                return None
+        candidate.status = "PENDING"
+        return candidate
+
     def __str__(self):
         return self.title
 
 
+class ProposalNeighbor(models.Model):
+    """
+    Precomputed "similar proposals" list (top-k per proposal, ordered by rank).
+    Written only by `manage.py rebuild_similar`.
+    """
+
+    proposal = models.ForeignKey(Proposal, on_delete=models.CASCADE, related_name="neighbors")
+    neighbor = models.ForeignKey(Proposal, on_delete=models.CASCADE, related_name="+")
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        ordering = ["rank"]
+        constraints = [
+            models.UniqueConstraint(fields=["proposal", "rank"], name="portal_neighbor_unique_rank"),
+        ]
+
+    def __str__(self):
+        return f"{self.proposal_id} -> {self.neighbor_id} ({self.score:.3f})"
+
+
+class ProposalSignature(models.Model):
+    """
+    MinHash signature of a proposal's text (see portal.dedup), packed as 64-bit ints.
+    """
+
+    proposal = models.OneToOneField(Proposal, on_delete=models.CASCADE, primary_key=True, related_name="signature")
+    minhash = models.BinaryField()
+
+
+class ProposalLSHBucket(models.Model):
+    """
+    One LSH band of a ProposalSignature. Proposals sharing any (band, bucket)
+    pair are near-duplicate candidates.
+    """
+
+    proposal = models.ForeignKey(Proposal, on_delete=models.CASCADE, related_name="+")
+    band = models.PositiveSmallIntegerField()
+    bucket = models.BigIntegerField()
+
+    class Meta:
+        indexes = [models.Index(fields=["band", "bucket"], name="portal_lsh_band_bucket")]
+
+
 class ProposalQuestion(models.Model):
     proposal = models.ForeignKey(Proposal, on_delete=models.CASCADE, related_name="questions")
     prompt = models.CharField(max_length=240)
@@ -85,7 +351,14 @@ class Signup(models.Model):
         ("PENDING", "Pending"),
         ("APPROVED", "Approved"),
         ("REJECTED", "Rejected"),
+        ("WAITLISTED", "Waitlisted"),
     ]
+    # Statuses that occupy one of the proposal's seats
+    SEATED_STATUSES = frozenset({"PENDING", "APPROVED"})
+    # Statuses set by the owner; decided_at starts the retention clock (`manage.py enforce_retention`)
+    DECIDED_STATUSES = frozenset({"APPROVED", "REJECTED"})
+    # Signups the owner still has to hear about (`manage.py send_digests`, the backlog metric)
+    AWAITING_OWNER_NOTICE = Q(owner_notified_at__isnull=True, proposal__deleted_at__isnull=True)
 
     proposal = models.ForeignKey(Proposal, on_delete=models.CASCADE, related_name="signups")
     name = models.CharField(max_length=120)
@@ -93,6 +366,55 @@ class Signup(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="PENDING")
+    decided_at = models.DateTimeField(null=True, blank=True, editable=False)
+    # Set on create and on every status change (bulk .update() calls pass it explicitly);
+    # the owner dashboard's live stream sends whatever moved past its cursor
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Null until the owner has been told about this signup (immediately or in a digest)
+    owner_notified_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    # Random token rendered into the signup form; a resubmitted form carries the same one
+    idempotency_key = models.CharField(max_length=64, null=True, blank=True, unique=True, editable=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint("proposal", Lower("email"), name="portal_signup_unique_email_per_proposal"),
+        ]
+        indexes = [
+            models.Index(fields=["proposal", "updated_at"], name="portal_signup_updated"),
+            models.Index(Upper("email"), name="portal_signup_email_upper"),
+        ]
+
+    def set_status(self, status: str) -> "Signup | None":
+        """
+        Change status and keep the proposal's seat count in step. Rejecting a
+        seated signup frees its seat for the next waitlisted one; the owner
+        approving a waitlisted signup seats it even past the limit.
+
+        Returns the waitlisted signup promoted into the freed seat, if any.
+        """
+        promoted = None
+        with transaction.atomic():
+            previous = Signup.objects.select_for_update().values_list("status", flat=True).get(pk=self.pk)
+            if previous == status:
+                self.status = status
+                return None
+            decided_at = timezone.now() if status in self.DECIDED_STATUSES else None
+            Signup.objects.filter(pk=self.pk).update(
+                status=status, decided_at=decided_at, updated_at=timezone.now()
+            )
+            self.decided_at = decided_at
+
+            was_seated = previous in self.SEATED_STATUSES
+            now_seated = status in self.SEATED_STATUSES
+            if now_seated and not was_seated:
+                Proposal.all_objects.filter(pk=self.proposal_id).update(seats_taken=F("seats_taken") + 1)
+            elif was_seated and not now_seated:
+                self.proposal.release_seat()
+                promoted = self.proposal.promote_waitlist()
+        self.status = status
+        return promoted
 
     def __str__(self):
         return f"{self.proposal.title} - {self.name} ({self.status})"
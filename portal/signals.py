@@ -0,0 +1,59 @@
+from django.db.models import F, Q
+from django.db.models.lookups import GreaterThan
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .dedup import index_proposal
+from .facets import invalidate_facets
+from .models import Proposal, Tag
+
+
+def _has_bit(mask: int) -> Q:
+    return Q(GreaterThan(F("tag_mask").bitand(mask), 0))
+
+
+@receiver(m2m_changed, sender=Proposal.tags.through)
+def sync_tag_mask(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Keep Proposal.tag_mask in step with Proposal.tags, from either side of the M2M.
+    """
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    invalidate_facets()
+
+    if not reverse:
+        instance.refresh_tag_mask()
+        return
+
+    # tag.proposals.add(...) / .remove(...): only the listed proposals changed.
+    # A reverse clear() gives no pk_set, so fall back to every proposal that had the bit.
+    if pk_set:
+        proposals = Proposal.all_objects.filter(pk__in=pk_set)
+    elif instance.bit is not None:
+        proposals = Proposal.all_objects.filter(_has_bit(instance.mask))
+    else:
+        return
+    for proposal in proposals.only("pk"):
+        proposal.refresh_tag_mask()
+
+
+@receiver(post_delete, sender=Tag)
+def clear_deleted_tag_bit(sender, instance, **kwargs):
+    if instance.bit is None:
+        return
+    Proposal.all_objects.filter(_has_bit(instance.mask)).update(tag_mask=F("tag_mask") - instance.mask)
+
+
+@receiver(post_save, sender=Proposal)
+@receiver(post_delete, sender=Proposal)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def proposal_catalog_changed(sender, **kwargs):
+    invalidate_facets()
+
+
+@receiver(post_save, sender=Proposal)
+def refresh_dedup_signature(sender, instance, update_fields, **kwargs):
+    if update_fields is None or Proposal.SIMILARITY_FIELDS.intersection(update_fields):
+        index_proposal(instance)
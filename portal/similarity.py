@@ -0,0 +1,151 @@
+"""
+Offline "similar proposals" index.
+
+TF-IDF over title/summary/aims, stored as sparse {term: weight} vectors with an
+inverted index (term -> postings). Scoring a proposal against the corpus is a
+sparse matrix-vector product: walk the proposal's terms and accumulate
+weight * weight over each term's postings. Tag overlap (Jaccard) is blended in
+for the text candidates. Only the top-k neighbors per proposal are stored.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Iterable
+
+from django.db import transaction
+from django.db.models import Q
+
+from .models import Proposal, ProposalNeighbor
+
+TOP_K = 5
+TAG_WEIGHT = 0.3
+MIN_SCORE = 0.05
+# Terms in more than this share of proposals carry no signal and make postings huge
+MAX_DOC_FREQ = 0.5
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    """
+    about after also and are been being but can could does for from had has have how into its more
+    most not our over such than that the their them then there these they this those through use
+    used using was were what when where which while who will with within would you your
+    """.split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    return [t for t in TOKEN_RE.findall(text.lower()) if len(t) > 2 and t not in STOPWORDS]
+
+
+class SimilarityIndex:
+    def __init__(self, docs: dict[int, str], tags: dict[int, frozenset[int]]):
+        self.tags = tags
+        term_counts = {pk: Counter(tokenize(text)) for pk, text in docs.items()}
+
+        df: Counter[str] = Counter()
+        for counts in term_counts.values():
+            df.update(counts.keys())
+
+        n_docs = len(docs)
+        max_df = max(2, int(n_docs * MAX_DOC_FREQ))
+        idf = {term: math.log((n_docs + 1) / (n + 1)) + 1.0 for term, n in df.items() if n <= max_df}
+
+        self.vectors: dict[int, dict[str, float]] = {}
+        self.postings: dict[str, list[tuple[int, float]]] = defaultdict(list)
+        for pk, counts in term_counts.items():
+            vec = {t: (1.0 + math.log(c)) * idf[t] for t, c in counts.items() if t in idf}
+            norm = math.sqrt(sum(w * w for w in vec.values())) or 1.0
+            vec = {t: w / norm for t, w in vec.items()}
+            self.vectors[pk] = vec
+            for t, w in vec.items():
+                self.postings[t].append((pk, w))
+
+    def neighbors(self, pk: int, k: int = TOP_K) -> list[tuple[int, float]]:
+        scores: dict[int, float] = defaultdict(float)
+        for term, weight in self.vectors.get(pk, {}).items():
+            for other, other_weight in self.postings[term]:
+                if other != pk:
+                    scores[other] += weight * other_weight
+
+        own_tags = self.tags.get(pk, frozenset())
+        blended = []
+        for other, cosine in scores.items():
+            other_tags = self.tags.get(other, frozenset())
+            union = len(own_tags | other_tags)
+            jaccard = len(own_tags & other_tags) / union if union else 0.0
+            score = (1.0 - TAG_WEIGHT) * cosine + TAG_WEIGHT * jaccard
+            if score >= MIN_SCORE:
+                blended.append((score, other))
+
+        return [(other, score) for score, other in heapq.nlargest(k, blended)]
+
+
+def load_index() -> SimilarityIndex:
+    docs = {
+        pk: f"{title} {title} {summary} {aims}"  # title counted twice: it's the densest signal
+        for pk, title, summary, aims in Proposal.objects.values_list("pk", "title", "summary", "aims").iterator()
+    }
+    tags: dict[int, set[int]] = defaultdict(set)
+    for proposal_id, tag_id in Proposal.tags.through.objects.values_list("proposal_id", "tag_id").iterator():
+        tags[proposal_id].add(tag_id)
+    return SimilarityIndex(docs, {pk: frozenset(t) for pk, t in tags.items()})
+
+
+def rebuild(*, full: bool = False, k: int = TOP_K, batch_size: int = 500) -> int:
+    """
+    Recompute stored neighbors for stale proposals (or all of them with full=True).
+    Returns the number of proposals whose neighbor list was rewritten.
+
+    The IDF is always recomputed over the whole corpus; what is incremental is
+    the O(n) scoring + write step, which only runs for changed proposals and for
+    the proposals that currently list a changed one as a neighbor.
+    """
+    # pk -> similar_version as read now; the flag is only cleared where it is unchanged at the end
+    read = dict(
+        (Proposal.objects if full else Proposal.objects.filter(similar_stale=True)).values_list("pk", "similar_version")
+    )
+    stale = set(read)
+    if not stale:
+        return 0
+
+    index = load_index()
+    # Past half the corpus, chasing affected lists costs more than redoing everything
+    full = full or len(stale) * 2 >= len(index.vectors)
+
+    targets = set(index.vectors) if full else set(stale)
+    if not full:
+        for chunk in _chunks(list(stale), batch_size):
+            targets.update(
+                ProposalNeighbor.objects.filter(neighbor_id__in=chunk).values_list("proposal_id", flat=True)
+            )
+
+    results = {pk: index.neighbors(pk, k) for pk in targets if pk in index.vectors}
+    if not full:
+        # A changed proposal may now belong in the lists of its new neighbors too
+        extra = {other for pk in stale for other, _ in results.get(pk, [])} - targets
+        results.update({pk: index.neighbors(pk, k) for pk in extra})
+
+    for chunk in _chunks(list(results), batch_size):
+        with transaction.atomic():
+            ProposalNeighbor.objects.filter(proposal_id__in=chunk).delete()
+            ProposalNeighbor.objects.bulk_create(
+                ProposalNeighbor(proposal_id=pk, neighbor_id=other, rank=rank, score=score)
+                for pk in chunk
+                for rank, (other, score) in enumerate(results[pk])
+            )
+    # A proposal edited while this ran has a newer similar_version and stays stale for the next run
+    for chunk in _chunks(list(stale), batch_size):
+        unchanged = Q()
+        for pk in chunk:
+            unchanged |= Q(pk=pk, similar_version=read[pk])
+        Proposal.objects.filter(unchanged).update(similar_stale=False)
+    return len(results)
+
+
+def _chunks(items: list, size: int) -> Iterable[list]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
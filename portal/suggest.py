@@ -0,0 +1,209 @@
+"""
+Search-as-you-type suggestions for the home search box (GET /suggest/?q=).
+
+Each worker holds a sorted prefix table in memory: every word-start suffix of a
+live proposal title or tag name, normalized, next to the id of the item it came
+from. Items are numbered in rank order (tags, then open proposals, then the
+rest, newest first), which makes "best N" the N smallest ids. A lookup is two
+bisects; a narrow slice is ranked directly, a wide one (short prefixes) walks
+the SHORT_PREFIX posting list, already in rank order, and stops at the N-th
+match. No query reaches the database per keystroke.
+
+The table is rebuilt lazily when the facet version in the shared cache (bumped
+by portal.signals and every bulk status change, in any process) no longer
+matches the one it was built from. The version is read at most every
+VERSION_CHECK_SECONDS, so keystrokes in between never touch the cache table,
+and a table older than MAX_AGE_SECONDS is rebuilt regardless, for writes that
+skip invalidate_facets(). Rebuilds run on a background thread while requests
+keep answering from the previous table; only a worker's first table is built
+inline.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+
+from django.core.cache import cache
+from django.db import connections
+from django.urls import reverse
+
+from .facets import FACET_VERSION_KEY
+from .models import Proposal, Tag
+
+DEFAULT_LIMIT = 8
+MAX_LIMIT = 20
+# Words that start a key; titles are matched from any word, not just the first
+WORD_START = re.compile(r"\w+")
+# Keys are cut here: a longer query is matched on its first KEY_LENGTH characters
+KEY_LENGTH = 32
+# Sorts after every real character, so bisect_left(prefix + END) ends the prefix range
+END = "\U0010ffff"
+# Key prefixes up to this length get a posting list of item ids in rank order
+SHORT_PREFIX = 3
+# Testing one posting-list entry against a longer prefix costs about this many
+# slice elements ranked directly; lookups pick whichever is cheaper
+WALK_COST = 32
+# How stale a worker's view of the facet version may be
+VERSION_CHECK_SECONDS = 2.0
+MAX_AGE_SECONDS = 300.0
+
+logger = logging.getLogger(__name__)
+
+
+def normalize(text: str) -> str:
+    """
+    Case- and accent-insensitive form used for both keys and queries.
+    """
+    folded = text.casefold()
+    if folded.isascii():
+        # Nothing to decompose (most titles): skip the per-character pass
+        return folded.strip()
+    decomposed = unicodedata.normalize("NFKD", folded)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).strip()
+
+
+@dataclass(frozen=True)
+class PrefixIndex:
+    version: object
+    built_at: float
+    keys: list[str]
+    ids: list[int]
+    items: list[dict]
+    # Every key prefix of 1..SHORT_PREFIX characters -> distinct item ids, ascending
+    postings: dict[str, list[int]]
+    # item id -> its keys, to test a longer prefix while walking a posting list
+    item_keys: list[tuple[str, ...]]
+
+    @classmethod
+    def build(cls, version: object) -> PrefixIndex:
+        items = [
+            {"kind": "tag", "label": name, "url": f"{reverse('home')}?tags={slug}"}
+            for name, slug in Tag.objects.order_by("name").values_list("name", "slug")
+        ]
+        proposals = Proposal.objects.values_list("title", "slug", "status").order_by("-created_at", "-pk")
+        open_first = sorted(proposals, key=lambda row: row[2] != "OPEN")
+        detail_prefix, detail_suffix = reverse("proposal_detail", args=["-"]).rsplit("-", 1)
+        items += [
+            {"kind": "proposal", "label": title, "url": f"{detail_prefix}{slug}{detail_suffix}"}
+            for title, slug, _status in open_first
+        ]
+
+        pairs: set[tuple[str, int]] = set()
+        item_keys = []
+        for item_id, item in enumerate(items):
+            label = normalize(item["label"])
+            own = {label[word.start():word.start() + KEY_LENGTH] for word in WORD_START.finditer(label)}
+            pairs.update((key, item_id) for key in own)
+            item_keys.append(tuple(own))
+        ordered = sorted(pairs)
+        keys = [key for key, _id in ordered]
+        ids = [item_id for _key, item_id in ordered]
+
+        # Each prefix is one contiguous run of `keys`: jump from run to run with bisect
+        postings: dict[str, list[int]] = {}
+        for n in range(1, SHORT_PREFIX + 1):
+            lo = 0
+            while lo < len(keys):
+                prefix = keys[lo][:n]
+                if len(prefix) < n:
+                    # Keys shorter than n have no prefix of this length
+                    lo = bisect_right(keys, prefix, lo)
+                    continue
+                hi = bisect_left(keys, prefix + END, lo)
+                postings[prefix] = sorted(set(ids[lo:hi]))
+                lo = hi
+        return cls(
+            version=version,
+            built_at=time.monotonic(),
+            keys=keys,
+            ids=ids,
+            items=items,
+            postings=postings,
+            item_keys=item_keys,
+        )
+
+    def lookup(self, prefix: str, limit: int = DEFAULT_LIMIT) -> list[dict]:
+        prefix = normalize(prefix)[:KEY_LENGTH]
+        if not prefix:
+            return []
+        lo = bisect_left(self.keys, prefix)
+        hi = bisect_left(self.keys, prefix + END, lo)
+        if lo == hi:
+            return []
+        if len(prefix) <= SHORT_PREFIX:
+            best = self.postings[prefix][:limit]
+        else:
+            candidates = self.postings[prefix[:SHORT_PREFIX]]
+            # Entries walked before the limit-th match, if matches are spread evenly
+            walked = limit * len(candidates) / (hi - lo)
+            if hi - lo <= walked * WALK_COST:
+                best = heapq.nsmallest(limit, set(self.ids[lo:hi]))
+            else:
+                matches = (
+                    item_id
+                    for item_id in candidates
+                    if any(key.startswith(prefix) for key in self.item_keys[item_id])
+                )
+                best = list(itertools.islice(matches, limit))
+        return [self.items[i] for i in best]
+
+
+_index: PrefixIndex | None = None
+_checked_at = float("-inf")
+_rebuild_lock = threading.Lock()
+
+
+def _fresh(index: PrefixIndex | None, version: object, now: float) -> bool:
+    return index is not None and index.version == version and now - index.built_at < MAX_AGE_SECONDS
+
+
+def get_index() -> PrefixIndex:
+    """
+    This worker's index. When the catalog changed since it was built, a rebuild
+    starts in the background and the previous table answers until it is done;
+    only the very first table is built on the calling thread.
+    """
+    global _index, _checked_at
+    current = _index
+    now = time.monotonic()
+    if current is not None and now - _checked_at < VERSION_CHECK_SECONDS:
+        return current
+    version = cache.get_or_set(FACET_VERSION_KEY, time.time_ns, timeout=None)
+    _checked_at = now
+    if _fresh(current, version, now):
+        return current
+
+    if current is None:
+        with _rebuild_lock:
+            if _index is None:
+                _index = PrefixIndex.build(version)
+            return _index
+    # Already rebuilding: keep serving the previous table
+    if _rebuild_lock.acquire(blocking=False):
+        threading.Thread(target=_rebuild, args=(version,), name="suggest-rebuild", daemon=True).start()
+    return current
+
+
+def _rebuild(version: object) -> None:
+    global _index
+    try:
+        _index = PrefixIndex.build(version)
+    except Exception:
+        # The previous table keeps answering; the next version check tries again
+        logger.exception("Suggestion index rebuild failed")
+    finally:
+        _rebuild_lock.release()
+        # This thread's own database connection
+        connections.close_all()
+
+
+def suggest(prefix: str, limit: int = DEFAULT_LIMIT) -> list[dict]:
+    return get_index().lookup(prefix, max(1, min(limit, MAX_LIMIT)))
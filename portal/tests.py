@@ -1,3 +1,974 @@
-from django.test import TestCase
+import json
+import logging
+import os
+import tempfile
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import IntegrityError
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from prometheus_client import REGISTRY
+
+from . import events as events_module
+from . import health as health_module
+from . import suggest as suggest_module
+from .dedup import find_duplicates
+from .emailer import AdaptiveTimeout, CircuitBreaker
+from .facets import cached_facets, compute_facets
+from .logs import JsonFormatter, QueueingHandler, SamplingFilter
+from .metrics import UNRESOLVED
+from .models import Proposal, ProposalNeighbor, ProposalQuestion, ProposalSignature, Signup, SignupAnswer, Tag
+from .similarity import load_index, rebuild
+
+
+def make_proposal(**kwargs) -> Proposal:
+    fields = {"created_by_name": "Owner", "created_by_email": "owner@example.com", "title": "Study", "summary": "s"}
+    return Proposal.objects.create(**{**fields, **kwargs})
+
+
+# -------------------------------------------------------
+# Signups: seats and waitlist
+# -------------------------------------------------------
+@mock.patch("portal.views.send_email")
+class SignupSeatTests(TestCase):
+    def setUp(self):
+        self.proposal = make_proposal(max_volunteers=2)
+
+    def sign_up(self, name: str, **extra):
+        data = {"name": name, "email": f"{name}@example.com", **extra}
+        return self.client.post(reverse("proposal_signup", args=[self.proposal.slug]), data)
+
+    def statuses(self) -> dict[str, str]:
+        return dict(Signup.objects.values_list("name", "status"))
+
+    def test_signups_past_the_limit_are_waitlisted(self, send_email):
+        for name in ("a", "b", "c"):
+            self.sign_up(name)
+        self.proposal.refresh_from_db()
+        self.assertEqual(self.proposal.seats_taken, 2)
+        self.assertEqual(self.statuses(), {"a": "PENDING", "b": "PENDING", "c": "WAITLISTED"})
+
+    def test_rejecting_a_seated_signup_promotes_the_waitlist(self, send_email):
+        for name in ("a", "b", "c"):
+            self.sign_up(name)
+        Signup.objects.get(name="a").set_status("REJECTED")
+        self.proposal.refresh_from_db()
+        self.assertEqual(self.proposal.seats_taken, 2)
+        self.assertEqual(self.statuses(), {"a": "REJECTED", "b": "PENDING", "c": "PENDING"})
+
+    def test_approving_a_waitlisted_signup_seats_it_past_the_limit(self, send_email):
+        for name in ("a", "b", "c"):
+            self.sign_up(name)
+        Signup.objects.get(name="c").set_status("APPROVED")
+        self.proposal.refresh_from_db()
+        self.assertEqual(self.proposal.seats_taken, 3)
+
+    def test_take_seat_never_passes_the_limit(self, send_email):
+        self.assertTrue(self.proposal.take_seat())
+        self.assertTrue(self.proposal.take_seat())
+        self.assertFalse(self.proposal.take_seat())
+        self.proposal.refresh_from_db()
+        self.assertEqual(self.proposal.seats_taken, 2)
+
+
+# -------------------------------------------------------
+# Owner dashboard: fragment approve / reject
+# -------------------------------------------------------
+@mock.patch("portal.views.send_email")
+class OwnerDecisionFragmentTests(TestCase):
+    def setUp(self):
+        self.proposal = make_proposal(max_volunteers=1)
+        url = reverse("proposal_signup", args=[self.proposal.slug])
+        for name in ("a", "b"):
+            self.client.post(url, {"name": name, "email": f"{name}@example.com"})
+        self.seated, self.waitlisted = Signup.objects.get(name="a"), Signup.objects.get(name="b")
+
+    def decide(self, signup: Signup, decision: str):
+        url = reverse(
+            "proposal_owner_decide_signup", args=[self.proposal.slug, self.proposal.owner_token, signup.pk, decision]
+        )
+        return self.client.post(url, HTTP_X_REQUESTED_WITH="fetch")
+
+    def test_approve_returns_the_card_and_seat_count(self, send_email):
+        response = self.decide(self.seated, "approve")
+        self.assertContains(response, f'id="signup-{self.seated.pk}"')
+        self.assertNotContains(response, f'id="signup-{self.waitlisted.pk}"')
+        self.assertContains(response, "1/1 places taken")
+
+    def test_reject_also_returns_the_promoted_card(self, send_email):
+        response = self.decide(self.seated, "reject")
+        self.assertContains(response, f'id="signup-{self.seated.pk}"')
+        self.assertContains(response, f'id="signup-{self.waitlisted.pk}"')
+        self.assertContains(response, "status-pending")
+        self.assertContains(response, '<span id="signup-seats">· 1/1 places taken</span>', html=True)
+
+    def test_without_fetch_header_redirects_to_dashboard(self, send_email):
+        url = reverse(
+            "proposal_owner_decide_signup",
+            args=[self.proposal.slug, self.proposal.owner_token, self.seated.pk, "reject"],
+        )
+        response = self.client.post(url)
+        self.assertRedirects(
+            response, reverse("proposal_owner_dashboard", args=[self.proposal.slug, self.proposal.owner_token])
+        )
+
+
+# -------------------------------------------------------
+# Signups: double submits and duplicates
+# -------------------------------------------------------
+@mock.patch("portal.views.send_email")
+class SignupIdempotencyTests(TestCase):
+    def setUp(self):
+        self.proposal = make_proposal(max_volunteers=2)
+        self.url = reverse("proposal_signup", args=[self.proposal.slug])
+
+    def test_resubmitted_form_creates_one_signup(self, send_email):
+        data = {"name": "a", "email": "a@example.com", "idempotency_key": "key-1"}
+        self.client.post(self.url, data)
+        response = self.client.post(self.url, data)
+        self.assertRedirects(response, reverse("proposal_detail", args=[self.proposal.slug]))
+        self.assertEqual(Signup.objects.count(), 1)
+        self.proposal.refresh_from_db()
+        # The duplicate's seat was rolled back with its insert
+        self.assertEqual(self.proposal.seats_taken, 1)
+        send_email.assert_called_once()
+
+    def test_same_email_in_another_case_is_refused(self, send_email):
+        self.client.post(self.url, {"name": "a", "email": "a@example.com"})
+        self.client.post(self.url, {"name": "a2", "email": "A@Example.com"})
+        self.assertEqual(Signup.objects.count(), 1)
+        with self.assertRaises(IntegrityError):
+            Signup.objects.create(proposal=self.proposal, name="x", email="A@EXAMPLE.COM")
+
+
+# -------------------------------------------------------
+# Tag filtering on Proposal.tag_mask
+# -------------------------------------------------------
+class TagFilterTests(TestCase):
+    def setUp(self):
+        self.a, self.b, self.c = (Tag.objects.create(name=name) for name in ("Test A", "Test B", "Test C"))
+        self.only_a = make_proposal(title="Only A")
+        self.both = make_proposal(title="A and B")
+        self.untagged = make_proposal(title="Untagged")
+        self.only_a.tags.add(self.a)
+        self.both.tags.add(self.a, self.b)
+
+    def titles(self, slugs, match):
+        return set(Proposal.objects.filter_tags(slugs, match=match).values_list("title", flat=True))
+
+    def test_any_and_all(self):
+        self.assertEqual(self.titles([self.a.slug, self.b.slug], "any"), {"Only A", "A and B"})
+        self.assertEqual(self.titles([self.a.slug, self.b.slug], "all"), {"A and B"})
+        self.assertEqual(self.titles([self.c.slug], "any"), set())
+
+    def test_unknown_slug_matches_nothing_under_all(self):
+        self.assertEqual(self.titles([self.a.slug, "no-such-tag"], "all"), set())
+        self.assertEqual(self.titles([self.a.slug, "no-such-tag"], "any"), {"Only A", "A and B"})
+
+    def test_mask_follows_the_m2m(self):
+        self.both.tags.remove(self.a)
+        self.assertEqual(self.titles([self.a.slug], "any"), {"Only A"})
+        # Reverse side of the relation
+        self.c.proposals.add(self.untagged)
+        self.assertEqual(self.titles([self.c.slug], "any"), {"Untagged"})
+
+    def test_tags_without_a_bit_fall_back_to_the_m2m(self):
+        Tag.objects.filter(pk=self.b.pk).update(bit=None)
+        self.assertEqual(self.titles([self.b.slug], "any"), {"A and B"})
+        self.assertEqual(self.titles([self.a.slug, self.b.slug], "all"), {"A and B"})
+        self.assertEqual(self.titles([self.b.slug], "all"), {"A and B"})
+
+
+# -------------------------------------------------------
+# Home facets: counts and cache invalidation
+# -------------------------------------------------------
+class FacetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.a, self.b = (Tag.objects.create(name=name) for name in ("Test A", "Test B"))
+        open_a = make_proposal(title="Cardiac")
+        open_a.tags.add(self.a)
+        closed_ab = make_proposal(title="Renal", status="CLOSED")
+        closed_ab.tags.add(self.a, self.b)
+        make_proposal(title="Cardiac follow-up")
+
+    def test_counts(self):
+        facets = compute_facets(q="", status="", selected_tags=[])
+        self.assertEqual(facets["total"], 3)
+        self.assertEqual(facets["tags"][self.a.slug], 2)
+        self.assertEqual(facets["tags"][self.b.slug], 1)
+        self.assertEqual(facets["statuses"]["OPEN"], 2)
+        self.assertEqual(facets["statuses"]["CLOSED"], 1)
+
+    def test_status_facet_ignores_the_selected_status(self):
+        facets = compute_facets(q="", status="OPEN", selected_tags=[self.a.slug])
+        self.assertEqual(facets["total"], 1)
+        self.assertEqual(facets["tags"][self.b.slug], 0)
+        self.assertEqual(facets["statuses"]["CLOSED"], 1)
+
+    def test_search_narrows_every_count(self):
+        facets = compute_facets(q="cardiac", status="", selected_tags=[])
+        self.assertEqual(facets["total"], 2)
+        self.assertEqual(facets["tags"][self.a.slug], 1)
+
+    def test_cached_until_a_proposal_or_tag_changes(self):
+        first = cached_facets(q="", status="", selected_tags=[])
+        with self.assertNumQueries(2):
+            # The version key and the entry itself, no aggregate
+            self.assertEqual(cached_facets(q="", status="", selected_tags=[]), first)
+
+        make_proposal(title="Stroke").tags.add(self.b)
+        facets = cached_facets(q="", status="", selected_tags=[])
+        self.assertEqual(facets["total"], 4)
+        self.assertEqual(facets["tags"][self.b.slug], 2)
+
+        Tag.objects.create(name="Test C")
+        self.assertIn("test-c", cached_facets(q="", status="", selected_tags=[])["tags"])
+
+
+# -------------------------------------------------------
+# Similar proposals
+# -------------------------------------------------------
+class SimilarityTests(TestCase):
+    def setUp(self):
+        self.cardiac = make_proposal(title="Cardiac surgery outcomes", summary="Valve repair in cardiac surgery")
+        self.valve = make_proposal(title="Valve repair follow-up", summary="Cardiac valve surgery cohort")
+        self.renal = make_proposal(title="Renal failure registry", summary="Dialysis outcomes")
+        # Unrelated filler, so shared terms stay under MAX_DOC_FREQ
+        for topic in ("Stroke rehabilitation", "Sleep apnea", "Asthma triggers", "Migraine diaries"):
+            make_proposal(title=topic, summary=topic)
+
+    def neighbors(self, proposal) -> list[int]:
+        return list(proposal.neighbors.order_by("rank").values_list("neighbor_id", flat=True))
+
+    def test_rebuild_stores_neighbors_and_clears_the_flag(self):
+        self.assertEqual(rebuild(), 7)
+        self.assertEqual(self.neighbors(self.cardiac)[0], self.valve.pk)
+        self.assertFalse(Proposal.objects.filter(similar_stale=True).exists())
+        self.assertEqual(rebuild(), 0)
+
+    def test_edit_marks_stale_and_rebuild_is_incremental(self):
+        rebuild()
+        self.renal.summary = "Renal outcomes after cardiac valve surgery"
+        self.renal.save(update_fields=["summary"])
+        self.assertEqual(list(Proposal.objects.filter(similar_stale=True)), [self.renal])
+        rebuild()
+        self.assertIn(self.valve.pk, self.neighbors(self.renal))
+        self.assertIn(self.renal.pk, self.neighbors(self.valve))
+
+    def test_edit_during_rebuild_stays_stale(self):
+        def load_then_edit():
+            index = load_index()
+            self.cardiac.title = "Cardiac imaging"
+            self.cardiac.save(update_fields=["title"])
+            return index
+
+        with mock.patch("portal.similarity.load_index", load_then_edit):
+            rebuild()
+        self.assertEqual(list(Proposal.objects.filter(similar_stale=True)), [self.cardiac])
+
+    def test_detail_page_lists_live_neighbors(self):
+        rebuild()
+        url = reverse("proposal_detail", args=[self.cardiac.slug])
+        self.assertContains(self.client.get(url), self.valve.title)
+
+        Proposal.objects.filter(pk=self.valve.pk).update(is_archived=True)
+        self.assertNotContains(self.client.get(url), self.valve.title)
+
+
+# -------------------------------------------------------
+# Near-duplicate detection (MinHash + LSH)
+# -------------------------------------------------------
+class DedupTests(TestCase):
+    SUMMARY = "Retrospective review of valve repair outcomes in adult cardiac surgery patients over ten years"
+
+    def setUp(self):
+        self.original = make_proposal(title="Valve repair outcomes", summary=self.SUMMARY)
+        make_proposal(title="Asthma triggers", summary="Diary study of asthma triggers in school children")
+
+    def test_near_duplicate_is_found(self):
+        found = find_duplicates(title="Valve repair outcomes", summary=self.SUMMARY + " at two centres")
+        self.assertEqual([p for p, _score in found], [self.original])
+        self.assertEqual(find_duplicates(title="Sleep apnea", summary="Home polysomnography in adults"), [])
+
+    def test_edits_reindex_and_exclude_pk_skips_self(self):
+        self.original.summary = "Home polysomnography for sleep apnea in adults"
+        self.original.save(update_fields=["summary"])
+        self.assertEqual(find_duplicates(title="Valve repair outcomes", summary=self.SUMMARY), [])
+        found = find_duplicates(
+            title="Valve repair outcomes", summary=self.original.summary, exclude_pk=self.original.pk
+        )
+        self.assertEqual(found, [])
+
+    def test_archived_proposals_are_not_offered(self):
+        Proposal.objects.filter(pk=self.original.pk).update(is_archived=True)
+        self.assertEqual(find_duplicates(title="Valve repair outcomes", summary=self.SUMMARY), [])
+
+    def test_create_form_asks_for_confirmation(self):
+        data = {
+            "created_by_name": "B", "created_by_email": "b@example.com", "title": "Valve repair outcomes",
+            "summary": self.SUMMARY, "status": "OPEN", "notify_frequency": "IMMEDIATE",
+            "q-TOTAL_FORMS": "0", "q-INITIAL_FORMS": "0",
+        }
+        response = self.client.post(reverse("proposal_create"), data)
+        self.assertEqual(response.context["duplicates"][0][0], self.original)
+        self.assertContains(response, 'name="confirm_not_duplicate"')
+        self.assertEqual(Proposal.objects.count(), 2)
+
+        self.client.post(reverse("proposal_create"), {**data, "confirm_not_duplicate": "1"})
+        self.assertEqual(Proposal.objects.count(), 3)
+
+    def test_backfill_indexes_proposals_without_a_signature(self):
+        ProposalSignature.objects.all().delete()
+        self.assertEqual(find_duplicates(title="Valve repair outcomes", summary=self.SUMMARY), [])
+        call_command("dedup_report", backfill=True, stdout=StringIO())
+        self.assertEqual(ProposalSignature.objects.count(), 2)
+        self.assertEqual(len(find_duplicates(title="Valve repair outcomes", summary=self.SUMMARY)), 1)
+
+
+# -------------------------------------------------------
+# Owner notifications: immediate emails and digests
+# -------------------------------------------------------
+@mock.patch("portal.views.send_email")
+class OwnerNotificationTests(TestCase):
+    def sign_up(self, proposal: Proposal, name: str):
+        data = {"name": name, "email": f"{name}@example.com"}
+        return self.client.post(reverse("proposal_signup", args=[proposal.slug]), data)
+
+    def test_immediate_owner_marked_notified_only_when_sent(self, send_email):
+        proposal = make_proposal(notify_frequency="IMMEDIATE")
+        send_email.side_effect = RuntimeError("Brevo down")
+        self.sign_up(proposal, "a")
+        send_email.side_effect = None
+        self.sign_up(proposal, "b")
+        notified = dict(Signup.objects.values_list("name", "owner_notified_at"))
+        self.assertIsNone(notified["a"])
+        self.assertIsNotNone(notified["b"])
+
+    @mock.patch("portal.management.commands.send_digests.send_email")
+    def test_one_digest_per_owner_then_nothing_until_due(self, digest_email, send_email):
+        first, second = make_proposal(title="First", notify_frequency="HOURLY"), make_proposal(
+            title="Second", notify_frequency="DAILY"
+        )
+        for proposal, name in ((first, "a"), (first, "b"), (second, "c")):
+            self.sign_up(proposal, name)
+        send_email.assert_not_called()
+
+        call_command("send_digests", stdout=StringIO())
+        digest_email.assert_called_once()
+        self.assertEqual(digest_email.call_args.kwargs["to_email"], "owner@example.com")
+        self.assertIn("Second", digest_email.call_args.kwargs["text_body"])
+        self.assertFalse(Signup.objects.filter(owner_notified_at__isnull=True).exists())
+
+        self.sign_up(first, "d")
+        digest_email.reset_mock()
+        call_command("send_digests", stdout=StringIO())
+        digest_email.assert_not_called()
+
+        Proposal.objects.filter(pk=first.pk).update(last_digest_at=timezone.now() - timedelta(hours=1))
+        call_command("send_digests", stdout=StringIO())
+        self.assertIn("d@example.com", digest_email.call_args.kwargs["text_body"])
+
+    @mock.patch("portal.management.commands.send_digests.send_email", side_effect=RuntimeError("Brevo down"))
+    def test_failed_digest_stays_pending(self, digest_email, send_email):
+        self.sign_up(make_proposal(notify_frequency="DAILY"), "a")
+        call_command("send_digests", stdout=StringIO(), stderr=StringIO())
+        self.assertIsNone(Signup.objects.get().owner_notified_at)
+
+
+# -------------------------------------------------------
+# Email circuit breaker
+# -------------------------------------------------------
+class CircuitBreakerTests(TestCase):
+    def setUp(self):
+        # Patches the time module, which the cache also uses for expiry: start from the real clock
+        self.now = time.time()
+        patcher = mock.patch("portal.emailer.time.time", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker(threshold=3, window=60, cooldown=30, prefix="test:circuit")
+
+    def trip(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+
+    def test_opens_after_threshold_failures_in_window(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, "closed")
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, "open")
+        self.assertFalse(self.breaker.allow())
+
+    def test_failures_outside_the_window_do_not_count(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.now += 61
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, "closed")
+
+    def test_half_open_lets_one_probe_through(self):
+        self.trip()
+        self.now += 31
+        self.assertEqual(self.breaker.state, "half-open")
+        self.assertTrue(self.breaker.allow())
+        self.assertFalse(self.breaker.allow())
+
+    def test_probe_result_closes_or_reopens(self):
+        self.trip()
+        self.now += 31
+        self.breaker.allow()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, "open")
+
+        self.now += 31
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, "closed")
+        self.assertTrue(self.breaker.allow())
+
+    def test_state_is_shared_between_instances(self):
+        other = CircuitBreaker(threshold=3, window=60, cooldown=30, prefix="test:circuit")
+        self.breaker.record_failure()
+        other.record_failure()
+        self.breaker.record_failure()
+        self.assertEqual(other.state, "open")
+
+
+class AdaptiveTimeoutTests(TestCase):
+    def test_follows_p99_within_bounds(self):
+        timeout = AdaptiveTimeout(minimum=2, maximum=20)
+        self.assertEqual(timeout.current(), 20)  # too few samples yet
+        for _ in range(100):
+            timeout.record(1.0)
+        self.assertEqual(timeout.current(), 3.0)
+        for _ in range(100):
+            timeout.record(0.1)
+        self.assertEqual(timeout.current(), 3.0)  # p99 is still the slow tail
+        for _ in range(200):
+            timeout.record(0.1)
+        self.assertEqual(timeout.current(), 2)
+
+
+# -------------------------------------------------------
+# Deadlines: auto-close and archival
+# -------------------------------------------------------
+@mock.patch("portal.views.send_email")
+class ExpiryTests(TestCase):
+    def setUp(self):
+        self.yesterday = timezone.localdate() - timedelta(days=1)
+
+    def test_no_signups_after_the_deadline(self, send_email):
+        proposal = make_proposal(deadline=self.yesterday)
+        detail = self.client.get(reverse("proposal_detail", args=[proposal.slug]))
+        self.assertNotContains(detail, reverse("proposal_signup", args=[proposal.slug]))
+        self.client.post(reverse("proposal_signup", args=[proposal.slug]), {"name": "a", "email": "a@example.com"})
+        self.assertFalse(Signup.objects.exists())
+
+    def test_expire_closes_then_archives(self, send_email):
+        past = make_proposal(title="Past", deadline=self.yesterday)
+        future = make_proposal(title="Future", deadline=timezone.localdate() + timedelta(days=1))
+        old = make_proposal(title="Old", status="CLOSED")
+        Proposal.objects.filter(pk=old.pk).update(closed_at=timezone.now() - timedelta(days=100))
+
+        call_command("expire_proposals", archive_after_days=30, batch_size=1, stdout=StringIO())
+        rows = {p.title: p for p in Proposal.all_objects.all()}
+        self.assertEqual((rows["Past"].status, rows["Past"].is_archived), ("CLOSED", False))
+        self.assertIsNotNone(rows["Past"].closed_at)
+        self.assertEqual(rows["Future"].status, "OPEN")
+        self.assertTrue(rows["Old"].is_archived)
+        # Archived proposals leave the home feed but keep their page
+        self.assertNotIn(old, Proposal.objects.all())
+        self.assertEqual(self.client.get(reverse("proposal_detail", args=[old.slug])).status_code, 200)
+        self.assertIn(future, Proposal.objects.all())
+        self.assertIn(past, Proposal.objects.all())
+
+    def test_dry_run_changes_nothing(self, send_email):
+        make_proposal(deadline=self.yesterday)
+        call_command("expire_proposals", dry_run=True, stdout=StringIO())
+        self.assertEqual(Proposal.objects.get().status, "OPEN")
+
+
+# -------------------------------------------------------
+# Purging soft-deleted proposals
+# -------------------------------------------------------
+class PurgeTests(TestCase):
+    def test_purge_removes_deleted_proposals_and_their_rows(self):
+        doomed, kept = make_proposal(title="Doomed"), make_proposal(title="Kept")
+        for proposal in (doomed, kept):
+            question = ProposalQuestion.objects.create(proposal=proposal, prompt="Why?")
+            signup = Signup.objects.create(proposal=proposal, name="a", email="a@example.com")
+            SignupAnswer.objects.create(signup=signup, question=question, answer_text="x")
+        ProposalNeighbor.objects.create(proposal=kept, neighbor=doomed, rank=0, score=0.5)
+        Proposal.objects.filter(pk=kept.pk).update(similar_stale=False)
+        Proposal.all_objects.filter(pk=doomed.pk).update(deleted_at=timezone.now())
+
+        call_command("purge_deleted_proposals", batch_size=1, grace_minutes=0, stdout=StringIO())
+        self.assertEqual(list(Proposal.all_objects.values_list("pk", flat=True)), [kept.pk])
+        self.assertEqual(set(Signup.objects.values_list("proposal_id", flat=True)), {kept.pk})
+        self.assertEqual(SignupAnswer.objects.count(), 1)
+        self.assertEqual(ProposalQuestion.objects.count(), 1)
+        # Its former neighbor list is recomputed by the next rebuild_similar
+        self.assertTrue(Proposal.objects.get(pk=kept.pk).similar_stale)
+
+    def test_recently_deleted_proposals_wait_for_the_grace_period(self):
+        proposal = make_proposal()
+        Proposal.all_objects.filter(pk=proposal.pk).update(deleted_at=timezone.now())
+        call_command("purge_deleted_proposals", grace_minutes=60, stdout=StringIO())
+        self.assertTrue(Proposal.all_objects.filter(pk=proposal.pk).exists())
+
+
+# -------------------------------------------------------
+# Retention: rejected answers and anonymization
+# -------------------------------------------------------
+class RetentionTests(TestCase):
+    def run_command(self, name: str, *args, **options):
+        call_command(name, *args, stdout=StringIO(), **options)
+
+    def test_rejected_answers_are_deleted_after_the_retention_period(self):
+        proposal = make_proposal()
+        question = ProposalQuestion.objects.create(proposal=proposal, prompt="Why?")
+        old, recent, kept = (
+            Signup.objects.create(proposal=proposal, name=n, email=f"{n}@example.com", status=s)
+            for n, s in (("old", "REJECTED"), ("recent", "REJECTED"), ("kept", "APPROVED"))
+        )
+        Signup.objects.filter(pk__in=[old.pk, kept.pk]).update(decided_at=timezone.now() - timedelta(days=100))
+        Signup.objects.filter(pk=recent.pk).update(decided_at=timezone.now())
+        for signup in (old, recent, kept):
+            SignupAnswer.objects.create(signup=signup, question=question, answer_text="because")
+
+        self.run_command("enforce_retention", rejected_answers_days=90, anonymize_closed_days=0)
+        remaining = set(SignupAnswer.objects.values_list("signup__name", flat=True))
+        self.assertEqual(remaining, {"recent", "kept"})
+
+    def test_closed_proposals_are_anonymized(self):
+        proposal = make_proposal(status="CLOSED")
+        Proposal.all_objects.filter(pk=proposal.pk).update(closed_at=timezone.now() - timedelta(days=400))
+        Signup.objects.create(proposal=proposal, name="Ada", email="ada@example.com")
+
+        self.run_command("enforce_retention", rejected_answers_days=0, anonymize_closed_days=365)
+        proposal = Proposal.all_objects.get(pk=proposal.pk)
+        self.assertIsNotNone(proposal.anonymized_at)
+        self.assertEqual(proposal.created_by_email, "")
+        signup = Signup.objects.get()
+        self.assertNotEqual(signup.name, "Ada")
+        self.assertTrue(signup.email.endswith("@anonymized.invalid"))
+
+
+# -------------------------------------------------------
+# Backup: export_portal / import_portal
+# -------------------------------------------------------
+class BackupTests(TestCase):
+    def setUp(self):
+        self.tag = Tag.objects.create(name="Test Backup")
+        self.proposal = make_proposal(title="Valve study", deadline=timezone.localdate())
+        self.proposal.tags.add(self.tag)
+        question = ProposalQuestion.objects.create(proposal=self.proposal, prompt="Why?")
+        signup = Signup.objects.create(
+            proposal=self.proposal, name="Ada", email="ada@example.com", idempotency_key="key-1"
+        )
+        SignupAnswer.objects.create(signup=signup, question=question, answer_text="because")
+        self.path = os.path.join(self.enterContext(tempfile.TemporaryDirectory()), "backup.jsonl.gz")
+        call_command("export_portal", self.path, stdout=StringIO())
+
+    def import_backup(self) -> str:
+        out = StringIO()
+        call_command("import_portal", self.path, batch_size=1, stdout=out)
+        return out.getvalue()
+
+    def snapshot(self) -> dict:
+        proposal = Proposal.all_objects.get(slug=self.proposal.slug)
+        signup = proposal.signups.get()
+        return {
+            "proposal": (proposal.title, proposal.owner_token, proposal.deadline, proposal.created_at),
+            "tags": list(proposal.tags.values_list("slug", flat=True)),
+            "tag_mask": proposal.tag_mask,
+            "signup": (signup.name, signup.email, signup.idempotency_key, signup.created_at),
+            "answers": list(signup.answers.values_list("question__prompt", "answer_text")),
+        }
+
+    def test_round_trip(self):
+        before = self.snapshot()
+        Proposal.all_objects.all().delete()
+        Tag.objects.all().delete()
+        self.import_backup()
+        self.assertEqual(self.snapshot(), before)
+
+    def test_second_import_skips_everything(self):
+        output = self.import_backup()
+        self.assertIn("Imported nothing", output)
+        self.assertEqual(Proposal.all_objects.count(), 1)
+        self.assertEqual(Signup.objects.count(), 1)
+
+    def test_colliding_unique_values_are_skipped(self):
+        # Same owner token under another slug, and a local signup holding the idempotency key
+        Proposal.all_objects.filter(pk=self.proposal.pk).update(slug="renamed")
+        self.import_backup()
+        self.assertEqual(Proposal.all_objects.count(), 1)
+
+        Proposal.all_objects.filter(pk=self.proposal.pk).update(slug="renamed", owner_token="other")
+        output = self.import_backup()
+        self.assertEqual(Proposal.all_objects.count(), 2)
+        # Its signup is skipped on the idempotency key; the answer goes with it
+        self.assertEqual(Signup.objects.count(), 1)
+        self.assertEqual(SignupAnswer.objects.count(), 1)
+        self.assertIn("1 signup", output)
+
+
+# -------------------------------------------------------
+# Admin actions
+# -------------------------------------------------------
+class AdminActionTests(TestCase):
+    def setUp(self):
+        admin = User.objects.create_superuser("admin", "admin@example.com", "pw")
+        self.client.force_login(admin)
+
+    def run_action(self, action: str, *proposals):
+        return self.client.post(
+            reverse("admin:portal_proposal_changelist"),
+            {"action": action, "_selected_action": [p.pk for p in proposals]},
+        )
+
+    def test_reopen_clears_a_past_deadline(self):
+        today = timezone.localdate()
+        past = make_proposal(title="Past", status="CLOSED", deadline=today - timedelta(days=3))
+        future = make_proposal(title="Future", status="CLOSED", deadline=today + timedelta(days=3))
+        Proposal.all_objects.filter(pk=past.pk).update(is_archived=True, closed_at=timezone.now())
+
+        self.run_action("reopen_proposals", past, future)
+        past, future = Proposal.objects.get(pk=past.pk), Proposal.objects.get(pk=future.pk)
+        self.assertEqual((past.status, past.deadline, past.closed_at), ("OPEN", None, None))
+        self.assertEqual(future.deadline, today + timedelta(days=3))
+
+        call_command("expire_proposals", stdout=StringIO())
+        self.assertEqual(Proposal.objects.get(pk=past.pk).status, "OPEN")
+
+
+# -------------------------------------------------------
+# JSON API
+# -------------------------------------------------------
+class ApiTests(TestCase):
+    def setUp(self):
+        self.proposals = [make_proposal(title=f"Study {i}") for i in range(5)]
+        # Identical timestamps: the pk tie-breaker alone must keep pages apart
+        Proposal.objects.update(created_at=timezone.now())
+
+    def test_cursor_pages_cover_every_row_once(self):
+        seen = []
+        url = reverse("api_proposal_list") + "?limit=2"
+        while url:
+            data = self.client.get(url).json()
+            seen += [row["slug"] for row in data["results"]]
+            url = data["next"]
+        self.assertEqual(sorted(seen), sorted(p.slug for p in self.proposals))
+        self.assertEqual(len(seen), len(set(seen)))
+
+    def test_invalid_cursor_is_a_400(self):
+        response = self.client.get(reverse("api_proposal_list"), {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_matching_etag_answers_304(self):
+        url = reverse("api_proposal_item", args=[self.proposals[0].slug])
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        Proposal.objects.filter(pk=self.proposals[0].pk).update(title="Renamed")
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_archived_proposals_keep_their_item(self):
+        archived, deleted = self.proposals[:2]
+        Proposal.all_objects.filter(pk=archived.pk).update(is_archived=True)
+        Proposal.all_objects.filter(pk=deleted.pk).update(deleted_at=timezone.now())
+        self.assertEqual(self.client.get(reverse("api_proposal_item", args=[archived.slug])).status_code, 200)
+        self.assertEqual(self.client.get(reverse("api_proposal_item", args=[deleted.slug])).status_code, 404)
+
+    def test_sparse_fieldsets(self):
+        url = reverse("api_proposal_item", args=[self.proposals[0].slug])
+        self.assertEqual(set(self.client.get(url, {"fields": "slug,title"}).json()), {"slug", "title"})
+        self.assertEqual(self.client.get(url, {"fields": "owner_token"}).status_code, 400)
+
+    def test_signups_need_the_owner_token(self):
+        proposal = self.proposals[0]
+        Signup.objects.create(proposal=proposal, name="Ada", email="ada@example.com")
+        url = reverse("api_proposal_signups", args=[proposal.slug, proposal.owner_token])
+        self.assertEqual([row["name"] for row in self.client.get(url).json()["results"]], ["Ada"])
+        wrong = reverse("api_proposal_signups", args=[proposal.slug, "0" * 64])
+        self.assertEqual(self.client.get(wrong).status_code, 404)
+
+
+# -------------------------------------------------------
+# Search-as-you-type suggestions
+# -------------------------------------------------------
+class SuggestTests(TestCase):
+    def setUp(self):
+        Tag.objects.all().delete()
+        Tag.objects.create(name="Stroke Care")
+        make_proposal(title="Stroke outcomes", status="CLOSED")
+        make_proposal(title="Acute stroke pilot")
+        make_proposal(title="Café staff survey")
+        index = suggest_module.PrefixIndex.build(version=None)
+        patcher = mock.patch.object(suggest_module, "_index", index)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.index = index
+
+    def labels(self, prefix: str, limit: int = 8) -> list[str]:
+        return [item["label"] for item in self.index.lookup(prefix, limit)]
+
+    def test_rank_order_and_word_starts(self):
+        # Tags, then open proposals, then the rest
+        self.assertEqual(self.labels("str"), ["Stroke Care", "Acute stroke pilot", "Stroke outcomes"])
+        self.assertEqual(self.labels("stroke p"), ["Acute stroke pilot"])
+        self.assertEqual(self.labels("STR", limit=1), ["Stroke Care"])
+        self.assertEqual(self.labels("tro"), [])
+
+    def test_case_and_accent_insensitive(self):
+        self.assertEqual(self.labels("cafe"), ["Café staff survey"])
+        self.assertEqual(self.labels("CAFÉ S"), ["Café staff survey"])
+
+    def test_walking_a_posting_list_matches_ranking_the_slice(self):
+        words = ["stroke", "sepsis", "survey", "study", "stent"]
+        for i in range(300):
+            make_proposal(title=f"{words[i % 5]} {words[i * 7 % 5]} {words[i * 3 % 5]} {i}")
+        index = suggest_module.PrefixIndex.build(version=None)
+        for prefix in ["st", "stroke", "stroke s", "sepsis s", "study 1", "survey"]:
+            with mock.patch.object(suggest_module, "WALK_COST", 0):
+                walked = index.lookup(prefix, 10)
+            with mock.patch.object(suggest_module, "WALK_COST", 10**9):
+                ranked = index.lookup(prefix, 10)
+            self.assertEqual(walked, ranked, prefix)
+            self.assertEqual(len(ranked), 10, prefix)
+
+    def test_changes_rebuild_in_the_background(self):
+        with mock.patch.object(suggest_module, "_checked_at", float("-inf")), mock.patch.object(
+            suggest_module.threading, "Thread"
+        ) as thread:
+            make_proposal(title="Stroke registry")
+            # The previous table answers while the new one is built
+            self.assertIs(suggest_module.get_index(), self.index)
+        thread.assert_called_once()
+        thread.return_value.start.assert_called_once()
+
+        # What the thread runs, inline here so it sees the test transaction; get_index() took the lock for it
+        self.assertTrue(suggest_module._rebuild_lock.locked())
+        with mock.patch.object(suggest_module, "connections"):
+            suggest_module._rebuild(*thread.call_args.kwargs["args"])
+        self.assertIn("Stroke registry", [item["label"] for item in suggest_module.suggest("stroke r")])
+
+    def test_view(self):
+        response = self.client.get(reverse("proposal_suggest"), {"q": "acute", "limit": "x"})
+        self.assertEqual(response.json()["results"][0]["label"], "Acute stroke pilot")
+        self.assertIn("max-age=30", response["Cache-Control"])
+
+
+# -------------------------------------------------------
+# Owner dashboard event stream
+# -------------------------------------------------------
+class EventChangesTests(TestCase):
+    def setUp(self):
+        self.proposal = make_proposal()
+        self.request = RequestFactory().get("/")
+
+    def sign_up(self, name: str) -> Signup:
+        return Signup.objects.create(proposal=self.proposal, name=name, email=f"{name}@example.com")
+
+    def poll(self, cursor, sent):
+        events, cursor = events_module._changes(self.request, self.proposal, self.proposal.owner_token, cursor, sent)
+        return [json.loads(e.rsplit("data: ", 1)[1])["id"] for e in events], cursor
+
+    def test_keyset_cursor_and_late_commits(self):
+        sent = set()
+        start = (timezone.now() - timedelta(seconds=1), 0)
+        a = self.sign_up("a")
+        ids, cursor = self.poll(start, sent)
+        self.assertEqual(ids, [a.pk])
+        self.assertEqual(self.poll(cursor, sent), ([], cursor))
+
+        # Stamped before the cursor but committed after it was read
+        late = self.sign_up("late")
+        Signup.objects.filter(pk=late.pk).update(updated_at=cursor[0] - timedelta(seconds=1))
+        ids, cursor = self.poll(cursor, sent)
+        self.assertEqual(ids, [late.pk])
+        self.assertEqual(self.poll(cursor, sent)[0], [])
+
+        a.set_status("APPROVED")
+        self.assertEqual(self.poll(cursor, sent)[0], [a.pk])
+
+    def test_wsgi_requests_get_204(self):
+        url = reverse("proposal_owner_events", args=[self.proposal.slug, self.proposal.owner_token])
+        self.assertEqual(self.client.get(url).status_code, 204)
+
+
+class EventStreamTests(TransactionTestCase):
+    async def test_asgi_streams_new_signups(self):
+        proposal = await sync_to_async(make_proposal)()
+        url = reverse("proposal_owner_events", args=[proposal.slug, proposal.owner_token])
+        since = (timezone.now() - timedelta(seconds=1)).isoformat()
+        await Signup.objects.acreate(proposal=proposal, name="Ada", email="ada@example.com")
+
+        with mock.patch.object(events_module, "POLL_SECONDS", 0):
+            response = await self.async_client.get(url, {"since": since})
+            self.assertEqual(response["Content-Type"], "text/event-stream")
+            chunks = aiter(response.streaming_content)
+            self.assertTrue((await anext(chunks)).startswith(b"retry:"))
+            event = (await anext(chunks)).decode()
+        self.assertIn("event: signup", event)
+        self.assertIn("Ada", event)
+
+
+class AsyncMiddlewareTests(TestCase):
+    async def test_asgi_requests_get_an_id_and_count_queries(self):
+        # Collecting the registry queries the database (the backlog gauge)
+        home_queries = sync_to_async(lambda: REGISTRY.get_sample_value("portal_db_queries_total", {"view": "home"}))
+        before = await home_queries() or 0
+        response = await self.async_client.get(reverse("home"), headers={"X-Request-ID": "abc123"})
+        self.assertEqual(response["X-Request-ID"], "abc123")
+        # The view's queries run on another thread than the middleware
+        self.assertGreater(await home_queries(), before)
+
+
+
+# -------------------------------------------------------
+# Prometheus metrics
+# -------------------------------------------------------
+def requests_total(view: str, method: str, status: int) -> float:
+    labels = {"view": view, "method": method, "status": str(status)}
+    return REGISTRY.get_sample_value("portal_http_requests_total", labels) or 0
+
+
+class MetricsTests(TestCase):
+    @override_settings(PORTAL_METRICS_TOKEN="s3cret")
+    def test_token_is_required_when_set(self):
+        url = reverse("metrics")
+        self.assertEqual(self.client.get(url).status_code, 401)
+        self.assertEqual(self.client.get(url, headers={"Authorization": "Bearer wrong"}).status_code, 401)
+        response = self.client.get(url, headers={"Authorization": "Bearer s3cret"})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"portal_http_requests_total", response.content)
+
+    @override_settings(PORTAL_METRICS_TOKEN="")
+    def test_open_without_token(self):
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 200)
+
+    def test_requests_are_labelled_by_url_name(self):
+        before = requests_total("home", "GET", 200)
+        self.client.get(reverse("home"))
+        self.assertEqual(requests_total("home", "GET", 200), before + 1)
+
+    def test_unknown_methods_and_paths_share_one_label(self):
+        before = requests_total(UNRESOLVED, "other", 404)
+        self.client.generic("BREW", "/no-such-page/")
+        self.client.generic("X-" + "A" * 50, "/another-missing-page/")
+        self.assertEqual(requests_total(UNRESOLVED, "other", 404), before + 2)
+        # Neither the method nor the path became a label value
+        sampled = {
+            value
+            for metric in REGISTRY.collect()
+            if metric.name == "portal_http_requests"
+            for sample in metric.samples
+            for value in sample.labels.values()
+        }
+        self.assertNotIn("BREW", sampled)
+        self.assertFalse(any("missing" in value for value in sampled))
+
+
+# -------------------------------------------------------
+# Structured logging: queueing handler and sampling
+# -------------------------------------------------------
+def log_record(msg: str, *args, level: int = logging.INFO, **extra) -> logging.LogRecord:
+    record = logging.LogRecord("portal.test", level, __file__, 0, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+class QueueingHandlerTests(TestCase):
+    def make_handler(self, **kwargs) -> tuple[QueueingHandler, StringIO]:
+        stream = StringIO()
+        handler = QueueingHandler(stream=stream, **kwargs)
+        handler.setFormatter(JsonFormatter())
+        self.addCleanup(handler._stop_listener)
+        return handler, stream
+
+    def test_records_are_written_as_json_by_the_listener(self):
+        handler, stream = self.make_handler()
+        names = ["a"]
+        handler.handle(log_record("hello %s", names, event="test", request_id="r1"))
+        # Args are resolved when logged, not when the listener gets to the record
+        names.append("b")
+        handler._stop_listener()
+        entry = json.loads(stream.getvalue())
+        self.assertEqual(entry["msg"], "hello ['a']")
+        self.assertEqual((entry["level"], entry["event"], entry["request_id"]), ("INFO", "test", "r1"))
+
+    def test_full_queue_drops_and_counts(self):
+        handler, stream = self.make_handler(maxsize=1)
+        # Nothing drains the queue once the listener is stopped
+        handler._stop_listener()
+        before = REGISTRY.get_sample_value("portal_log_records_dropped_total") or 0
+        for i in range(3):
+            handler.handle(log_record("line %d", i))
+        self.assertEqual(handler.dropped, 2)
+        self.assertEqual(REGISTRY.get_sample_value("portal_log_records_dropped_total"), before + 2)
+
+
+class SamplingFilterTests(TestCase):
+    def test_only_sampled_info_records_are_thinned(self):
+        never = SamplingFilter(rate=0)
+        self.assertFalse(never.filter(log_record("sent", sampled=True)))
+        self.assertTrue(never.filter(log_record("sent")))
+        self.assertTrue(never.filter(log_record("failed", level=logging.WARNING, sampled=True)))
+
+    def test_kept_records_carry_the_rate(self):
+        half = SamplingFilter(rate=0.5)
+        with mock.patch("portal.logs.random.random", side_effect=[0.4, 0.6]):
+            kept = log_record("sent", sampled=True)
+            self.assertTrue(half.filter(kept))
+            self.assertFalse(half.filter(log_record("sent", sampled=True)))
+        self.assertEqual(kept.sample_rate, 0.5)
+
+
+# -------------------------------------------------------
+# Health checks and worker warm-up
+# -------------------------------------------------------
+@mock.patch.object(health_module, "_migrated", False)
+class HealthTests(TestCase):
+    def test_healthz_does_not_touch_the_database(self):
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("healthz"))
+        self.assertEqual(response.json(), {"status": "ok"})
+        self.assertIn("no-cache", response["Cache-Control"])
+
+    def test_readyz_ok(self):
+        response = self.client.get(reverse("readyz"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"status": "ok", "checks": {"database": "ok", "migrations": "ok"}})
+        # Later checks skip the migration graph
+        self.assertTrue(health_module._migrated)
+
+    def test_readyz_unavailable_with_unapplied_migrations(self):
+        plan = mock.patch("django.db.migrations.executor.MigrationExecutor.migration_plan", return_value=[("0099", False)])
+        with plan:
+            response = self.client.get(reverse("readyz"))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()["checks"], {"database": "ok", "migrations": "failed"})
+        self.assertFalse(health_module._migrated)
+
+    def test_readyz_unavailable_without_database(self):
+        with mock.patch.object(health_module, "_check_database", side_effect=OSError("db.internal:5432 refused")):
+            response = self.client.get(reverse("readyz"))
+        self.assertEqual(response.status_code, 503)
+        # Migrations are not checked, and the error text stays out of the public response
+        self.assertEqual(response.json(), {"status": "unavailable", "checks": {"database": "failed"}})
+        self.assertNotIn(b"db.internal", response.content)
+
+    def test_warm_up_runs_every_step(self):
+        timings = health_module.warm_up(keep_connections=True)
+        self.assertEqual(set(timings), {"urls", "templates", "caches"})
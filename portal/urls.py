@@ -1,9 +1,10 @@
 from django.urls import path
-from . import views
+from . import api, events, health, metrics, views
 
 urlpatterns = [
     path("", views.home, name="home"),
     path("create/", views.proposal_create, name="proposal_create"),
+    path("suggest/", views.proposal_suggest, name="proposal_suggest"),
 
     path("proposal/<slug:slug>/", views.proposal_detail, name="proposal_detail"),
     path("proposal/<slug:slug>/signup/", views.proposal_signup, name="proposal_signup"),
@@ -17,6 +18,13 @@ urlpatterns = [
         name="proposal_owner_dashboard",
     ),
 
+    # Live signup updates (server-sent events; needs the ASGI app)
+    path(
+        "proposal/<slug:slug>/owner/<str:token>/events/",
+        events.proposal_owner_events,
+        name="proposal_owner_events",
+    ),
+
     # Approve / Reject volunteer
     path(
         "proposal/<slug:slug>/owner/<str:token>/decide/<int:signup_id>/<str:decision>/",
@@ -36,6 +44,13 @@ urlpatterns = [
         name="proposal_owner_reopen",
     ),
 
+    # Signup notification frequency (immediate / hourly / daily digest)
+    path(
+        "proposal/<slug:slug>/owner/<str:token>/notifications/",
+        views.proposal_owner_notifications,
+        name="proposal_owner_notifications",
+    ),
+
     # -----------------------------
     # Delete proposal (with confirmation)
     # -----------------------------
@@ -49,4 +64,23 @@ urlpatterns = [
         views.proposal_owner_delete,
         name="proposal_owner_delete",
     ),
+
+    # -----------------------------
+    # Read-only JSON API (see portal/api.py)
+    # -----------------------------
+    path("api/v1/tags/", api.tags, name="api_tags"),
+    path("api/v1/proposals/", api.proposal_list, name="api_proposal_list"),
+    path("api/v1/proposals/<slug:slug>/", api.proposal_item, name="api_proposal_item"),
+    path(
+        "api/v1/proposals/<slug:slug>/owner/<str:token>/signups/",
+        api.proposal_signups,
+        name="api_proposal_signups",
+    ),
+
+    # -----------------------------
+    # Operations
+    # -----------------------------
+    path("healthz", health.healthz, name="healthz"),
+    path("readyz", health.readyz, name="readyz"),
+    path("metrics", metrics.metrics_view, name="metrics"),
 ]
@@ -1,19 +1,28 @@
 from __future__ import annotations
 
-import traceback
+import logging
 from typing import Any
 
 from django.contrib import messages
-from django.db import transaction
-from django.db.models import Count, Q
-from django.http import Http404, HttpRequest, HttpResponse
+from django.db import IntegrityError, transaction
+from django.db.models import Count, prefetch_related_objects
+from django.http import Http404, HttpRequest, HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.template.loader import render_to_string
 from django.urls import reverse
-from django.views.decorators.http import require_http_methods
-
-from .emailer import send_email
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import require_GET, require_http_methods
+
+from .dedup import find_duplicates
+from .emailer import CircuitOpenError, send_email
+from .emails import RenderedEmail, render_email
+from .facets import cached_facets, search_condition
 from .forms import ProposalForm, QuestionFormSet, SignupForm
 from .models import Proposal, ProposalQuestion, Signup, SignupAnswer, Tag
+from .suggest import suggest
+
+email_log = logging.getLogger("portal.email")
 
 VALID_STATUSES = {"OPEN", "INPROG", "CLOSED"}
 VALID_DECISIONS = {"approve": "APPROVED", "reject": "REJECTED"}
@@ -22,25 +31,34 @@ VALID_DECISIONS = {"approve": "APPROVED", "reject": "REJECTED"}
 # -------------------------------------------------------
 # Utilities
 # -------------------------------------------------------
-def _safe_email(*, subject: str, text_body: str, to_email: str, html_body: str | None = None) -> None:
+def _safe_email(*, subject: str, text_body: str, to_email: str, html_body: str | None = None) -> bool:
     """
-    Never crash user flow due to email issues.
+    Never crash user flow due to email issues; returns whether the email went out.
     Must match send_email(subject, to_email, text_body, html_body=None).
     """
+    fields = {"event": "email", "to": to_email, "subject": subject}
     if not (to_email or "").strip():
-        print("ℹ️ Email skipped: empty recipient.")
-        return
+        email_log.info("Email skipped: empty recipient.", extra={**fields, "outcome": "skipped"})
+        return False
     try:
         send_email(subject=subject, to_email=to_email, text_body=text_body, html_body=html_body)
-        print(f"✅ Email attempted to={to_email} subject={subject!r}")
-    except Exception as e:
-        print(f"❌ Email FAILED to={to_email} subject={subject!r}")
-        print(repr(e))
-        print(traceback.format_exc())
+    except CircuitOpenError:
+        email_log.warning("Email skipped: Brevo circuit open.", extra={**fields, "outcome": "circuit_open"})
+        return False
+    except Exception:
+        email_log.exception("Email failed.", extra={**fields, "outcome": "failed"})
+        return False
+    email_log.info("Email sent.", extra={**fields, "outcome": "sent", "sampled": True})
+    return True
+
+
+def _send_rendered(email: RenderedEmail, to_email: str) -> bool:
+    return _safe_email(subject=email.subject, text_body=email.text_body, html_body=email.html_body, to_email=to_email)
 
 
 def _get_owner_proposal_or_404(slug: str, token: str) -> Proposal:
-    proposal = get_object_or_404(Proposal, slug=slug)
+    # Owners keep access to their archived proposals
+    proposal = get_object_or_404(Proposal.all_objects, slug=slug, deleted_at__isnull=True)
     if not getattr(proposal, "owner_token", None) or proposal.owner_token != token:
         raise Http404("Owner page not found.")
     return proposal
@@ -133,18 +151,30 @@ def _normalize_signup_for_template(s: Signup) -> dict[str, Any]:
     }
 
 
-def _set_signup_status(signup: Signup, status: str) -> None:
+def _wants_fragment(request: HttpRequest) -> bool:
+    """
+    htmx (HX-Request) and the dashboard's own fetch() calls want only the changed markup, not a redirect.
+    """
+    return request.headers.get("HX-Request") == "true" or request.headers.get("X-Requested-With") == "fetch"
+
+
+def _render_listing_status(request: HttpRequest, proposal: Proposal, token: str) -> HttpResponse:
+    return render(request, "portal/partials/listing_status.html", {"proposal": proposal, "token": token})
+
+
+def _set_signup_status(signup: Signup, status: str) -> Signup | None:
     """
     Update status using model method if present, else via status field.
+    Returns the waitlisted signup promoted into a freed seat, if any.
     """
     if hasattr(signup, "set_status") and callable(getattr(signup, "set_status")):
-        signup.set_status(status)
-        return
+        return signup.set_status(status)
     if hasattr(signup, "status"):
         signup.status = status
         signup.save(update_fields=["status"])
-        return
+        return None
     signup.save()
+    return None
 
 
 # -------------------------------------------------------
@@ -154,7 +184,14 @@ def home(request: HttpRequest) -> HttpResponse:
     q = (request.GET.get("q") or "").strip()
     status = (request.GET.get("status") or "").strip()
     selected_tags = [t.strip() for t in request.GET.getlist("tags") if t and t.strip()]
+    tag_match = "all" if request.GET.get("match") == "all" else "any"
+    return render(request, "portal/home.html", _home_context(q, status, selected_tags, tag_match))
+
 
+def _home_context(q: str, status: str, selected_tags: list[str], tag_match: str) -> dict[str, Any]:
+    """
+    Feed and filter facets for the home page (also rendered by `manage.py bench_templates`).
+    """
     proposals = (
         Proposal.objects.all()
         .annotate(signups_count=Count("signups"))
@@ -162,36 +199,61 @@ def home(request: HttpRequest) -> HttpResponse:
         .order_by("-created_at")
     )
 
+    if status not in VALID_STATUSES:
+        status = ""
+
     if q:
-        proposals = proposals.filter(Q(title__icontains=q) | Q(summary__icontains=q))
+        proposals = proposals.filter(search_condition(q))
 
-    if status in VALID_STATUSES:
+    if status:
         proposals = proposals.filter(status=status)
 
     if selected_tags:
-        proposals = proposals.filter(tags__slug__in=selected_tags).distinct()
+        proposals = proposals.filter_tags(selected_tags, match=tag_match)
 
-    all_tags = Tag.objects.all().order_by("name")
+    facets = cached_facets(q=q, status=status, selected_tags=selected_tags, match=tag_match)
+    tag_facets = [(t, facets["tags"].get(t.slug, 0)) for t in Tag.objects.all().order_by("name")]
+    status_facets = [(value, label, facets["statuses"][value]) for value, label in Proposal.STATUS_CHOICES]
 
-    return render(
-        request,
-        "portal/home.html",
-        {
-            "proposals": proposals,
-            "q": q,
-            "status": status,
-            "all_tags": all_tags,
-            "selected_tags": set(selected_tags),
-        },
-    )
+    return {
+        "proposals": proposals,
+        "q": q,
+        "status": status,
+        "tag_facets": tag_facets,
+        "status_facets": status_facets,
+        "selected_tags": set(selected_tags),
+        "tag_match": tag_match,
+    }
+
+
+@require_GET
+def proposal_suggest(request: HttpRequest) -> JsonResponse:
+    """
+    Search-box suggestions for ?q= (see portal.suggest); answered from memory, no query per keystroke.
+    """
+    try:
+        limit = int(request.GET.get("limit") or 8)
+    except ValueError:
+        limit = 8
+    response = JsonResponse({"results": suggest(request.GET.get("q") or "", limit)})
+    patch_cache_control(response, public=True, max_age=30)
+    return response
 
 
 def proposal_detail(request: HttpRequest, slug: str) -> HttpResponse:
+    # Archived proposals drop out of the feed but old links keep working
     proposal = get_object_or_404(
-        Proposal.objects.prefetch_related("tags", "questions"),
+        Proposal.all_objects.prefetch_related("tags", "questions"),
         slug=slug,
+        deleted_at__isnull=True,
     )
-    return render(request, "portal/proposal_detail.html", {"proposal": proposal})
+    return render(request, "portal/proposal_detail.html", {"proposal": proposal, "similar": _similar(proposal)})
+
+
+def _similar(proposal: Proposal) -> list[Proposal]:
+    # Precomputed by `manage.py rebuild_similar`: one indexed lookup on (proposal, rank)
+    live = proposal.neighbors.filter(neighbor__is_archived=False, neighbor__deleted_at__isnull=True)
+    return [n.neighbor for n in live.select_related("neighbor")]
 
 
 @require_http_methods(["GET", "POST"])
@@ -200,7 +262,12 @@ def proposal_create(request: HttpRequest) -> HttpResponse:
         form = ProposalForm(request.POST)
         qset = QuestionFormSet(request.POST, prefix="q")
 
-        if form.is_valid() and qset.is_valid():
+        duplicates: list[tuple[Proposal, float]] = []
+        if form.is_valid() and not request.POST.get("confirm_not_duplicate"):
+            cd = form.cleaned_data
+            duplicates = find_duplicates(title=cd["title"], summary=cd["summary"], aims=cd.get("aims") or "")
+
+        if form.is_valid() and qset.is_valid() and not duplicates:
             with transaction.atomic():
                 proposal = form.save()
 
@@ -233,21 +300,9 @@ def proposal_create(request: HttpRequest) -> HttpResponse:
                 owner_dashboard_link = request.build_absolute_uri(
                     reverse("proposal_owner_dashboard", kwargs={"slug": proposal.slug, "token": proposal.owner_token})
                 )
-                _safe_email(
-                    subject=f"MSRIG Proposal Created – Owner Dashboard Link – {proposal.title}",
-                    text_body=(
-                        "Your proposal has been created successfully!\n\n"
-                        f"Title: {proposal.title}\n\n"
-                        "Owner dashboard (bookmark this link):\n"
-                        f"{owner_dashboard_link}\n\n"
-                        "This link gives you access to:\n"
-                        "- View signups\n"
-                        "- Approve / Reject volunteers\n"
-                        "- Close / Reopen listing\n"
-                        "- Delete listing (with confirmation)\n\n"
-                        "Best,\nMSRIG"
-                    ),
-                    to_email=recipient,
+                _send_rendered(
+                    render_email("proposal_created", {"proposal": proposal, "dashboard_url": owner_dashboard_link}),
+                    recipient,
                 )
 
             messages.success(request, "Proposal created! The owner dashboard link has been sent to the owner email.")
@@ -255,8 +310,13 @@ def proposal_create(request: HttpRequest) -> HttpResponse:
     else:
         form = ProposalForm()
         qset = QuestionFormSet(prefix="q")
+        duplicates = []
 
-    return render(request, "portal/proposal_create.html", {"form": form, "qset": qset})
+    return render(
+        request,
+        "portal/proposal_create.html",
+        {"form": form, "qset": qset, "duplicates": duplicates},
+    )
 
 
 @require_http_methods(["GET", "POST"])
@@ -268,7 +328,7 @@ def proposal_signup(request: HttpRequest, slug: str) -> HttpResponse:
     """
     proposal = get_object_or_404(Proposal.objects.prefetch_related("questions"), slug=slug)
 
-    if proposal.status != "OPEN":
+    if not proposal.accepting_signups:
         messages.warning(request, "This proposal is not accepting signups right now.")
         return redirect("proposal_detail", slug=proposal.slug)
 
@@ -300,37 +360,60 @@ def proposal_signup(request: HttpRequest, slug: str) -> HttpResponse:
             elif not email:
                 messages.error(request, "Please enter your email.")
             else:
-                with transaction.atomic():
-                    signup = _make_signup_instance(
-                        proposal=proposal, name=name, email=email, message=message_txt, role=role
-                    )
-                    signup.save()
-
-                    answers_to_create: list[SignupAnswer] = []
-                    for q in questions:
-                        val = _clean_str(request.POST.get(f"q_{q.id}"))
-                        answers_to_create.append(SignupAnswer(signup=signup, question=q, answer=val))
-                    if answers_to_create:
-                        SignupAnswer.objects.bulk_create(answers_to_create)
-
+                signup = _make_signup_instance(
+                    proposal=proposal, name=name, email=email, message=message_txt, role=role
+                )
+                signup.idempotency_key = _clean_str(cd.get("idempotency_key")) or None
+                try:
+                    # The unique idempotency key and (proposal, lower(email)) constraints make
+                    # the insert itself the duplicate check: no read before the write.
+                    with transaction.atomic():
+                        # Conditional seat counter UPDATE, rolled back with the insert on a duplicate
+                        if not proposal.take_seat():
+                            signup.status = "WAITLISTED"
+                        signup.save()
+
+                        answers_to_create: list[SignupAnswer] = []
+                        for q in questions:
+                            val = _clean_str(request.POST.get(f"q_{q.id}"))
+                            answers_to_create.append(SignupAnswer(signup=signup, question=q, answer_text=val))
+                        if answers_to_create:
+                            SignupAnswer.objects.bulk_create(answers_to_create)
+                except IntegrityError:
+                    if signup.idempotency_key and Signup.objects.filter(idempotency_key=signup.idempotency_key).exists():
+                        # Double-click / retry of a form that already went through
+                        messages.success(request, "Signed up! The proposal owner has been notified.")
+                    else:
+                        messages.info(request, "You have already signed up for this proposal with that email.")
+                    return redirect("proposal_detail", slug=proposal.slug)
+
+                # HOURLY / DAILY owners hear about this signup from `manage.py send_digests`
                 recipient = _clean_str(getattr(proposal, "created_by_email", None))
-                if recipient:
+                if recipient and proposal.notify_frequency == "IMMEDIATE":
                     owner_dashboard_link = request.build_absolute_uri(
                         reverse("proposal_owner_dashboard", kwargs={"slug": proposal.slug, "token": proposal.owner_token})
                     )
-                    _safe_email(
-                        subject=f"New MSRIG Signup – {proposal.title}",
-                        text_body=(
-                            "A new volunteer signed up for your proposal:\n\n"
-                            f"Volunteer: {_signup_display_name(signup)}\n"
-                            f"Email: {_signup_display_email(signup)}\n\n"
-                            "Owner dashboard:\n"
-                            f"{owner_dashboard_link}\n"
+                    sent = _send_rendered(
+                        render_email(
+                            "signup_new",
+                            {
+                                "proposal": proposal,
+                                "volunteer_name": _signup_display_name(signup),
+                                "volunteer_email": _signup_display_email(signup),
+                                "waitlisted": signup.status == "WAITLISTED",
+                                "dashboard_url": owner_dashboard_link,
+                            },
                         ),
-                        to_email=recipient,
+                        recipient,
                     )
-
-                messages.success(request, "Signed up! The proposal owner has been notified.")
+                    # Left NULL on failure or an open circuit: `manage.py send_digests` retries it
+                    if sent:
+                        Signup.objects.filter(pk=signup.pk).update(owner_notified_at=timezone.now())
+
+                if signup.status == "WAITLISTED":
+                    messages.success(request, "This proposal is full, so you have been added to the waitlist.")
+                else:
+                    messages.success(request, "Signed up! The proposal owner has been notified.")
                 return redirect("proposal_detail", slug=proposal.slug)
 
         if q_errors:
@@ -353,6 +436,8 @@ def proposal_signup(request: HttpRequest, slug: str) -> HttpResponse:
 # -------------------------------------------------------
 def proposal_owner_dashboard(request: HttpRequest, slug: str, token: str) -> HttpResponse:
     proposal = _get_owner_proposal_or_404(slug, token)
+    # Live-update cursor (portal/events.py), taken before the read so nothing falls in between
+    since = timezone.now()
 
     signups_qs = (
         Signup.objects.filter(proposal=proposal)
@@ -365,7 +450,7 @@ def proposal_owner_dashboard(request: HttpRequest, slug: str, token: str) -> Htt
     return render(
         request,
         "portal/proposal_owner_dashboard.html",
-        {"proposal": proposal, "signups": signups, "token": token},
+        {"proposal": proposal, "signups": signups, "token": token, "since": since.isoformat()},
     )
 
 
@@ -384,32 +469,31 @@ def proposal_owner_decide_signup(
     signup = get_object_or_404(Signup, id=signup_id, proposal=proposal)
     new_status = VALID_DECISIONS[decision]
 
-    _set_signup_status(signup, new_status)
+    promoted = _set_signup_status(signup, new_status)
 
     display_name = _signup_display_name(signup)
     display_email = _signup_display_email(signup)
 
-    if new_status == "APPROVED":
-        subject = f"MSRIG Update: Approved – {proposal.title}"
-        text_body = (
-            f"Hi {display_name},\n\n"
-            "You have been APPROVED for:\n"
-            f"{proposal.title}\n\n"
-            "The proposal owner will contact you soon.\n\n"
-            "Best,\nMSRIG"
-        )
-    else:
-        subject = f"MSRIG Update: Not Selected – {proposal.title}"
-        text_body = (
-            f"Hi {display_name},\n\n"
-            "Thank you for signing up for:\n"
-            f"{proposal.title}\n\n"
-            "At this time, you were not selected.\n\n"
-            "Please feel free to apply for other opportunities.\n\n"
-            "Best,\nMSRIG"
-        )
-
-    _safe_email(subject=subject, text_body=text_body, to_email=display_email)
+    template = "signup_approved" if new_status == "APPROVED" else "signup_rejected"
+    _send_rendered(render_email(template, {"proposal": proposal, "volunteer_name": display_name}), display_email)
+
+    if _wants_fragment(request):
+        # Only the changed markup, no dashboard query: this signup's card, the one promoted off
+        # the waitlist into its seat (if any) and the seat count; the page swaps each in by id.
+        # promote_waitlist() loads the promoted row with only its pk, so fetch it whole.
+        cards = [signup] if promoted is None else [signup, Signup.objects.get(pk=promoted.pk)]
+        prefetch_related_objects(cards, "answers__question")
+        proposal.refresh_from_db(fields=["seats_taken"])
+        html = [
+            render_to_string(
+                "portal/partials/signup_card.html",
+                {"proposal": proposal, "token": token, "signup": _normalize_signup_for_template(card)},
+                request=request,
+            )
+            for card in cards
+        ]
+        html.append(render_to_string("portal/partials/signup_seats.html", {"proposal": proposal}, request=request))
+        return HttpResponse("".join(html))
 
     messages.success(request, f"{display_name} marked as {new_status}.")
     return redirect("proposal_owner_dashboard", slug=proposal.slug, token=proposal.owner_token)
@@ -422,7 +506,10 @@ def proposal_owner_decide_signup(
 def proposal_owner_close(request: HttpRequest, slug: str, token: str) -> HttpResponse:
     proposal = _get_owner_proposal_or_404(slug, token)
     proposal.status = "CLOSED"
-    proposal.save(update_fields=["status"])
+    proposal.closed_at = timezone.now()
+    proposal.save(update_fields=["status", "closed_at"])
+    if _wants_fragment(request):
+        return _render_listing_status(request, proposal, token)
     messages.success(request, "Listing closed. New signups disabled.")
     return redirect("proposal_owner_dashboard", slug=proposal.slug, token=proposal.owner_token)
 
@@ -431,11 +518,33 @@ def proposal_owner_close(request: HttpRequest, slug: str, token: str) -> HttpRes
 def proposal_owner_reopen(request: HttpRequest, slug: str, token: str) -> HttpResponse:
     proposal = _get_owner_proposal_or_404(slug, token)
     proposal.status = "OPEN"
-    proposal.save(update_fields=["status"])
+    proposal.closed_at = None
+    proposal.is_archived = False
+    # Otherwise the next `expire_proposals` run would close it straight away
+    if proposal.deadline and proposal.deadline < timezone.localdate():
+        proposal.deadline = None
+    proposal.save(update_fields=["status", "closed_at", "is_archived", "deadline"])
+    if _wants_fragment(request):
+        return _render_listing_status(request, proposal, token)
     messages.success(request, "Listing reopened. Signups enabled.")
     return redirect("proposal_owner_dashboard", slug=proposal.slug, token=proposal.owner_token)
 
 
+# -------------------------------------------------------
+# Signup notification frequency
+# -------------------------------------------------------
+@require_http_methods(["POST"])
+def proposal_owner_notifications(request: HttpRequest, slug: str, token: str) -> HttpResponse:
+    proposal = _get_owner_proposal_or_404(slug, token)
+    frequency = (request.POST.get("notify_frequency") or "").strip()
+    if frequency not in dict(Proposal.NOTIFY_CHOICES):
+        raise Http404("Invalid notification setting.")
+    proposal.notify_frequency = frequency
+    proposal.save(update_fields=["notify_frequency"])
+    messages.success(request, f"Signup notifications: {proposal.get_notify_frequency_display()}.")
+    return redirect("proposal_owner_dashboard", slug=proposal.slug, token=proposal.owner_token)
+
+
 # -------------------------------------------------------
 # Delete Proposal (Confirmation Page)
 # -------------------------------------------------------
@@ -454,6 +563,9 @@ def proposal_owner_delete_confirm(request: HttpRequest, slug: str, token: str) -
 @require_http_methods(["POST"])
 def proposal_owner_delete(request: HttpRequest, slug: str, token: str) -> HttpResponse:
     proposal = _get_owner_proposal_or_404(slug, token)
-    proposal.delete()
+    # Hidden everywhere from now on; signups, answers and questions are removed in
+    # batches by `manage.py purge_deleted_proposals` instead of inside this request.
+    proposal.deleted_at = timezone.now()
+    proposal.save(update_fields=["deleted_at"])
     messages.success(request, "Proposal permanently deleted.")
     return redirect("home")